@@ -19,6 +19,7 @@ pyinstaller --name="simulador_llm_Windows" ^
     --windowed ^
     --icon=Mui.png ^
     --add-data="Mui.png;." ^
+    --add-data="simulador\vocabularios;simulador\vocabularios" ^
     --hidden-import=PIL ^
     --hidden-import=PIL._imagingtk ^
     --hidden-import=PIL._tkinter_finder ^
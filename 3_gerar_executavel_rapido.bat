@@ -0,0 +1,36 @@
+@echo off
+echo ========================================
+echo Gerando executavel do Simulador LLM (pasta, abertura rapida)
+echo MPPA - CIAA.
+echo ========================================
+echo.
+echo Para compactar com UPX: set MUIRAQUITA_UPX=1 antes de rodar este arquivo.
+echo.
+
+echo Removendo build anterior deste perfil...
+if exist "dist\simulador_llm_Windows_rapido" rmdir /s /q "dist\simulador_llm_Windows_rapido"
+if exist "build\simulador_llm_Windows_rapido" rmdir /s /q "build\simulador_llm_Windows_rapido"
+
+echo.
+echo Gerando executavel (isso pode demorar alguns minutos)...
+echo.
+
+pyinstaller --noconfirm simulador_llm_Windows_rapido.spec
+
+echo.
+echo ========================================
+if exist "dist\simulador_llm_Windows_rapido\simulador_llm_Windows_rapido.exe" (
+    echo SUCESSO! Executavel gerado em: dist\simulador_llm_Windows_rapido\
+    echo.
+    echo Copiando logo para a pasta do executavel...
+    copy Mui.png dist\simulador_llm_Windows_rapido\Mui.png
+    echo.
+    echo Distribua a pasta inteira. Para comparar com o executavel de arquivo unico:
+    echo python -m simulador exe dist\simulador_llm_Windows.exe dist\simulador_llm_Windows_rapido\simulador_llm_Windows_rapido.exe
+) else (
+    echo ERRO: Nao foi possivel gerar o executavel.
+    echo Verifique os erros acima.
+)
+echo ========================================
+echo.
+pause
@@ -0,0 +1,4 @@
+"""
+Muiraquitã - Simulador LLM.
+Componentes sem interface gráfica compartilhados pelas aplicações Streamlit e Tk.
+"""
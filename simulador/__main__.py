@@ -0,0 +1,38 @@
+"""
+Ponto de entrada de linha de comando: ``python -m simulador <comando>``.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+"""
+
+import argparse
+import os
+import sys
+
+from simulador import benchmark, classificador, executavel, servidor, vocabulario
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m simulador",
+        description="Muiraquitã - Simulador LLM sem interface gráfica.",
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    classificador.configurar_parser(subparsers)
+    benchmark.configurar_parser(subparsers)
+    vocabulario.configurar_parser(subparsers)
+    servidor.configurar_parser(subparsers)
+    executavel.configurar_parser(subparsers)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = criar_parser().parse_args(argv)
+    try:
+        return args.funcao(args)
+    except BrokenPipeError:
+        # A saída foi fechada antes do fim (por exemplo ``| head``): encerra sem traceback.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
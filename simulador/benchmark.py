@@ -0,0 +1,370 @@
+"""
+Microbenchmarks dos caminhos quentes do núcleo com vocabulário sintético escalável.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+
+Uso típico, antes e depois de uma otimização:
+
+    python -m simulador bench -o base.json
+    python -m simulador bench -o depois.json --comparar base.json
+"""
+
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+SILABAS = (
+    "ba", "be", "bi", "bo", "bu", "ca", "co", "cu", "da", "de", "di", "do", "fa", "fe", "fi",
+    "ga", "go", "gu", "la", "le", "li", "lo", "lu", "ma", "me", "mi", "mo", "mu", "na", "ne",
+    "ni", "no", "pa", "pe", "pi", "po", "ra", "re", "ri", "ro", "ru", "sa", "se", "si", "so",
+    "ta", "te", "ti", "to", "tu", "va", "ve", "vi", "vo", "za", "ção", "são", "lhá", "nhé", "qué",
+)
+
+ESCALAS = {
+    "rapido": [(4, 27), (20, 500)],
+    "padrao": [(4, 27), (20, 500), (50, 2000)],
+    "completo": [(4, 27), (20, 500), (50, 2000), (200, 5000)],
+}
+COMPRIMENTOS_PADRAO = (5, 20, 100)
+FRACAO_COMPARTILHADAS = 0.01
+TERMOS_CONTEXTO_POR_GRUPO = 20
+TERMOS_INFERENCIA_POR_GRUPO = 20
+
+
+# ==================== DADOS SINTÉTICOS ====================
+
+def gerar_vocabulario(quantidade_grupos: int, palavras_por_grupo: int, semente: int = 0):
+    """Gera ``(grupos, contexto_grupos, palavras_inferencia)`` determinísticos para a semente.
+
+    Cerca de 1% das palavras de cada grupo também aparece em outro grupo, para
+    exercitar as palavras compartilhadas e ambíguas.
+    """
+    aleatorio = random.Random(f"vocabulario:{quantidade_grupos}:{palavras_por_grupo}:{semente}")
+    usadas = set()
+
+    def nova_palavra() -> str:
+        while True:
+            palavra = "".join(aleatorio.choice(SILABAS) for _ in range(aleatorio.randint(2, 4)))
+            if palavra not in usadas:
+                usadas.add(palavra)
+                return palavra
+
+    nomes = [f"Grupo{indice:03d}" for indice in range(quantidade_grupos)]
+    grupos = {nome: {nova_palavra() for _ in range(palavras_por_grupo)} for nome in nomes}
+    if quantidade_grupos > 1:
+        listas = {nome: sorted(palavras) for nome, palavras in grupos.items()}
+        for nome in nomes:
+            for _ in range(max(1, int(palavras_por_grupo * FRACAO_COMPARTILHADAS))):
+                outro = aleatorio.choice([n for n in nomes if n != nome])
+                grupos[nome].add(aleatorio.choice(listas[outro]))
+    contexto_grupos = {nome: {nova_palavra() for _ in range(TERMOS_CONTEXTO_POR_GRUPO)} for nome in nomes}
+    palavras_inferencia = {nome: [nova_palavra() for _ in range(TERMOS_INFERENCIA_POR_GRUPO)] for nome in nomes}
+    return grupos, contexto_grupos, palavras_inferencia
+
+
+def gerar_frases(vocabulario, quantidade: int, comprimento: int, semente: int = 0) -> List[str]:
+    """Frases de ``comprimento`` palavras; cerca de 40% delas vêm do vocabulário."""
+    grupos, contexto_grupos, palavras_inferencia = vocabulario
+    aleatorio = random.Random(f"frases:{quantidade}:{comprimento}:{semente}")
+    conhecidas = sorted(
+        {p for palavras in grupos.values() for p in palavras}
+        | {p for palavras in contexto_grupos.values() for p in palavras}
+        | {p for palavras in palavras_inferencia.values() for p in palavras}
+    )
+    frases = []
+    for _ in range(quantidade):
+        palavras = []
+        for _ in range(comprimento):
+            if aleatorio.random() < 0.4:
+                palavra = aleatorio.choice(conhecidas)
+            else:
+                palavra = "".join(aleatorio.choice(SILABAS) for _ in range(aleatorio.randint(1, 3)))
+            if aleatorio.random() < 0.1:
+                palavra = palavra.capitalize()
+            palavras.append(palavra)
+        frases.append(" ".join(palavras) + aleatorio.choice(("", ".", "!", "?")))
+    return frases
+
+
+@contextmanager
+def vocabulario_instalado(vocabulario):
+    """Troca o vocabulário do núcleo pelo sintético e restaura o original ao sair."""
+    from simulador import nucleo
+
+    originais = [
+        {nome: (set(v) if isinstance(v, set) else list(v)) for nome, v in fonte.items()}
+        for fonte in (nucleo.GRUPOS, nucleo.CONTEXTO_GRUPOS, nucleo.PALAVRAS_INFERENCIA)
+    ]
+
+    def instalar(fontes) -> None:
+        for destino, origem in zip((nucleo.GRUPOS, nucleo.CONTEXTO_GRUPOS, nucleo.PALAVRAS_INFERENCIA), fontes):
+            destino.clear()
+            destino.update(origem)
+        nucleo.invalidar_indice_vocabulario()
+        limpar_caches()
+        nucleo.obter_indice_vocabulario()
+
+    instalar(vocabulario)
+    try:
+        yield
+    finally:
+        instalar(originais)
+
+
+def limpar_caches() -> None:
+    from simulador import nucleo
+
+    nucleo.CACHE_ANALISES.limpar()
+    nucleo.CACHE_SIMILARIDADES.limpar()
+    nucleo.CACHE_TEXTOS.limpar()
+
+
+# ==================== MEDIÇÃO ====================
+
+def medir(
+    operacao: Callable,
+    entradas: Sequence,
+    repeticoes: int = 5,
+    tempo_alvo: float = 0.2,
+    por_chamada: int = 1,
+) -> Dict[str, float]:
+    """Mede ``operacao(entrada)`` sobre entradas distintas, com os caches limpos a cada repetição.
+
+    O número de chamadas por repetição é calibrado para durar cerca de
+    ``tempo_alvo`` segundos, sem passar do número de entradas (para que os caches
+    não acertem dentro da mesma repetição). ``por_chamada`` divide o tempo de
+    cada chamada quando ela processa vários itens (lotes).
+    """
+    limpar_caches()
+    inicio = time.perf_counter()
+    operacao(entradas[0])
+    estimativa = max(time.perf_counter() - inicio, 1e-7)
+    chamadas = max(1, min(len(entradas), int(tempo_alvo / estimativa)))
+
+    tempos = []
+    for _ in range(repeticoes):
+        limpar_caches()
+        inicio = time.perf_counter()
+        for entrada in entradas[:chamadas]:
+            operacao(entrada)
+        tempos.append((time.perf_counter() - inicio) / (chamadas * por_chamada))
+    return {
+        "mediana_us": statistics.median(tempos) * 1e6,
+        "minimo_us": min(tempos) * 1e6,
+        "chamadas": chamadas,
+        "repeticoes": repeticoes,
+    }
+
+
+def _pares(palavras: List[str], quantidade: int, semente: int) -> List[Tuple[str, str]]:
+    aleatorio = random.Random(f"pares:{semente}")
+    return [(aleatorio.choice(palavras), aleatorio.choice(palavras)) for _ in range(quantidade)]
+
+
+def _casos_por_escala(vocabulario, semente: int):
+    from simulador import nucleo
+
+    grupos = vocabulario[0]
+    palavras = sorted({p for palavras in grupos.values() for p in palavras})
+    aleatorio = random.Random(f"consultas:{semente}")
+    consultas = [aleatorio.choice(palavras)[:-1] or "a" for _ in range(500)]
+    return [
+        ("calcular_similaridades_palavra", lambda p: nucleo.calcular_similaridades_palavra(p), consultas),
+        ("buscar_similares", lambda p: nucleo.buscar_similares(p, k=20), consultas),
+        ("obter_palavras_compartilhadas", lambda _: nucleo.obter_palavras_compartilhadas(nucleo.GRUPOS), [None]),
+    ]
+
+
+def _analise_completa(frase: str) -> None:
+    """O mesmo trabalho de um clique em "Analisar" na interface."""
+    from simulador import nucleo
+
+    nucleo.identificar_grupo(frase)
+    nucleo.detectar_palavras_ambiguas(frase)
+    nucleo.detectar_palavras_desconhecidas(frase)
+
+
+def _casos_por_frase(frases: List[str]):
+    from simulador import nucleo
+
+    lotes = [frases[inicio:inicio + 100] for inicio in range(0, len(frases), 100)]
+    return [
+        ("normalizar_texto", nucleo.normalizar_texto, frases, 1),
+        ("analisar_contexto", nucleo.analisar_contexto, frases, 1),
+        ("identificar_grupo", nucleo.identificar_grupo, frases, 1),
+        ("analise_completa", _analise_completa, frases, 1),
+        ("identificar_grupos_em_lote", nucleo.identificar_grupos_em_lote, lotes, 100),
+    ]
+
+
+def executar_suite(
+    escalas: Sequence[Tuple[int, int]],
+    comprimentos: Sequence[int] = COMPRIMENTOS_PADRAO,
+    casos: Optional[Sequence[str]] = None,
+    repeticoes: int = 5,
+    tempo_alvo: float = 0.2,
+    semente: int = 0,
+    relatar: Callable[[dict], None] = lambda resultado: None,
+) -> dict:
+    from simulador import nucleo
+
+    def incluir(nome: str) -> bool:
+        return not casos or nome in casos
+
+    resultados = []
+
+    def registrar(caso: str, escala: str, comprimento: Optional[int], medida: dict) -> None:
+        resultado = {"caso": caso, "escala": escala, "comprimento": comprimento, **medida}
+        resultados.append(resultado)
+        relatar(resultado)
+
+    # Funções de pares não dependem do vocabulário instalado: medidas uma vez.
+    grupos_base = gerar_vocabulario(4, 27, semente)[0]
+    pares = _pares(sorted({p for palavras in grupos_base.values() for p in palavras}), 2000, semente)
+    for caso, operacao in (
+        ("calcular_similaridade_levenshtein", lambda par: nucleo.calcular_similaridade_levenshtein(*par)),
+        ("calcular_similaridade_composta", lambda par: nucleo.calcular_similaridade_composta(*par)),
+    ):
+        if incluir(caso):
+            registrar(caso, "pares", None, medir(operacao, pares, repeticoes, tempo_alvo))
+
+    for quantidade_grupos, palavras_por_grupo in escalas:
+        escala = f"{quantidade_grupos}x{palavras_por_grupo}"
+        vocabulario = gerar_vocabulario(quantidade_grupos, palavras_por_grupo, semente)
+        with vocabulario_instalado(vocabulario):
+            for caso, operacao, entradas in _casos_por_escala(vocabulario, semente):
+                if incluir(caso):
+                    registrar(caso, escala, None, medir(operacao, entradas, repeticoes, tempo_alvo))
+            for comprimento in comprimentos:
+                frases = gerar_frases(vocabulario, 2000, comprimento, semente)
+                for caso, operacao, entradas, por_chamada in _casos_por_frase(frases):
+                    if incluir(caso):
+                        medida = medir(operacao, entradas, repeticoes, tempo_alvo, por_chamada)
+                        registrar(caso, escala, comprimento, medida)
+
+    import numpy
+
+    return {
+        "meta": {
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": numpy.__version__,
+            "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(),
+            "semente": semente,
+            "repeticoes": repeticoes,
+        },
+        "resultados": resultados,
+    }
+
+
+# ==================== COMPARAÇÃO ====================
+
+def _chave(resultado: dict) -> Tuple[str, str, Optional[int]]:
+    return resultado["caso"], resultado["escala"], resultado["comprimento"]
+
+
+def comparar(atual: dict, base: dict, tolerancia: float = 0.10) -> List[dict]:
+    """Compara os melhores tempos com a base; ``regressao`` indica piora acima de ``tolerancia``.
+
+    O mínimo das repetições é menos sensível a ruído do sistema que a mediana.
+    """
+    medidas_base = {_chave(r): r for r in base.get("resultados", [])}
+    comparacoes = []
+    for resultado in atual.get("resultados", []):
+        referencia = medidas_base.get(_chave(resultado))
+        if referencia is None:
+            continue
+        razao = resultado["minimo_us"] / max(referencia["minimo_us"], 1e-9)
+        comparacoes.append({
+            "caso": resultado["caso"],
+            "escala": resultado["escala"],
+            "comprimento": resultado["comprimento"],
+            "base_us": referencia["minimo_us"],
+            "atual_us": resultado["minimo_us"],
+            "razao": razao,
+            "regressao": razao > 1 + tolerancia,
+        })
+    return comparacoes
+
+
+def _rotulo(resultado: dict) -> str:
+    comprimento = resultado["comprimento"]
+    sufixo = f" [{comprimento} palavras]" if comprimento is not None else ""
+    return f"{resultado['caso']:<34} {resultado['escala']:>9}{sufixo}"
+
+
+def _escrever_comparacao(comparacoes: List[dict], saida=sys.stderr) -> None:
+    for item in comparacoes:
+        marca = "  REGRESSÃO" if item["regressao"] else ""
+        saida.write(
+            f"{_rotulo(item):<60} {item['base_us']:>12.2f} -> {item['atual_us']:>12.2f} us"
+            f"  x{item['razao']:.2f}{marca}\n"
+        )
+
+
+# ==================== LINHA DE COMANDO ====================
+
+def _ler_escala(valor: str) -> Tuple[int, int]:
+    grupos, _, palavras = valor.lower().partition("x")
+    return int(grupos), int(palavras)
+
+
+def executar_benchmark(args) -> int:
+    escalas = [_ler_escala(e) for e in args.escala] if args.escala else ESCALAS[args.perfil]
+    comprimentos = [int(c) for c in args.comprimentos.split(",")] if args.comprimentos else COMPRIMENTOS_PADRAO
+
+    def relatar(resultado: dict) -> None:
+        if not args.silencioso:
+            sys.stderr.write(f"{_rotulo(resultado):<60} {resultado['mediana_us']:>12.2f} us\n")
+            sys.stderr.flush()
+
+    relatorio = executar_suite(
+        escalas, comprimentos, args.caso, args.repeticoes, args.tempo_alvo, args.semente, relatar
+    )
+
+    codigo = 0
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        comparacoes = comparar(relatorio, base, args.tolerancia)
+        relatorio["comparacao"] = {"base": args.comparar, "tolerancia": args.tolerancia, "itens": comparacoes}
+        _escrever_comparacao(comparacoes)
+        regressoes = sum(item["regressao"] for item in comparacoes)
+        if regressoes:
+            sys.stderr.write(f"{regressoes} regressão(ões) acima de {args.tolerancia:.0%}.\n")
+            codigo = 1
+
+    texto = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    if args.saida == "-":
+        sys.stdout.write(texto + "\n")
+    else:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto + "\n")
+    return codigo
+
+
+def configurar_parser(subparsers) -> None:
+    parser = subparsers.add_parser("bench", help="Mede os caminhos quentes com vocabulário sintético.")
+    parser.add_argument("-o", "--saida", default="-", help="Arquivo JSON de resultados ou '-' para stdout (padrão).")
+    parser.add_argument(
+        "--perfil", choices=sorted(ESCALAS), default="padrao",
+        help="Conjunto de escalas grupos x palavras (padrão: padrao; completo vai até 200x5000).",
+    )
+    parser.add_argument(
+        "--escala", action="append", metavar="GxP",
+        help="Escala específica, por exemplo 50x2000; pode repetir e substitui --perfil.",
+    )
+    parser.add_argument("--comprimentos", help="Palavras por frase, separadas por vírgula (padrão: 5,20,100).")
+    parser.add_argument("--caso", action="append", help="Mede só este caso; pode repetir.")
+    parser.add_argument("-r", "--repeticoes", type=int, default=5, help="Repetições por caso (padrão: 5).")
+    parser.add_argument("--tempo-alvo", type=float, default=0.2, help="Segundos aproximados por repetição.")
+    parser.add_argument("--semente", type=int, default=0, help="Semente do gerador sintético.")
+    parser.add_argument("--comparar", metavar="BASE.json", help="Compara com resultados salvos e sinaliza regressões.")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="Piora relativa tolerada (padrão: 0.10).")
+    parser.add_argument("-q", "--silencioso", action="store_true", help="Não escreve o andamento em stderr.")
+    parser.set_defaults(funcao=executar_benchmark)
@@ -0,0 +1,82 @@
+"""
+Cache LRU limitado por tamanho e validade, seguro para uso entre threads.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+_AUSENTE = object()
+
+
+class CacheLRU:
+    """Guarda até ``capacidade`` resultados, descartando os menos usados e os expirados."""
+
+    def __init__(self, capacidade: int = 1024, ttl: Optional[float] = None):
+        if capacidade < 1:
+            raise ValueError("capacidade deve ser maior que zero.")
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._itens: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    def obter(self, chave: Hashable, padrao: Any = None) -> Any:
+        with self._trava:
+            item = self._itens.get(chave, _AUSENTE)
+            if item is not _AUSENTE:
+                valor, expira_em = item
+                if expira_em is None or expira_em > time.monotonic():
+                    self._itens.move_to_end(chave)
+                    self.acertos += 1
+                    return valor
+                del self._itens[chave]
+                self.descartes += 1
+            self.falhas += 1
+            return padrao
+
+    def guardar(self, chave: Hashable, valor: Any) -> None:
+        expira_em = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._trava:
+            self._itens[chave] = (valor, expira_em)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+                self.descartes += 1
+
+    def obter_ou_calcular(self, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """Retorna o valor guardado ou calcula, guarda e retorna um novo.
+
+        O cálculo roda fora da trava; chamadas concorrentes com a mesma chave
+        podem calcular em paralelo, e a última gravação prevalece.
+        """
+        valor = self.obter(chave, _AUSENTE)
+        if valor is _AUSENTE:
+            valor = calcular()
+            self.guardar(chave, valor)
+        return valor
+
+    def limpar(self) -> None:
+        with self._trava:
+            self._itens.clear()
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "descartes": self.descartes,
+                "tamanho": len(self._itens),
+                "capacidade": self.capacidade,
+                "ttl": self.ttl,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            }
@@ -0,0 +1,235 @@
+"""
+Classificação em fluxo de arquivos de frases, distribuída num pool de processos.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+FORMATOS = ("txt", "csv", "jsonl")
+
+
+def detectar_formato(caminho: str, formato: Optional[str] = None) -> str:
+    if formato:
+        return formato
+    extensao = os.path.splitext(caminho)[1].lower().lstrip(".")
+    if extensao == "csv":
+        return "csv"
+    if extensao in ("jsonl", "ndjson"):
+        return "jsonl"
+    return "txt"
+
+
+def ler_frases(entrada: TextIO, formato: str, campo: Optional[str] = None) -> Iterator[Tuple[int, str]]:
+    """Gera ``(linha, frase)`` da entrada uma a uma, sem carregar o arquivo inteiro.
+
+    ``linha`` é o número (a partir de 1) da linha da entrada onde a frase começa,
+    contando as linhas em branco e o cabeçalho do CSV.
+    """
+    if formato == "txt":
+        for numero, linha in enumerate(entrada, start=1):
+            linha = linha.strip()
+            if linha:
+                yield numero, linha
+    elif formato == "csv":
+        leitor = csv.reader(entrada)
+        cabecalho = next(leitor, None)
+        if cabecalho is None:
+            return
+        coluna = campo or "texto"
+        if coluna in cabecalho:
+            posicao = cabecalho.index(coluna)
+        elif campo:
+            raise ValueError(f"Coluna '{campo}' não encontrada no CSV: {', '.join(cabecalho)}")
+        else:
+            # Sem coluna 'texto' nem --campo: primeira coluna, e a primeira linha também é dado.
+            posicao = 0
+            if cabecalho and cabecalho[0].strip():
+                yield 1, cabecalho[0]
+        # Um registro entre aspas pode ocupar várias linhas: vale a linha em que ele começa.
+        inicio = leitor.line_num + 1
+        for registro in leitor:
+            if len(registro) > posicao and registro[posicao].strip():
+                yield inicio, registro[posicao]
+            inicio = leitor.line_num + 1
+    elif formato == "jsonl":
+        coluna = campo or "texto"
+        for numero, linha in enumerate(entrada, start=1):
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                raise ValueError(f"Linha {numero}: JSON inválido.") from None
+            if isinstance(registro, str):
+                yield numero, registro
+            elif isinstance(registro, dict) and coluna in registro:
+                yield numero, str(registro[coluna])
+            else:
+                raise ValueError(f"Linha {numero}: esperado texto ou objeto com o campo '{coluna}'.")
+    else:
+        raise ValueError(f"Formato desconhecido: {formato}. Use um de: {', '.join(FORMATOS)}.")
+
+
+def agrupar(itens: Iterable, tamanho: int) -> Iterator[List]:
+    bloco: List = []
+    for item in itens:
+        bloco.append(item)
+        if len(bloco) >= tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def classificar_bloco(frases: List[str]) -> List[dict]:
+    # Importado aqui para que cada processo do pool carregue o núcleo uma única vez.
+    from simulador.nucleo import identificar_grupos_em_lote
+
+    return identificar_grupos_em_lote(frases)
+
+
+class Progresso:
+    """Escreve frases processadas e vazão em stderr, no máximo a cada ``intervalo`` segundos."""
+
+    def __init__(self, saida: TextIO = sys.stderr, intervalo: float = 1.0, ativo: bool = True):
+        self.saida = saida
+        self.intervalo = intervalo
+        self.ativo = ativo
+        self.total = 0
+        self.inicio = time.perf_counter()
+        self._ultimo = self.inicio
+
+    def avancar(self, quantidade: int) -> None:
+        self.total += quantidade
+        agora = time.perf_counter()
+        if self.ativo and agora - self._ultimo >= self.intervalo:
+            self._ultimo = agora
+            self._escrever(agora)
+
+    def concluir(self) -> None:
+        if self.ativo:
+            self._escrever(time.perf_counter(), final=True)
+
+    def _escrever(self, agora: float, final: bool = False) -> None:
+        decorrido = max(agora - self.inicio, 1e-9)
+        prefixo = "Concluído" if final else "Processadas"
+        self.saida.write(
+            f"{prefixo}: {self.total} frases em {decorrido:.1f}s ({self.total / decorrido:,.0f} frases/s)\n"
+        )
+        self.saida.flush()
+
+
+def classificar_fluxo(
+    frases: Iterable[Tuple[int, str]],
+    saida: TextIO,
+    processos: Optional[int] = None,
+    tamanho_lote: int = 1000,
+    progresso: Optional[Progresso] = None,
+) -> int:
+    """Classifica ``frases`` (pares ``(linha, frase)`` de ``ler_frases``) e grava uma
+    linha JSONL por frase, na ordem de entrada, com o número da linha de origem.
+
+    No máximo ``2 * processos`` blocos ficam em voo ao mesmo tempo, então a
+    memória usada não depende do tamanho da entrada. Com ``processos=0`` tudo
+    roda no processo atual.
+    """
+    progresso = progresso or Progresso(ativo=False)
+    total = 0
+
+    def gravar(linhas: List[int], resultados: List[dict]) -> None:
+        nonlocal total
+        for linha, resultado in zip(linhas, resultados):
+            resultado = {"linha": linha, **resultado}
+            saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        total += len(resultados)
+        progresso.avancar(len(resultados))
+
+    blocos = agrupar(frases, tamanho_lote)
+    if processos == 0:
+        for bloco in blocos:
+            linhas, textos = zip(*bloco)
+            gravar(linhas, classificar_bloco(list(textos)))
+    else:
+        processos = processos or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            limite_em_voo = 2 * processos
+            em_voo: deque = deque()
+            for bloco in blocos:
+                linhas, textos = zip(*bloco)
+                em_voo.append((linhas, executor.submit(classificar_bloco, list(textos))))
+                if len(em_voo) >= limite_em_voo:
+                    linhas, futuro = em_voo.popleft()
+                    gravar(linhas, futuro.result())
+            while em_voo:
+                linhas, futuro = em_voo.popleft()
+                gravar(linhas, futuro.result())
+
+    progresso.concluir()
+    return total
+
+
+def executar_classificacao(args) -> int:
+    entrada_padrao = args.entrada == "-"
+    formato = detectar_formato("" if entrada_padrao else args.entrada, args.formato)
+    if entrada_padrao:
+        entrada = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    else:
+        entrada = open(args.entrada, encoding="utf-8", newline="")
+    saida = sys.stdout if args.saida == "-" else open(args.saida, "w", encoding="utf-8")
+    try:
+        classificar_fluxo(
+            ler_frases(entrada, formato, args.campo),
+            saida,
+            processos=args.processos,
+            tamanho_lote=args.tamanho_lote,
+            progresso=Progresso(intervalo=args.intervalo_progresso, ativo=not args.silencioso),
+        )
+    except ValueError as erro:
+        sys.stderr.write(f"{erro}\n")
+        return 2
+    finally:
+        if not entrada_padrao:
+            entrada.close()
+        if saida is not sys.stdout:
+            saida.close()
+        else:
+            saida.flush()
+    return 0
+
+
+def _inteiro_nao_negativo(valor: str) -> int:
+    try:
+        numero = int(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"não é um inteiro: {valor}")
+    if numero < 0:
+        raise argparse.ArgumentTypeError(f"não pode ser negativo: {valor}")
+    return numero
+
+
+def configurar_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "classify",
+        help="Classifica frases de um arquivo (txt, csv ou jsonl) ou da entrada padrão.",
+    )
+    parser.add_argument("entrada", nargs="?", default="-", help="Arquivo de frases ou '-' para stdin (padrão).")
+    parser.add_argument("-o", "--saida", default="-", help="Arquivo JSONL de saída ou '-' para stdout (padrão).")
+    parser.add_argument("-f", "--formato", choices=FORMATOS, help="Formato da entrada; padrão pela extensão (stdin: txt).")
+    parser.add_argument("--campo", help="Coluna do CSV ou campo do JSONL com o texto (padrão: 'texto').")
+    parser.add_argument(
+        "-p", "--processos", type=_inteiro_nao_negativo, default=None,
+        help="Processos do pool (padrão: número de CPUs; 0 roda no processo atual).",
+    )
+    parser.add_argument("-l", "--tamanho-lote", type=int, default=1000, help="Frases por bloco enviado a um processo.")
+    parser.add_argument("--intervalo-progresso", type=float, default=1.0, help="Segundos entre mensagens de progresso.")
+    parser.add_argument("-q", "--silencioso", action="store_true", help="Não escreve progresso em stderr.")
+    parser.set_defaults(funcao=executar_classificacao)
@@ -0,0 +1,169 @@
+"""
+Comparação dos executáveis Windows gerados pelo PyInstaller: tamanho do pacote e tempo de abertura.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+
+Uso típico, depois de gerar os dois perfis (2_gerar_executavel.bat e
+3_gerar_executavel_rapido.bat)::
+
+    python -m simulador exe dist/simulador_llm_Windows.exe ^
+        dist/simulador_llm_Windows_rapido/simulador_llm_Windows_rapido.exe -o comparacao.json
+
+Cada executável é aberto ``--repeticoes`` vezes com ``--profile-startup`` e
+``--fechar-apos-abrir``: o tempo total vai do início do processo ao seu fim
+(inclui a extração do ``--onefile``) e as fases vêm do próprio aplicativo.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+FASE_JANELA = "janela: primeira exibição"
+FASE_GRAFICO = "gráfico: cena e primeiro desenho"
+
+
+def pasta_do_pacote(executavel: Path) -> Optional[Path]:
+    """Pasta do build ``onedir`` que contém ``executavel``, ou ``None`` para um ``--onefile``."""
+    pasta = executavel.parent
+    if (pasta / "_internal").is_dir() or (pasta / "base_library.zip").is_file():
+        return pasta
+    return None
+
+
+def medir_pacote(executavel: Path) -> Dict[str, object]:
+    pasta = pasta_do_pacote(executavel)
+    if pasta is None:
+        return {"layout": "onefile", "bytes": executavel.stat().st_size, "arquivos": 1}
+    arquivos = [caminho for caminho in pasta.rglob("*") if caminho.is_file()]
+    return {
+        "layout": "onedir",
+        "bytes": sum(caminho.stat().st_size for caminho in arquivos),
+        "arquivos": len(arquivos),
+    }
+
+
+def medir_abertura(executavel: Path, tempo_limite: float = 120.0) -> Dict[str, Optional[float]]:
+    """Abre o executável uma vez e retorna os tempos em ms (``None`` se a fase não foi registrada)."""
+    with tempfile.TemporaryDirectory() as temporario:
+        destino = Path(temporario) / "perfil.json"
+        inicio = time.perf_counter()
+        subprocess.run(
+            [str(executavel), "--profile-startup", str(destino), "--fechar-apos-abrir"],
+            cwd=executavel.parent, timeout=tempo_limite, check=True,
+        )
+        total_ms = (time.perf_counter() - inicio) * 1000
+        fases = {}
+        if destino.exists():
+            fases = {fase["fase"]: fase for fase in json.loads(destino.read_text(encoding="utf-8"))["fases"]}
+
+    def fim(nome: str) -> Optional[float]:
+        fase = fases.get(nome)
+        return None if fase is None else fase["inicio_ms"] + fase["duracao_ms"]
+
+    return {"total_ms": total_ms, "janela_ms": fim(FASE_JANELA), "grafico_ms": fim(FASE_GRAFICO)}
+
+
+def comparar_executaveis(executaveis: List[Path], repeticoes: int = 5, tempo_limite: float = 120.0,
+                         relatar=lambda mensagem: None) -> dict:
+    """Mede cada executável; a primeira abertura (fria) é reportada à parte das demais."""
+    resultados = []
+    for executavel in executaveis:
+        pacote = medir_pacote(executavel)
+        aberturas = []
+        for repeticao in range(repeticoes):
+            aberturas.append(medir_abertura(executavel, tempo_limite))
+            relatar(f"{executavel.name}: abertura {repeticao + 1}/{repeticoes} "
+                    f"em {aberturas[-1]['total_ms']:.0f} ms")
+        quentes = aberturas[1:] or aberturas
+
+        def mediana(chave: str) -> Optional[float]:
+            valores = [abertura[chave] for abertura in quentes if abertura[chave] is not None]
+            return statistics.median(valores) if valores else None
+
+        resultados.append({
+            "executavel": str(executavel),
+            **pacote,
+            "primeira_abertura_ms": aberturas[0]["total_ms"],
+            "total_ms": mediana("total_ms"),
+            "janela_ms": mediana("janela_ms"),
+            "grafico_ms": mediana("grafico_ms"),
+            "aberturas": aberturas,
+        })
+    return {"plataforma": sys.platform, "repeticoes": repeticoes, "resultados": resultados}
+
+
+def _formatar_ms(valor: Optional[float]) -> str:
+    return "-" if valor is None else f"{valor:.0f} ms"
+
+
+def formatar_tabela(relatorio: dict) -> str:
+    """Tabela legível; a última coluna compara cada executável com o primeiro (a referência)."""
+    linhas = [
+        f"{'executável':<40} {'layout':<8} {'tamanho':>10} {'arquivos':>9} {'1ª abertura':>12} "
+        f"{'abertura':>10} {'janela':>9} {'gráfico':>9}  vs. referência"
+    ]
+    referencia = relatorio["resultados"][0] if relatorio["resultados"] else None
+    for resultado in relatorio["resultados"]:
+        comparacao = ""
+        if resultado is not referencia:
+            tamanho = resultado["bytes"] / referencia["bytes"] - 1
+            comparacao = f"tamanho {tamanho:+.0%}"
+            if resultado["total_ms"] and referencia["total_ms"]:
+                comparacao += f", abertura {resultado['total_ms'] / referencia['total_ms'] - 1:+.0%}"
+        linhas.append(
+            f"{Path(resultado['executavel']).name:<40} {resultado['layout']:<8} "
+            f"{resultado['bytes'] / 2**20:>8.1f}MB {resultado['arquivos']:>9} "
+            f"{_formatar_ms(resultado['primeira_abertura_ms']):>12} {_formatar_ms(resultado['total_ms']):>10} "
+            f"{_formatar_ms(resultado['janela_ms']):>9} {_formatar_ms(resultado['grafico_ms']):>9}  {comparacao}"
+        )
+    return "\n".join(linhas)
+
+
+# ==================== LINHA DE COMANDO ====================
+
+def executar_comparacao(args) -> int:
+    executaveis = [Path(caminho) for caminho in args.executaveis]
+    faltantes = [str(caminho) for caminho in executaveis if not caminho.is_file()]
+    if faltantes:
+        sys.stderr.write(f"Executável não encontrado: {', '.join(faltantes)}\n")
+        return 2
+
+    def relatar(mensagem: str) -> None:
+        if not args.silencioso:
+            sys.stderr.write(mensagem + "\n")
+            sys.stderr.flush()
+
+    relatorio = comparar_executaveis(executaveis, args.repeticoes, args.tempo_limite, relatar)
+    sys.stderr.write(formatar_tabela(relatorio) + "\n")
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+            arquivo.write("\n")
+    return 0
+
+
+def _inteiro_positivo(valor: str) -> int:
+    try:
+        numero = int(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"não é um inteiro: {valor}")
+    if numero < 1:
+        raise argparse.ArgumentTypeError(f"deve ser pelo menos 1: {valor}")
+    return numero
+
+
+def configurar_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "exe", help="Compara tamanho e tempo de abertura de executáveis do aplicativo Tk.",
+    )
+    parser.add_argument("executaveis", nargs="+", help="Executáveis a comparar; o primeiro é a referência.")
+    parser.add_argument("-r", "--repeticoes", type=_inteiro_positivo, default=5, help="Aberturas por executável (padrão: 5).")
+    parser.add_argument("--tempo-limite", type=float, default=120.0, help="Segundos máximos por abertura.")
+    parser.add_argument("-o", "--saida", help="Grava o relatório completo em JSON.")
+    parser.add_argument("-q", "--silencioso", action="store_true", help="Não escreve o andamento em stderr.")
+    parser.set_defaults(funcao=executar_comparacao)
@@ -0,0 +1,128 @@
+"""
+Índice de trigramas para busca aproximada de palavras por distância de edição.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+
+def distancia_levenshtein(palavra1, palavra2, distancia_maxima=None):
+    """Distância de edição pelo algoritmo bit-paralelo de Myers/Hyyrö.
+
+    Com ``distancia_maxima`` a varredura é interrompida assim que a distância
+    não puder mais ficar dentro do limite; nesse caso retorna ``distancia_maxima + 1``.
+    """
+    if len(palavra1) < len(palavra2):
+        palavra1, palavra2 = palavra2, palavra1
+    len1, len2 = len(palavra1), len(palavra2)
+    if distancia_maxima is not None and len1 - len2 > distancia_maxima:
+        return distancia_maxima + 1
+    if len2 == 0:
+        return len1
+
+    mascaras: Dict[str, int] = {}
+    for i, caractere in enumerate(palavra1):
+        mascaras[caractere] = mascaras.get(caractere, 0) | (1 << i)
+
+    completo = (1 << len1) - 1
+    ultimo_bit = 1 << (len1 - 1)
+    positivos_v, negativos_v = completo, 0
+    distancia = len1
+
+    for j, caractere in enumerate(palavra2, start=1):
+        eq = mascaras.get(caractere, 0)
+        xv = eq | negativos_v
+        xh = (((eq & positivos_v) + positivos_v) ^ positivos_v) | eq
+        positivos_h = negativos_v | (~(xh | positivos_v) & completo)
+        negativos_h = positivos_v & xh
+        if positivos_h & ultimo_bit:
+            distancia += 1
+        elif negativos_h & ultimo_bit:
+            distancia -= 1
+        if distancia_maxima is not None and distancia - (len2 - j) > distancia_maxima:
+            return distancia_maxima + 1
+        positivos_h = ((positivos_h << 1) | 1) & completo
+        negativos_h = (negativos_h << 1) & completo
+        positivos_v = negativos_h | (~(xv | positivos_h) & completo)
+        negativos_v = positivos_h & xv
+
+    return distancia
+
+
+def trigramas(termo):
+    """Trigramas de ``termo`` com duas marcas de borda de cada lado (``len + 2`` itens)."""
+    estendido = f"##{termo}##"
+    return [estendido[i:i + 3] for i in range(len(estendido) - 2)]
+
+
+class IndiceFuzzy:
+    """Listas invertidas de trigramas do vocabulário normalizado, separadas por grupo.
+
+    Uma consulta percorre só as listas dos trigramas da palavra buscada, ou seja,
+    apenas os termos que têm algum trecho em comum com ela.
+    """
+
+    def __init__(self, palavras_por_grupo: Dict[str, Iterable[Tuple[str, str]]]):
+        self.termos: List[str] = []
+        self.distintos: List[int] = []
+        self.ocorrencias: List[List[Tuple[str, str]]] = []
+        self.listas: Dict[str, Dict[str, List[int]]] = {}
+        ids: Dict[str, int] = {}
+
+        for nome_grupo, itens in palavras_por_grupo.items():
+            vistos = set()
+            listas_grupo: Dict[str, List[int]] = {}
+            for palavra, termo_norm in itens:
+                if not termo_norm:
+                    continue
+                id_termo = ids.get(termo_norm)
+                if id_termo is None:
+                    id_termo = ids[termo_norm] = len(self.termos)
+                    self.termos.append(termo_norm)
+                    self.distintos.append(len(set(trigramas(termo_norm))))
+                    self.ocorrencias.append([])
+                self.ocorrencias[id_termo].append((palavra, nome_grupo))
+                if id_termo in vistos:
+                    continue
+                vistos.add(id_termo)
+                for trigrama in set(trigramas(termo_norm)):
+                    listas_grupo.setdefault(trigrama, []).append(id_termo)
+            self.listas[nome_grupo] = listas_grupo
+
+    def _grupos(self, grupo):
+        if grupo is None:
+            return list(self.listas)
+        return [grupo] if grupo in self.listas else []
+
+    def _contar_compartilhados(self, termo_norm, grupo):
+        compartilhados: Dict[Tuple[int, str], int] = {}
+        trigramas_busca = set(trigramas(termo_norm))
+        for nome_grupo in self._grupos(grupo):
+            listas_grupo = self.listas[nome_grupo]
+            for trigrama in trigramas_busca:
+                for id_termo in listas_grupo.get(trigrama, ()):
+                    chave = (id_termo, nome_grupo)
+                    compartilhados[chave] = compartilhados.get(chave, 0) + 1
+        return compartilhados
+
+    def _expandir(self, pares):
+        return [
+            (valor, palavra, nome_grupo)
+            for valor, id_termo, grupo_par in pares
+            for palavra, nome_grupo in self.ocorrencias[id_termo]
+            if nome_grupo == grupo_par
+        ]
+
+    def mais_proximas(self, termo_norm, k=10, grupo=None):
+        """Lista (trigramas em comum, palavra, grupo) dos ``k`` termos que mais compartilham trigramas.
+
+        Os termos são ordenados pelo coeficiente de Dice dos trigramas, uma
+        aproximação barata da similaridade de edição usada para gerar candidatos.
+        """
+        total_busca = len(set(trigramas(termo_norm)))
+        pontuados = []
+        for (id_termo, nome_grupo), comuns in self._contar_compartilhados(termo_norm, grupo).items():
+            dice = 2 * comuns / (total_busca + self.distintos[id_termo])
+            pontuados.append((-dice, self.termos[id_termo], nome_grupo, comuns, id_termo))
+        pontuados.sort()
+        return self._expandir((comuns, id_termo, nome_grupo) for _, _, nome_grupo, comuns, id_termo in pontuados[:k])
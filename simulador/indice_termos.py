@@ -0,0 +1,224 @@
+"""
+Termos do vocabulário já normalizados e busca de todos eles numa passada (Aho-Corasick).
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+
+Só biblioteca padrão: serve ao núcleo (que estende ``IndiceTermos`` em
+``VocabularyIndex``) e ao aplicativo Tk, que não carrega o núcleo nem o NumPy.
+"""
+
+import heapq
+from typing import Dict, List, Set, Tuple
+
+from simulador.texto import normalizar_texto, tokenizar
+
+PAPEIS_VOCABULARIO = ("contexto", "principal", "inferencia")
+
+
+def _eh_caractere_de_palavra(caractere):
+    return caractere.isalnum() or caractere == "_"
+
+
+class AutomatoAhoCorasick:
+    """Busca simultânea de vários termos, respeitando limites de palavra."""
+
+    def __init__(self, termos):
+        self.termos: List[str] = []
+        self._transicoes: List[Dict[str, int]] = [{}]
+        self._falhas: List[int] = [0]
+        self._saidas: List[List[int]] = [[]]
+
+        for termo in dict.fromkeys(termos):
+            if not termo:
+                continue
+            estado = 0
+            for caractere in termo:
+                proximo = self._transicoes[estado].get(caractere)
+                if proximo is None:
+                    proximo = len(self._transicoes)
+                    self._transicoes[estado][caractere] = proximo
+                    self._transicoes.append({})
+                    self._falhas.append(0)
+                    self._saidas.append([])
+                estado = proximo
+            self._saidas[estado].append(len(self.termos))
+            self.termos.append(termo)
+
+        fila = list(self._transicoes[0].values())
+        for estado in fila:
+            for caractere, proximo in self._transicoes[estado].items():
+                fila.append(proximo)
+                falha = self._falhas[estado]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falhas[falha]
+                destino = self._transicoes[falha].get(caractere, 0)
+                self._falhas[proximo] = destino if destino != proximo else 0
+                self._saidas[proximo] = self._saidas[proximo] + self._saidas[self._falhas[proximo]]
+
+    def buscar(self, texto):
+        """Gera (inicio, fim, termo) para cada ocorrência delimitada por limites de palavra."""
+        transicoes, falhas, saidas, termos = self._transicoes, self._falhas, self._saidas, self.termos
+        tamanho = len(texto)
+        estado = 0
+        for posicao, caractere in enumerate(texto):
+            while estado and caractere not in transicoes[estado]:
+                estado = falhas[estado]
+            estado = transicoes[estado].get(caractere, 0)
+            if not saidas[estado]:
+                continue
+            fim = posicao + 1
+            if fim < tamanho and _eh_caractere_de_palavra(texto[fim]):
+                continue
+            for id_termo in saidas[estado]:
+                termo = termos[id_termo]
+                inicio = fim - len(termo)
+                if inicio > 0 and _eh_caractere_de_palavra(texto[inicio - 1]):
+                    continue
+                yield inicio, fim, termo
+
+
+class IndiceTermos:
+    """Formas normalizadas de grupos, contexto e inferência, com o papel e os grupos de cada termo."""
+
+    def __init__(self, grupos, contexto_grupos, palavras_inferencia):
+        self.nomes_grupos: List[str] = list(grupos.keys())
+        self.termos_normalizados: Dict[str, str] = {}
+        self.entradas: Dict[str, List[Tuple[str, str]]] = {papel: [] for papel in PAPEIS_VOCABULARIO}
+        self.papeis_por_termo: Dict[str, Set[Tuple[str, str]]] = {}
+        self.grupos_por_termo: Dict[str, Tuple[str, ...]] = {}
+        self.palavras_ordenadas: Dict[str, List[Tuple[str, str]]] = {}
+
+        fontes = {
+            "contexto": contexto_grupos,
+            "principal": grupos,
+            "inferencia": palavras_inferencia,
+        }
+        for papel in PAPEIS_VOCABULARIO:
+            for nome_grupo, termos in fontes[papel].items():
+                for termo in termos:
+                    termo_norm = self.normalizar(termo)
+                    self.entradas[papel].append((nome_grupo, termo_norm))
+                    self.papeis_por_termo.setdefault(termo_norm, set()).add((papel, nome_grupo))
+
+        grupos_por_termo: Dict[str, List[str]] = {}
+        for nome_grupo, palavras_grupo in grupos.items():
+            normalizadas = {self.normalizar(p) for p in palavras_grupo}
+            for termo_norm in normalizadas:
+                grupos_por_termo.setdefault(termo_norm, []).append(nome_grupo)
+            self.palavras_ordenadas[nome_grupo] = [
+                (palavra, self.normalizar(palavra)) for palavra in sorted(palavras_grupo)
+            ]
+        self.grupos_por_termo = {termo: tuple(nomes) for termo, nomes in grupos_por_termo.items()}
+        self.conhecidas: Set[str] = set(self.papeis_por_termo)
+
+        self.entradas_por_termo: Dict[str, List[Tuple[str, str]]] = {}
+        for papel in PAPEIS_VOCABULARIO:
+            for nome_grupo, termo_norm in self.entradas[papel]:
+                self.entradas_por_termo.setdefault(termo_norm, []).append((papel, nome_grupo))
+        self.automato = AutomatoAhoCorasick(self.entradas_por_termo)
+        # Termos incluídos por recargas depois da montagem do autômato principal.
+        self._automato_extra = None
+        self._termos_extras: List[str] = []
+
+    def buscar(self, texto_normalizado):
+        """Ocorrências ``(inicio, fim, termo)`` dos termos atuais, na ordem do texto."""
+        ocorrencias = self.automato.buscar(texto_normalizado)
+        if self._automato_extra is not None:
+            ocorrencias = heapq.merge(
+                ocorrencias, self._automato_extra.buscar(texto_normalizado), key=lambda o: o[1]
+            )
+        entradas_por_termo = self.entradas_por_termo
+        # Termos removidos por recargas continuam no autômato até a próxima compactação.
+        return (ocorrencia for ocorrencia in ocorrencias if ocorrencia[2] in entradas_por_termo)
+
+    def normalizar(self, termo):
+        termo_norm = self.termos_normalizados.get(termo)
+        if termo_norm is None:
+            termo_norm = normalizar_texto(termo)
+            self.termos_normalizados[termo] = termo_norm
+        return termo_norm
+
+    def grupos_do_termo(self, termo_norm):
+        return self.grupos_por_termo.get(termo_norm, ())
+
+    def papeis_do_termo(self, termo_norm):
+        return self.papeis_por_termo.get(termo_norm, set())
+
+    def varrer_texto(self, texto_normalizado, pesos):
+        """Percorre o texto uma vez, somando os pesos e listando (termo, grupo, papel) encontrados."""
+        return self.pontuar_ocorrencias(self.buscar(texto_normalizado), pesos)
+
+    def pontuar_ocorrencias(self, ocorrencias_texto, pesos):
+        """Como ``varrer_texto``, a partir de ocorrências ``(inicio, fim, termo)`` já buscadas."""
+        scores = {nome: 0.0 for nome in self.nomes_grupos}
+        ocorrencias: List[Tuple[str, str, str]] = []
+        vistos: Set[str] = set()
+        for _, _, termo in ocorrencias_texto:
+            if termo in vistos:
+                continue
+            vistos.add(termo)
+            for papel, nome_grupo in self.entradas_por_termo[termo]:
+                scores[nome_grupo] += pesos[papel]
+                ocorrencias.append((termo, nome_grupo, papel))
+        return scores, ocorrencias
+
+
+class TextoAnalisado:
+    """Um texto normalizado, tokenizado e varrido uma única vez, para todos os detectores.
+
+    - ``tokens``: ``(inicio, fim, palavra)`` de cada palavra, sem pontuação nas pontas.
+    - ``ocorrencias``: termos do vocabulário encontrados, como em ``IndiceTermos.buscar``.
+    - ``itens``: as palavras do texto, com cada termo de várias palavras do
+      vocabulário ("posto de gasolina") no lugar das palavras que ele cobre.
+    """
+
+    __slots__ = ("normalizado", "tokens", "ocorrencias", "itens")
+
+    def __init__(self, texto_normalizado, indice):
+        self.normalizado = texto_normalizado
+        self.tokens = tokenizar(texto_normalizado)
+        self.ocorrencias = list(indice.buscar(texto_normalizado))
+        self.itens = self._agrupar_expressoes()
+
+    def _agrupar_expressoes(self):
+        tokens = self.tokens
+        expressoes = [o for o in self.ocorrencias if " " in o[2]]
+        if not expressoes:
+            return [palavra for _, _, palavra in tokens if palavra]
+
+        por_inicio = {inicio: i for i, (inicio, _, _) in enumerate(tokens)}
+        por_fim = {fim: i for i, (_, fim, _) in enumerate(tokens)}
+        # Mais à esquerda primeiro e, no mesmo início, a mais longa.
+        expressoes.sort(key=lambda o: (o[0], o[0] - o[1]))
+        escolhidas: Dict[int, Tuple[int, str]] = {}
+        livre_a_partir = 0
+        for inicio, fim, termo in expressoes:
+            primeiro, ultimo = por_inicio.get(inicio), por_fim.get(fim)
+            if primeiro is None or ultimo is None or primeiro < livre_a_partir:
+                continue
+            escolhidas[primeiro] = (ultimo, termo)
+            livre_a_partir = ultimo + 1
+
+        itens = []
+        i = 0
+        while i < len(tokens):
+            escolhida = escolhidas.get(i)
+            if escolhida is not None:
+                itens.append(escolhida[1])
+                i = escolhida[0] + 1
+                continue
+            if tokens[i][2]:
+                itens.append(tokens[i][2])
+            i += 1
+        return itens
+
+    def ambiguas(self, indice):
+        ambiguas = []
+        for item in self.itens:
+            grupos_encontrados = indice.grupos_do_termo(item)
+            if len(grupos_encontrados) > 1:
+                ambiguas.append((item, list(grupos_encontrados)))
+        return ambiguas
+
+    def desconhecidas(self, indice):
+        conhecidas = indice.conhecidas
+        return [item for item in self.itens if len(item) > 2 and item not in conhecidas]
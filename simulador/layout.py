@@ -0,0 +1,149 @@
+"""
+Coordenadas determinísticas de grupos e palavras, compartilhadas pelos gráficos Plotly e Tk.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+
+Os grupos ficam numa elipse e as palavras de cada grupo num anel ao redor do
+centro, em ordem alfabética. A altura (z) de cada palavra vem de um hash da
+palavra e do grupo, então a cena não muda entre execuções e adicionar uma
+palavra só recalcula o anel do grupo dela.
+"""
+
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+def ruido_normal(chaves: List[str], semente: int = 0) -> np.ndarray:
+    """Um valor ~N(0, 1) reproduzível para cada chave (Box-Muller sobre blake2b)."""
+    if not chaves:
+        return np.zeros(0)
+    bruto = b"".join(
+        hashlib.blake2b(f"{semente}\x1f{chave}".encode("utf-8"), digest_size=16).digest()
+        for chave in chaves
+    )
+    inteiros = np.frombuffer(bruto, dtype="<u8").reshape(-1, 2)
+    uniformes = (inteiros >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+    return np.sqrt(-2.0 * np.log1p(-uniformes[:, 0])) * np.cos(2 * np.pi * uniformes[:, 1])
+
+
+_ruidos_registrados: Dict[Tuple[int, str], Tuple[List[str], np.ndarray]] = {}
+
+
+def calcular_ruidos(grupos: Mapping[str, Iterable[str]], semente: int = 0) -> Dict[str, Tuple[List[str], np.ndarray]]:
+    """Ruído de cada grupo, alinhado com as palavras em ordem alfabética (para snapshots)."""
+    ruidos = {}
+    for nome, palavras in grupos.items():
+        lista = sorted(palavras)
+        ruidos[nome] = (lista, ruido_normal([f"{nome}\x1f{p}" for p in lista], semente))
+    return ruidos
+
+
+def registrar_ruidos(ruidos: Mapping[str, Tuple[List[str], np.ndarray]], semente: int = 0) -> None:
+    """Reaproveita ruídos já calculados (de um snapshot) enquanto o grupo não mudar."""
+    for nome, (palavras, valores) in ruidos.items():
+        _ruidos_registrados[(semente, nome)] = (palavras, valores)
+
+
+class LayoutVocabulario:
+    """Posições de todos os grupos e palavras, guardadas como arrays NumPy.
+
+    - ``centros[grupo]``: array ``(3,)`` com o centro do grupo.
+    - ``palavras[grupo]``: palavras do grupo em ordem alfabética.
+    - ``posicoes[grupo]``: array ``(n, 3)`` alinhado com ``palavras[grupo]``.
+    """
+
+    def __init__(
+        self,
+        grupos: Mapping[str, Iterable[str]],
+        raio_grupos: float = 5.0,
+        raio_grupos_y: Optional[float] = None,
+        raio_interno: float = 0.8,
+        escala_z: float = 0.3,
+        semente: int = 0,
+    ):
+        self.raio_grupos = raio_grupos
+        self.raio_grupos_y = raio_grupos if raio_grupos_y is None else raio_grupos_y
+        self.raio_interno = raio_interno
+        self.escala_z = escala_z
+        self.semente = semente
+        self._reconstruir(grupos)
+
+    def _reconstruir(self, grupos: Mapping[str, Iterable[str]]) -> None:
+        self.nomes_grupos: List[str] = list(grupos.keys())
+        angulos = np.linspace(0, 2 * np.pi, len(self.nomes_grupos), endpoint=False)
+        centros = np.column_stack([
+            self.raio_grupos * np.cos(angulos),
+            self.raio_grupos_y * np.sin(angulos),
+            np.zeros(len(angulos)),
+        ])
+        self.centros: Dict[str, np.ndarray] = dict(zip(self.nomes_grupos, centros))
+        self.palavras: Dict[str, List[str]] = {}
+        self.posicoes: Dict[str, np.ndarray] = {}
+        self._conjuntos: Dict[str, frozenset] = {}
+        for nome, palavras in grupos.items():
+            self._calcular_grupo(nome, palavras)
+
+    def _calcular_grupo(self, nome: str, palavras: Iterable[str]) -> None:
+        lista = sorted(palavras)
+        n_palavras = len(lista)
+        angulos = 2 * np.pi * np.arange(n_palavras) / max(n_palavras, 1)
+        centro_x, centro_y, _ = self.centros[nome]
+        posicoes = np.empty((n_palavras, 3))
+        posicoes[:, 0] = centro_x + self.raio_interno * np.cos(angulos)
+        posicoes[:, 1] = centro_y + self.raio_interno * np.sin(angulos)
+        if self.escala_z:
+            registrado = _ruidos_registrados.get((self.semente, nome))
+            if registrado is not None and registrado[0] == lista:
+                ruido = registrado[1]
+            else:
+                ruido = ruido_normal([f"{nome}\x1f{p}" for p in lista], self.semente)
+            posicoes[:, 2] = self.escala_z * ruido
+        else:
+            posicoes[:, 2] = 0.0
+        self.palavras[nome] = lista
+        self.posicoes[nome] = posicoes
+        self._conjuntos[nome] = frozenset(lista)
+
+    def adicionar_palavra(self, grupo: str, palavra: str) -> bool:
+        if palavra in self._conjuntos[grupo]:
+            return False
+        self._calcular_grupo(grupo, self._conjuntos[grupo] | {palavra})
+        return True
+
+    def remover_palavra(self, grupo: str, palavra: str) -> bool:
+        if palavra not in self._conjuntos[grupo]:
+            return False
+        self._calcular_grupo(grupo, self._conjuntos[grupo] - {palavra})
+        return True
+
+    def sincronizar(self, grupos: Mapping[str, Iterable[str]]) -> List[str]:
+        """Recalcula só os grupos cujas palavras mudaram; retorna os nomes recalculados."""
+        if list(grupos.keys()) != self.nomes_grupos:
+            self._reconstruir(grupos)
+            return list(self.nomes_grupos)
+        alterados = []
+        for nome, palavras in grupos.items():
+            if not isinstance(palavras, (set, frozenset)):
+                palavras = set(palavras)
+            if self._conjuntos[nome] != palavras:
+                self._calcular_grupo(nome, palavras)
+                alterados.append(nome)
+        return alterados
+
+
+_layouts: Dict[Tuple, LayoutVocabulario] = {}
+_trava_layouts = threading.Lock()
+
+
+def obter_layout(grupos: Mapping[str, Iterable[str]], **parametros) -> LayoutVocabulario:
+    """Layout de ``grupos`` para estes parâmetros, reaproveitado e atualizado entre chamadas."""
+    chave = (id(grupos),) + tuple(sorted(parametros.items()))
+    with _trava_layouts:
+        layout = _layouts.get(chave)
+        if layout is None:
+            layout = _layouts[chave] = LayoutVocabulario(grupos, **parametros)
+        else:
+            layout.sincronizar(grupos)
+        return layout
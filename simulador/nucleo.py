@@ -0,0 +1,987 @@
+"""
+Muiraquitã - Núcleo do simulador: vocabulário, análise de contexto e similaridade.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+
+Não depende de Streamlit nem de Plotly, para poder ser usado por ferramentas
+de linha de comando e serviços.
+"""
+
+import copy
+import hashlib
+import os
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from simulador import vocabulario
+from simulador.cache import CacheLRU
+from simulador.indice_fuzzy import IndiceFuzzy, distancia_levenshtein
+from simulador.indice_termos import PAPEIS_VOCABULARIO, AutomatoAhoCorasick, IndiceTermos, TextoAnalisado
+from simulador.layout import calcular_ruidos, registrar_ruidos
+from simulador.pertinencia import MapaPertinencia
+from simulador.texto import normalizar_texto
+
+# ==================== DADOS ====================
+
+# Preenchidos por carregar_vocabulario() a partir de simulador/vocabularios/padrao.json
+# (ou do arquivo em $MUIRAQUITA_VOCABULARIO). São sempre alterados no lugar, para que
+# quem importou estes nomes continue vendo o vocabulário atual.
+GRUPOS: Dict[str, Set[str]] = {}
+COMMON_WORD = ""
+COMMON_WORD_GROUPS: List[str] = []
+CONTEXTO_GRUPOS: Dict[str, Set[str]] = {}
+PALAVRAS_INFERENCIA: Dict[str, List[str]] = {}
+CORES_GRUPOS: Dict[str, str] = {}
+PESOS: Dict[str, float] = {}
+
+
+def _validar_grupos_comuns(grupos_comuns=None):
+    grupos_definidos = set(GRUPOS.keys())
+    faltantes = [nome for nome in (grupos_comuns or COMMON_WORD_GROUPS) if nome not in grupos_definidos]
+    if faltantes:
+        faltantes_fmt = ", ".join(sorted(faltantes))
+        raise ValueError(
+            f"COMMON_WORD_GROUPS contém grupos inexistentes: {faltantes_fmt}. "
+            "Verifique os nomes definidos em GRUPOS."
+        )
+
+# ==================== FUNÇÕES ====================
+
+def sincronizar_palavra_comum():
+    palavra_norm = normalizar_texto(COMMON_WORD)
+    for nome, palavras in list(GRUPOS.items()):
+        if not isinstance(palavras, set):
+            GRUPOS[nome] = set(palavras)
+    if not palavra_norm:
+        return
+
+    for nome in COMMON_WORD_GROUPS:
+        if nome in GRUPOS:
+            if COMMON_WORD not in GRUPOS[nome]:
+                GRUPOS[nome].add(COMMON_WORD)
+
+    # Reaproveita as formas normalizadas do índice atual: numa recarga só as palavras novas são normalizadas.
+    normalizar = _indice_vocabulario.normalizar if _indice_vocabulario is not None else normalizar_texto
+    for nome, palavras in list(GRUPOS.items()):
+        if nome not in COMMON_WORD_GROUPS:
+            restantes = {p for p in palavras if normalizar(p) != palavra_norm}
+            if len(restantes) != len(palavras):
+                GRUPOS[nome] = restantes
+
+
+class VocabularyIndex(IndiceTermos):
+    """Formas normalizadas do vocabulário, calculadas uma única vez por versão."""
+
+    def __init__(self, grupos, contexto_grupos, palavras_inferencia):
+        self.assinatura = _assinatura_vocabulario(grupos, contexto_grupos, palavras_inferencia)
+        # Mantém as coleções de origem vivas para que os ids da assinatura não sejam reciclados.
+        self._origens = (grupos, contexto_grupos, palavras_inferencia)
+        super().__init__(grupos, contexto_grupos, palavras_inferencia)
+        self.pertinencia = MapaPertinencia(grupos, self.normalizar)
+        conteudo = repr((
+            self.nomes_grupos,
+            [(papel, sorted(self.entradas[papel])) for papel in PAPEIS_VOCABULARIO],
+            sorted(self.palavras_ordenadas.items()),
+        ))
+        self.hash_conteudo = hashlib.blake2b(conteudo.encode("utf-8"), digest_size=16).hexdigest()
+        self._motor_similaridade = None
+        self._indice_fuzzy = None
+        self.ids_termos = {termo: i for i, termo in enumerate(self.automato.termos)}
+        self._matrizes_pesos: Dict[tuple, np.ndarray] = {}
+
+    # Tudo o que é derivado só do conteúdo e pode ir para o snapshot do vocabulário.
+    CAMPOS_SNAPSHOT = (
+        "nomes_grupos", "termos_normalizados", "entradas", "papeis_por_termo", "grupos_por_termo",
+        "palavras_ordenadas", "conhecidas", "hash_conteudo", "entradas_por_termo", "ids_termos",
+    )
+
+    def estado(self) -> dict:
+        if self._automato_extra is not None:
+            self._compactar()
+        estado = {campo: getattr(self, campo) for campo in self.CAMPOS_SNAPSHOT}
+        automato = self.automato
+        estado["automato"] = (automato.termos, automato._transicoes, automato._falhas, automato._saidas)
+        estado["pertinencia"] = self.pertinencia.estado()
+        return estado
+
+    @classmethod
+    def de_estado(cls, estado, grupos, contexto_grupos, palavras_inferencia) -> "VocabularyIndex":
+        """Reconstrói o índice a partir de ``estado()``, sem normalizar termos nem montar o autômato."""
+        indice = cls.__new__(cls)
+        for campo in cls.CAMPOS_SNAPSHOT:
+            setattr(indice, campo, estado[campo])
+        automato = AutomatoAhoCorasick.__new__(AutomatoAhoCorasick)
+        automato.termos, automato._transicoes, automato._falhas, automato._saidas = estado["automato"]
+        indice.automato = automato
+        indice.assinatura = _assinatura_vocabulario(grupos, contexto_grupos, palavras_inferencia)
+        indice._origens = (grupos, contexto_grupos, palavras_inferencia)
+        indice.pertinencia = MapaPertinencia.de_estado(estado["pertinencia"], indice.normalizar)
+        indice._automato_extra = None
+        indice._termos_extras = []
+        indice._motor_similaridade = None
+        indice._indice_fuzzy = None
+        indice._matrizes_pesos = {}
+        return indice
+
+    # Termos novos ficam num autômato à parte até passarem desta fração do principal.
+    FRACAO_EXTRAS = 0.125
+    MINIMO_EXTRAS = 1024
+
+    def com_alteracoes(self, alteracoes, grupos, contexto_grupos, palavras_inferencia, pesos=None):
+        """Novo índice com as ``alteracoes`` aplicadas; este continua válido para quem já o usa.
+
+        ``alteracoes[papel][grupo]`` é ``(adicionados, removidos)`` com os termos originais,
+        e as coleções passadas já devem estar no estado novo. Só os termos citados são
+        renormalizados e só os grupos alterados têm a lista ordenada refeita; das matrizes
+        de pesos, só a de ``pesos`` (ou todas, se ``None``) é atualizada e mantida. Retorna
+        o índice e os grupos cujas palavras, ou a pertinência delas, mudaram.
+        """
+        novo = copy.copy(self)
+        novo.assinatura = _assinatura_vocabulario(grupos, contexto_grupos, palavras_inferencia)
+        novo._origens = (grupos, contexto_grupos, palavras_inferencia)
+        novo.entradas = dict(self.entradas)
+        novo.entradas_por_termo = dict(self.entradas_por_termo)
+        novo.papeis_por_termo = dict(self.papeis_por_termo)
+        novo.grupos_por_termo = dict(self.grupos_por_termo)
+        novo.palavras_ordenadas = dict(self.palavras_ordenadas)
+        novo.conhecidas = set(self.conhecidas)
+        novo.ids_termos = dict(self.ids_termos)
+
+        fontes = {"contexto": contexto_grupos, "principal": grupos, "inferencia": palavras_inferencia}
+        ordem = {
+            papel: {nome: (i, j) for j, nome in enumerate(fontes[papel])}
+            for i, papel in enumerate(PAPEIS_VOCABULARIO)
+        }
+        afetados: Dict[str, List[Tuple[str, str]]] = {}
+
+        def entradas_do_termo(termo_norm):
+            lista = afetados.get(termo_norm)
+            if lista is None:
+                lista = afetados[termo_norm] = list(self.entradas_por_termo.get(termo_norm, ()))
+            return lista
+
+        for papel in PAPEIS_VOCABULARIO:
+            por_grupo = alteracoes.get(papel, {})
+            if not por_grupo:
+                continue
+            retirar = Counter()
+            incluir = []
+            for nome_grupo, (adicionados, removidos) in por_grupo.items():
+                for termo in removidos:
+                    termo_norm = novo.normalizar(termo)
+                    entradas_do_termo(termo_norm).remove((papel, nome_grupo))
+                    retirar[(nome_grupo, termo_norm)] += 1
+                for termo in adicionados:
+                    termo_norm = novo.normalizar(termo)
+                    entradas_do_termo(termo_norm).append((papel, nome_grupo))
+                    incluir.append((nome_grupo, termo_norm))
+            entradas = []
+            for entrada in self.entradas[papel]:
+                if entrada in retirar and retirar[entrada]:
+                    retirar[entrada] -= 1
+                else:
+                    entradas.append(entrada)
+            novo.entradas[papel] = entradas + incluir
+
+        grupos_afetados = set(alteracoes.get("principal", {}))
+        termos_novos = []
+        for termo_norm, lista in afetados.items():
+            lista.sort(key=lambda entrada: ordem[entrada[0]][entrada[1]])
+            grupos_antes = self.grupos_por_termo.get(termo_norm, ())
+            grupos_depois = tuple(dict.fromkeys(nome for papel, nome in lista if papel == "principal"))
+            if lista:
+                novo.entradas_por_termo[termo_norm] = lista
+                novo.papeis_por_termo[termo_norm] = set(lista)
+                novo.conhecidas.add(termo_norm)
+                if termo_norm not in novo.ids_termos:
+                    novo.ids_termos[termo_norm] = len(novo.ids_termos)
+                    termos_novos.append(termo_norm)
+            else:
+                novo.entradas_por_termo.pop(termo_norm, None)
+                novo.papeis_por_termo.pop(termo_norm, None)
+                novo.conhecidas.discard(termo_norm)
+            if grupos_depois:
+                novo.grupos_por_termo[termo_norm] = grupos_depois
+            else:
+                novo.grupos_por_termo.pop(termo_norm, None)
+            if grupos_depois != grupos_antes:
+                grupos_afetados.update(grupos_antes, grupos_depois)
+
+        principais = alteracoes.get("principal", {})
+        for nome_grupo in principais:
+            novo.palavras_ordenadas[nome_grupo] = [
+                (palavra, novo.normalizar(palavra)) for palavra in sorted(grupos[nome_grupo])
+            ]
+        if principais:
+            novo.pertinencia = self.pertinencia.com_alteracoes(
+                grupos,
+                {termo: novo.grupos_por_termo.get(termo, ()) for termo in afetados},
+                (palavra for adicionados, _ in principais.values() for palavra in adicionados),
+            )
+            novo._motor_similaridade = None
+            novo._indice_fuzzy = None
+
+        novo._termos_extras = self._termos_extras + termos_novos
+        if len(novo._termos_extras) > max(self.MINIMO_EXTRAS, len(self.automato.termos) * self.FRACAO_EXTRAS):
+            novo._compactar()
+        else:
+            if termos_novos:
+                novo._automato_extra = AutomatoAhoCorasick(novo._termos_extras)
+            colunas = {nome: j for j, nome in enumerate(self.nomes_grupos)}
+            novo._matrizes_pesos = {}
+            for chave, matriz in self._matrizes_pesos.items():
+                if pesos is not None and chave != tuple(sorted(pesos.items())):
+                    continue
+                faltantes = len(novo.ids_termos) - matriz.shape[0]
+                matriz = np.vstack([matriz, np.zeros((faltantes, matriz.shape[1]))])
+                pesos_matriz = dict(chave)
+                for termo_norm in afetados:
+                    linha = novo.ids_termos[termo_norm]
+                    matriz[linha] = 0.0
+                    for papel, nome_grupo in novo.entradas_por_termo.get(termo_norm, ()):
+                        matriz[linha, colunas[nome_grupo]] += pesos_matriz[papel]
+                novo._matrizes_pesos[chave] = matriz
+
+        if afetados or principais:
+            resumo = repr([
+                (papel, nome_grupo, sorted(adicionados), sorted(removidos))
+                for papel in PAPEIS_VOCABULARIO
+                for nome_grupo, (adicionados, removidos) in sorted(alteracoes.get(papel, {}).items())
+            ])
+            novo.hash_conteudo = hashlib.blake2b(
+                (self.hash_conteudo + resumo).encode("utf-8"), digest_size=16
+            ).hexdigest()
+        return novo, grupos_afetados
+
+    def _compactar(self):
+        """Remonta o autômato principal só com os termos ativos, absorvendo os extras."""
+        self.automato = AutomatoAhoCorasick(self.entradas_por_termo)
+        self._automato_extra = None
+        self._termos_extras = []
+        self.ids_termos = {termo: i for i, termo in enumerate(self.automato.termos)}
+        self._matrizes_pesos = {}
+
+    def motor_similaridade(self) -> "MotorSimilaridade":
+        if self._motor_similaridade is None:
+            self._motor_similaridade = MotorSimilaridade(self.palavras_ordenadas)
+        return self._motor_similaridade
+
+    def indice_fuzzy(self) -> IndiceFuzzy:
+        if self._indice_fuzzy is None:
+            self._indice_fuzzy = IndiceFuzzy(self.palavras_ordenadas)
+        return self._indice_fuzzy
+
+    def matriz_pesos(self, pesos) -> np.ndarray:
+        """Matriz termo x grupo com a soma dos pesos de cada papel do termo."""
+        chave = tuple(sorted(pesos.items()))
+        matriz = self._matrizes_pesos.get(chave)
+        if matriz is None:
+            colunas = {nome: j for j, nome in enumerate(self.nomes_grupos)}
+            matriz = np.zeros((len(self.ids_termos), len(self.nomes_grupos)), dtype=np.float64)
+            for termo, i in self.ids_termos.items():
+                for papel, nome_grupo in self.entradas_por_termo.get(termo, ()):
+                    matriz[i, colunas[nome_grupo]] += pesos[papel]
+            self._matrizes_pesos[chave] = matriz
+        return matriz
+
+
+_versao_vocabulario = 0
+_indice_vocabulario = None
+_trava_vocabulario = threading.RLock()
+# (hash antes, hash depois, grupos afetados) de cada recarga incremental desde a última carga completa.
+_historico_alteracoes = deque(maxlen=32)
+# (caminho, (mtime_ns, tamanho), hash) do arquivo carregado, para verificar_vocabulario().
+_fonte_vocabulario = None
+_proxima_verificacao = 0.0
+INTERVALO_VERIFICACAO = 1.0
+
+
+def _assinatura_vocabulario(grupos=None, contexto_grupos=None, palavras_inferencia=None):
+    fontes = (
+        GRUPOS if grupos is None else grupos,
+        CONTEXTO_GRUPOS if contexto_grupos is None else contexto_grupos,
+        PALAVRAS_INFERENCIA if palavras_inferencia is None else palavras_inferencia,
+    )
+    return (_versao_vocabulario,) + tuple(
+        (id(fonte),) + tuple((nome, id(termos), len(termos)) for nome, termos in fonte.items())
+        for fonte in fontes
+    )
+
+
+def invalidar_indice_vocabulario():
+    """Força a reconstrução do índice após edições que não alteram o tamanho dos conjuntos."""
+    global _versao_vocabulario
+    _versao_vocabulario += 1
+
+
+def obter_indice_vocabulario() -> VocabularyIndex:
+    global _indice_vocabulario
+    indice = _indice_vocabulario
+    if indice is None or indice.assinatura != _assinatura_vocabulario():
+        # Durante uma recarga a assinatura muda antes do índice novo ficar pronto: espera a recarga.
+        with _trava_vocabulario:
+            if _indice_vocabulario is None or _indice_vocabulario.assinatura != _assinatura_vocabulario():
+                _indice_vocabulario = VocabularyIndex(GRUPOS, CONTEXTO_GRUPOS, PALAVRAS_INFERENCIA)
+            indice = _indice_vocabulario
+    return indice
+
+
+def _aplicar_vocabulario(dados):
+    global COMMON_WORD
+    for destino, origem in (
+        (GRUPOS, dados["grupos"]),
+        (CONTEXTO_GRUPOS, dados["contexto_grupos"]),
+        (PALAVRAS_INFERENCIA, dados["palavras_inferencia"]),
+        (CORES_GRUPOS, dados["cores_grupos"]),
+        (PESOS, dados["pesos"]),
+    ):
+        destino.clear()
+        destino.update(origem)
+    COMMON_WORD = dados["common_word"]
+    COMMON_WORD_GROUPS[:] = dados["common_word_groups"]
+
+
+def _estatistica_fonte(caminho):
+    try:
+        estatistica = os.stat(caminho)
+    except OSError:
+        return None
+    return estatistica.st_mtime_ns, estatistica.st_size
+
+
+def carregar_vocabulario(caminho=None, gravar_snapshot=False):
+    """Carrega o vocabulário de um arquivo JSON/TOML e retorna o caminho usado.
+
+    Se o snapshot ``<arquivo>.snap`` corresponder ao arquivo, vocabulário,
+    índice e ruído do layout vêm dele, de uma só leitura. Senão o arquivo é
+    processado em memória; o snapshot só é gravado com ``gravar_snapshot=True``
+    (``python -m simulador vocab compilar``), nunca como efeito da importação.
+    """
+    global _fonte_vocabulario
+    caminho = vocabulario.caminho_vocabulario(caminho)
+    with _trava_vocabulario:
+        estatistica = _estatistica_fonte(caminho)
+        hash_da_fonte = vocabulario.hash_fonte(caminho)
+        _carregar_fonte(caminho, hash_da_fonte, gravar_snapshot=gravar_snapshot)
+        _historico_alteracoes.clear()
+        _fonte_vocabulario = (caminho, estatistica, hash_da_fonte)
+    return caminho
+
+
+def _carregar_fonte(caminho, hash_da_fonte, dados=None, gravar_snapshot=False):
+    global _indice_vocabulario
+    arquivo_snapshot = vocabulario.caminho_snapshot(caminho)
+    snapshot = vocabulario.ler_snapshot(arquivo_snapshot, hash_da_fonte)
+    if snapshot:
+        dados = snapshot["vocabulario"]
+    elif dados is None:
+        dados = vocabulario.ler_fonte(caminho)[0]
+
+    _aplicar_vocabulario(dados)
+    _validar_grupos_comuns()
+    sincronizar_palavra_comum()
+    invalidar_indice_vocabulario()
+
+    if snapshot:
+        _indice_vocabulario = VocabularyIndex.de_estado(
+            snapshot["indice"], GRUPOS, CONTEXTO_GRUPOS, PALAVRAS_INFERENCIA
+        )
+        registrar_ruidos(snapshot["ruidos"])
+        return
+
+    indice = obter_indice_vocabulario()
+    ruidos = calcular_ruidos(GRUPOS)
+    registrar_ruidos(ruidos)
+    if not gravar_snapshot:
+        return
+    conteudo = {
+        "vocabulario": {
+            "grupos": GRUPOS,
+            "contexto_grupos": CONTEXTO_GRUPOS,
+            "palavras_inferencia": PALAVRAS_INFERENCIA,
+            "cores_grupos": CORES_GRUPOS,
+            "pesos": PESOS,
+            "common_word": COMMON_WORD,
+            "common_word_groups": COMMON_WORD_GROUPS,
+        },
+        "indice": indice.estado(),
+        "ruidos": ruidos,
+    }
+    vocabulario.gravar_snapshot(arquivo_snapshot, hash_da_fonte, conteudo)
+
+
+def recarregar_vocabulario(caminho=None):
+    """Aplica ao vocabulário em uso só o que mudou no arquivo e retorna um resumo.
+
+    Termos adicionados e removidos atualizam o índice atual em vez de recriá-lo
+    (``VocabularyIndex.com_alteracoes``), a palavra comum é ressincronizada e a
+    versão do vocabulário avança, então resultados em cache deixam de valer.
+    Mudanças nos nomes ou na ordem dos grupos recarregam tudo. Retorna ``None``
+    se o conteúdo do arquivo não mudou; lança ``ValueError`` se ele for inválido.
+    """
+    global COMMON_WORD, _indice_vocabulario, _fonte_vocabulario
+    if caminho is None and _fonte_vocabulario is not None:
+        caminho = _fonte_vocabulario[0]
+    caminho = vocabulario.caminho_vocabulario(caminho)
+
+    with _trava_vocabulario:
+        mesma_fonte = _fonte_vocabulario is not None and _fonte_vocabulario[0] == caminho
+        estatistica = _estatistica_fonte(caminho)
+        try:
+            dados, hash_da_fonte = vocabulario.ler_fonte(caminho)
+        except (OSError, ValueError) as erro:
+            if mesma_fonte:
+                # Não tenta de novo o mesmo arquivo inválido a cada verificação.
+                _fonte_vocabulario = (caminho, estatistica, _fonte_vocabulario[2])
+            raise ValueError(str(erro)) from erro
+        if mesma_fonte and _fonte_vocabulario[2] == hash_da_fonte:
+            _fonte_vocabulario = (caminho, estatistica, hash_da_fonte)
+            return None
+
+        resumo = {"completa": False, "alteracoes": {}, "grupos_afetados": set(), "pesos": False, "cores": False}
+        if (
+            not mesma_fonte
+            or list(dados["grupos"]) != list(GRUPOS)
+            or list(dados["contexto_grupos"]) != list(CONTEXTO_GRUPOS)
+            or list(dados["palavras_inferencia"]) != list(PALAVRAS_INFERENCIA)
+        ):
+            _carregar_fonte(caminho, hash_da_fonte, dados)
+            _historico_alteracoes.clear()
+            _fonte_vocabulario = (caminho, estatistica, hash_da_fonte)
+            resumo.update(completa=True, grupos_afetados=set(GRUPOS), pesos=True, cores=True)
+            return resumo
+        _validar_grupos_comuns(dados["common_word_groups"])
+
+        indice = obter_indice_vocabulario()
+        fontes = {"principal": GRUPOS, "contexto": CONTEXTO_GRUPOS, "inferencia": PALAVRAS_INFERENCIA}
+        anteriores = {papel: dict(fonte) for papel, fonte in fontes.items()}
+        palavra_comum_anterior = (COMMON_WORD, list(COMMON_WORD_GROUPS))
+
+        GRUPOS.update(dados["grupos"])
+        CONTEXTO_GRUPOS.update(dados["contexto_grupos"])
+        PALAVRAS_INFERENCIA.update(dados["palavras_inferencia"])
+        COMMON_WORD = dados["common_word"]
+        COMMON_WORD_GROUPS[:] = dados["common_word_groups"]
+        sincronizar_palavra_comum()
+
+        alteracoes = {}
+        for papel, fonte in fontes.items():
+            for nome, termos in fonte.items():
+                anterior = anteriores[papel][nome]
+                if termos == anterior:
+                    # Conjuntos iguais mantêm a identidade: a assinatura e os layouts continuam valendo.
+                    fonte[nome] = anterior
+                    continue
+                if papel == "inferencia":
+                    adicionados = list((Counter(termos) - Counter(anterior)).elements())
+                    removidos = list((Counter(anterior) - Counter(termos)).elements())
+                else:
+                    adicionados, removidos = sorted(termos - anterior), sorted(anterior - termos)
+                if adicionados or removidos:
+                    alteracoes.setdefault(papel, {})[nome] = (adicionados, removidos)
+
+        for destino, origem, chave in ((PESOS, dados["pesos"], "pesos"), (CORES_GRUPOS, dados["cores_grupos"], "cores")):
+            if destino != origem:
+                destino.clear()
+                destino.update(origem)
+                resumo[chave] = True
+
+        invalidar_indice_vocabulario()
+        novo, grupos_afetados = indice.com_alteracoes(
+            alteracoes, GRUPOS, CONTEXTO_GRUPOS, PALAVRAS_INFERENCIA, PESOS
+        )
+        if palavra_comum_anterior != (COMMON_WORD, COMMON_WORD_GROUPS):
+            grupos_afetados = set(GRUPOS)
+        if novo.hash_conteudo != indice.hash_conteudo or grupos_afetados:
+            _historico_alteracoes.append((indice.hash_conteudo, novo.hash_conteudo, grupos_afetados))
+        _indice_vocabulario = novo
+        _fonte_vocabulario = (caminho, estatistica, hash_da_fonte)
+        resumo.update(alteracoes=alteracoes, grupos_afetados=grupos_afetados)
+        return resumo
+
+
+def verificar_vocabulario(intervalo=None):
+    """Recarrega o vocabulário se o arquivo mudou desde a última carga.
+
+    Feito para ser chamado a cada interação: consulta o sistema de arquivos no
+    máximo uma vez por ``intervalo`` segundos (``INTERVALO_VERIFICACAO``).
+    """
+    global _proxima_verificacao
+    agora = time.monotonic()
+    if _fonte_vocabulario is None or agora < _proxima_verificacao:
+        return None
+    _proxima_verificacao = agora + (INTERVALO_VERIFICACAO if intervalo is None else intervalo)
+    caminho, estatistica, _ = _fonte_vocabulario
+    if _estatistica_fonte(caminho) == estatistica:
+        return None
+    return recarregar_vocabulario(caminho)
+
+
+def grupos_alterados_desde(hash_conteudo):
+    """Grupos cujas palavras ou pertinências mudaram desde a versão ``hash_conteudo``.
+
+    Segue o histórico de recargas incrementais; ``None`` se ele não cobre essa versão.
+    """
+    with _trava_vocabulario:
+        atual = obter_indice_vocabulario().hash_conteudo
+        alterados = set()
+        for antes, depois, grupos in reversed(_historico_alteracoes):
+            if atual == hash_conteudo or depois != atual:
+                break
+            alterados |= grupos
+            atual = antes
+    return alterados if atual == hash_conteudo else None
+
+
+CAMINHO_VOCABULARIO = carregar_vocabulario()
+
+CACHE_ANALISES = CacheLRU(capacidade=4096, ttl=3600)
+CACHE_SIMILARIDADES = CacheLRU(capacidade=512, ttl=3600)
+CACHE_TEXTOS = CacheLRU(capacidade=1024, ttl=3600)
+
+
+def chave_vocabulario():
+    """Identifica o conteúdo atual de GRUPOS, CONTEXTO_GRUPOS, PALAVRAS_INFERENCIA e PESOS."""
+    return obter_indice_vocabulario().hash_conteudo, tuple(sorted(PESOS.items()))
+
+
+def estatisticas_cache():
+    return {
+        "analises": CACHE_ANALISES.estatisticas(),
+        "similaridades": CACHE_SIMILARIDADES.estatisticas(),
+        "textos": CACHE_TEXTOS.estatisticas(),
+    }
+
+def obter_palavras_compartilhadas(grupos: Dict[str, Set[str]]) -> List[Tuple[str, List[str]]]:
+    if grupos is GRUPOS:
+        return obter_indice_vocabulario().pertinencia.compartilhadas()
+    return MapaPertinencia(grupos, normalizar_texto).compartilhadas()
+
+def calcular_similaridade_levenshtein(palavra1, palavra2, similaridade_minima=None):
+    if palavra1 == palavra2:
+        return 1.0
+    len1, len2 = len(palavra1), len(palavra2)
+    if len1 == 0 or len2 == 0:
+        return 0.0
+
+    maior = max(len1, len2)
+    distancia_maxima = None
+    if similaridade_minima is not None:
+        distancia_maxima = int((1 - similaridade_minima) * maior + 1e-9)
+        if distancia_maxima < 0:
+            return 0.0
+
+    distancia = distancia_levenshtein(palavra1, palavra2, distancia_maxima)
+    if distancia_maxima is not None and distancia > distancia_maxima:
+        return 0.0
+    similaridade = 1 - (distancia / maior)
+    return max(0.0, similaridade)
+
+def calcular_similaridade_caracteres(palavra1, palavra2):
+    if palavra1 == palavra2:
+        return 1.0
+    set1, set2 = set(palavra1.lower()), set(palavra2.lower())
+    if not set1 or not set2:
+        return 0.0
+    intersecao = len(set1.intersection(set2))
+    uniao = len(set1.union(set2))
+    return intersecao / uniao if uniao > 0 else 0.0
+
+def calcular_similaridade_composta(palavra_busca, palavra_comparacao, similaridade_minima=None):
+    palavra_busca = normalizar_texto(palavra_busca)
+    palavra_comparacao = normalizar_texto(palavra_comparacao)
+
+    if palavra_busca == palavra_comparacao:
+        return 100.0
+
+    sim_caracteres = calcular_similaridade_caracteres(palavra_busca, palavra_comparacao)
+    bonus_substring = 0.2 if palavra_busca in palavra_comparacao or palavra_comparacao in palavra_busca else 0.0
+    levenshtein_minima = None
+    if similaridade_minima is not None:
+        # Abaixo do limite o valor exato não interessa ao chamador.
+        levenshtein_minima = (similaridade_minima / 100 - sim_caracteres * 0.4 - bonus_substring) / 0.6
+        if levenshtein_minima > 1.0 + 1e-9:
+            return 0.0
+        levenshtein_minima = max(0.0, levenshtein_minima - 1e-9)
+    sim_levenshtein = calcular_similaridade_levenshtein(
+        palavra_busca, palavra_comparacao, levenshtein_minima
+    )
+
+    similaridade_final = (sim_levenshtein * 0.6 + sim_caracteres * 0.4 + bonus_substring) * 100
+    return min(100.0, similaridade_final)
+
+class MotorSimilaridade:
+    """Similaridade composta de uma palavra contra todo o vocabulário em passadas NumPy."""
+
+    _LIMITE_BITS = 64
+
+    def __init__(self, palavras_ordenadas: Dict[str, List[Tuple[str, str]]]):
+        self.nomes_grupos = list(palavras_ordenadas.keys())
+        self.palavras: List[str] = []
+        self.normalizadas: List[str] = []
+        self.fatias: Dict[str, slice] = {}
+        for nome_grupo, itens in palavras_ordenadas.items():
+            inicio = len(self.palavras)
+            for palavra, palavra_norm in itens:
+                self.palavras.append(palavra)
+                self.normalizadas.append(palavra_norm)
+            self.fatias[nome_grupo] = slice(inicio, len(self.palavras))
+        self.linhas = {
+            (nome_grupo, palavra): linha
+            for nome_grupo, fatia in self.fatias.items()
+            for linha, palavra in enumerate(self.palavras[fatia], fatia.start)
+        }
+        self._inicios_grupos = np.array([fatia.start for fatia in self.fatias.values()], dtype=np.intp)
+
+        total = len(self.normalizadas)
+        largura = max((len(p) for p in self.normalizadas), default=0)
+        self.comprimentos = np.array([len(p) for p in self.normalizadas], dtype=np.int64)
+        self.array_normalizadas = np.array(self.normalizadas, dtype=f"<U{max(largura, 1)}")
+        self.codigos = self.array_normalizadas.view(np.uint32).reshape(total, max(largura, 1))
+
+        self.alfabeto = {c: i for i, c in enumerate(sorted({c for p in self.normalizadas for c in p}))}
+        self.presenca = np.zeros((total, len(self.alfabeto)), dtype=np.float64)
+        for linha, palavra_norm in enumerate(self.normalizadas):
+            for caractere in set(palavra_norm):
+                self.presenca[linha, self.alfabeto[caractere]] = 1.0
+        self.tamanhos_conjunto = self.presenca.sum(axis=1)
+
+        # Cada palavra vira o padrão do Myers/Hyyrö num uint64; as mais longas ficam no caminho escalar.
+        self.cabe_em_bits = (self.comprimentos > 0) & (self.comprimentos <= self._LIMITE_BITS)
+        largura_bits = min(self.codigos.shape[1], self._LIMITE_BITS)
+        self._pesos_bits = np.left_shift(np.uint64(1), np.arange(largura_bits, dtype=np.uint64))
+        comprimentos_bits = np.where(self.cabe_em_bits, self.comprimentos, 1).astype(np.uint64)
+        self._ultimo_bit = np.where(
+            self.cabe_em_bits, np.left_shift(np.uint64(1), comprimentos_bits - np.uint64(1)), np.uint64(0)
+        ).astype(np.uint64)
+        self._completo = np.where(
+            self.cabe_em_bits, (self._ultimo_bit - np.uint64(1)) | self._ultimo_bit, np.uint64(0)
+        ).astype(np.uint64)
+
+    def grupos_das_linhas(self, linhas):
+        """Posição em ``nomes_grupos`` do grupo de cada linha."""
+        return np.searchsorted(self._inicios_grupos, linhas, side="right") - 1
+
+    def _distancias(self, palavra_busca_norm, linhas=None):
+        selecao = slice(None) if linhas is None else linhas
+        completo = self._completo[selecao]
+        ultimo_bit = self._ultimo_bit[selecao]
+        um = np.uint64(1)
+        positivos_v = completo.copy()
+        negativos_v = np.zeros(len(completo), dtype=np.uint64)
+        distancias = self.comprimentos[selecao].copy()
+        codigos_bits = self.codigos[selecao, :self._pesos_bits.shape[0]]
+        mascaras: Dict[str, np.ndarray] = {}
+
+        for caractere in palavra_busca_norm:
+            eq = mascaras.get(caractere)
+            if eq is None:
+                iguais = codigos_bits == ord(caractere)
+                eq = np.bitwise_or.reduce(np.where(iguais, self._pesos_bits, np.uint64(0)), axis=1)
+                eq = eq & completo
+                mascaras[caractere] = eq
+            xv = eq | negativos_v
+            xh = (((eq & positivos_v) + positivos_v) ^ positivos_v) | eq
+            positivos_h = negativos_v | (~(xh | positivos_v) & completo)
+            negativos_h = positivos_v & xh
+            distancias += (positivos_h & ultimo_bit) != 0
+            distancias -= (negativos_h & ultimo_bit) != 0
+            positivos_h = ((positivos_h << um) | um) & completo
+            negativos_h = (negativos_h << um) & completo
+            positivos_v = negativos_h | (~(xv | positivos_h) & completo)
+            negativos_v = positivos_h & xv
+
+        longas = ~self.cabe_em_bits[selecao] & (self.comprimentos[selecao] > 0)
+        originais = np.arange(len(self.normalizadas)) if linhas is None else linhas
+        for posicao in np.flatnonzero(longas):
+            distancias[posicao] = distancia_levenshtein(palavra_busca_norm, self.normalizadas[originais[posicao]])
+        return distancias
+
+    def similaridades_base(self, palavra_busca_norm, linhas=None):
+        """Equivale a ``calcular_similaridade_composta`` para cada palavra do vocabulário.
+
+        Com ``linhas`` (array de posições) pontua só essas palavras, na mesma ordem.
+        """
+        selecao = slice(None) if linhas is None else linhas
+        normalizadas = self.array_normalizadas[selecao]
+        if not palavra_busca_norm:
+            return np.array([
+                calcular_similaridade_composta(palavra_busca_norm, p) for p in normalizadas.tolist()
+            ], dtype=np.float64)
+
+        tamanho_busca = len(palavra_busca_norm)
+        comprimentos = self.comprimentos[selecao]
+        vazias = comprimentos == 0
+
+        maiores = np.maximum(comprimentos, tamanho_busca)
+        sim_levenshtein = 1 - (self._distancias(palavra_busca_norm, linhas) / maiores)
+        sim_levenshtein = np.where(vazias, 0.0, np.maximum(0.0, sim_levenshtein))
+
+        conjunto_busca = set(palavra_busca_norm)
+        vetor_busca = np.zeros(len(self.alfabeto), dtype=np.float64)
+        for caractere in conjunto_busca:
+            coluna = self.alfabeto.get(caractere)
+            if coluna is not None:
+                vetor_busca[coluna] = 1.0
+        intersecao = self.presenca[selecao] @ vetor_busca
+        uniao = self.tamanhos_conjunto[selecao] + len(conjunto_busca) - intersecao
+        sim_caracteres = np.where(vazias, 0.0, intersecao / np.where(uniao > 0, uniao, 1.0))
+
+        contem = np.char.find(normalizadas, palavra_busca_norm) >= 0
+        contida = np.char.find(palavra_busca_norm, normalizadas) >= 0
+        bonus_substring = np.where(contem | contida, 0.2, 0.0)
+
+        similaridade = np.minimum(100.0, (sim_levenshtein * 0.6 + sim_caracteres * 0.4 + bonus_substring) * 100)
+        iguais = normalizadas == palavra_busca_norm
+        return np.where(iguais, 100.0, similaridade)
+
+
+def _buscar_grupos_por_palavra(palavra):
+    palavra_normalizada = normalizar_texto(palavra)
+    if not palavra_normalizada:
+        return set()
+
+    return set(obter_indice_vocabulario().grupos_do_termo(palavra_normalizada))
+
+CANDIDATOS_MINIMOS_POR_GRUPO = 30
+
+def _bonus_similaridade(nome_grupo, grupos_palavra, grupo_contexto):
+    bonus = 0.0
+
+    if grupos_palavra:
+        if nome_grupo in grupos_palavra:
+            bonus += 35.0
+        else:
+            bonus -= 5.0
+
+    if grupo_contexto:
+        if nome_grupo == grupo_contexto:
+            bonus += 15.0
+        else:
+            bonus -= 5.0
+
+    return bonus
+
+def calcular_similaridades_palavra(palavra_busca, grupo_contexto=None):
+    if not palavra_busca or len(palavra_busca.strip()) < 2:
+        return {}
+
+    palavra_busca_norm = normalizar_texto(palavra_busca.strip())
+    chave = ("similaridades", chave_vocabulario(), palavra_busca_norm, grupo_contexto)
+    similaridades = CACHE_SIMILARIDADES.obter_ou_calcular(
+        chave, lambda: _calcular_similaridades_palavra(palavra_busca_norm, grupo_contexto)
+    )
+    return {nome: [dict(item) for item in itens] for nome, itens in similaridades.items()}
+
+def _calcular_similaridades_palavra(palavra_busca_norm, grupo_contexto):
+    grupos_palavra = _buscar_grupos_por_palavra(palavra_busca_norm)
+    motor = obter_indice_vocabulario().motor_similaridade()
+    similaridades_base = motor.similaridades_base(palavra_busca_norm)
+    similaridades = {}
+
+    for nome_grupo in GRUPOS.keys():
+        bonus = _bonus_similaridade(nome_grupo, grupos_palavra, grupo_contexto)
+        fatia = motor.fatias[nome_grupo]
+        valores = np.maximum(0.0, np.minimum(100.0, similaridades_base[fatia] + bonus))
+        valores = np.where(motor.array_normalizadas[fatia] == palavra_busca_norm, 100.0, valores)
+        ordem = np.argsort(-valores, kind="stable")
+        palavras = motor.palavras[fatia]
+        similaridades[nome_grupo] = [
+            {'palavra': palavras[i], 'similaridade': float(valores[i])}
+            for i in ordem
+        ]
+
+    return similaridades
+
+def buscar_similares(palavra_busca, k=20, grupo=None, grupo_contexto=None):
+    """Top-``k`` por similaridade composta, pontuando só os candidatos do índice de trigramas.
+
+    Grupos pequenos são pontuados por inteiro; nos demais, apenas os termos que
+    mais compartilham trigramas com a busca entram no ranking.
+    """
+    if not palavra_busca or len(palavra_busca.strip()) < 2:
+        return []
+
+    palavra_busca_norm = normalizar_texto(palavra_busca.strip())
+    chave = ("similares", chave_vocabulario(), palavra_busca_norm, k, grupo, grupo_contexto)
+    resultados = CACHE_SIMILARIDADES.obter_ou_calcular(
+        chave, lambda: _buscar_similares(palavra_busca_norm, k, grupo, grupo_contexto)
+    )
+    return [dict(item) for item in resultados]
+
+def _buscar_similares(palavra_busca_norm, k, grupo, grupo_contexto):
+    grupos_palavra = _buscar_grupos_por_palavra(palavra_busca_norm)
+    indice = obter_indice_vocabulario()
+    motor = indice.motor_similaridade()
+    n_candidatos = max(3 * k, CANDIDATOS_MINIMOS_POR_GRUPO)
+    linhas = []
+    for nome_grupo in ([grupo] if grupo else GRUPOS.keys()):
+        fatia = motor.fatias.get(nome_grupo)
+        if fatia is None:
+            continue
+        if fatia.stop - fatia.start <= n_candidatos:
+            linhas.extend(range(fatia.start, fatia.stop))
+        else:
+            proximas = indice.indice_fuzzy().mais_proximas(palavra_busca_norm, k=n_candidatos, grupo=nome_grupo)
+            linhas.extend(motor.linhas[(nome_grupo, palavra)] for _, palavra, _ in proximas)
+    if not linhas:
+        return []
+
+    # Os candidatos passam pelas mesmas passadas NumPy da varredura completa; no
+    # vocabulário padrão todos os grupos cabem em n_candidatos e nada é filtrado.
+    linhas = np.array(linhas, dtype=np.intp)
+    selecao = None if len(linhas) == len(motor.palavras) else linhas
+    similaridades_base = motor.similaridades_base(palavra_busca_norm, selecao)
+    bonus_grupos = np.array([
+        _bonus_similaridade(nome_grupo, grupos_palavra, grupo_contexto) for nome_grupo in motor.nomes_grupos
+    ])
+    posicoes_grupos = motor.grupos_das_linhas(linhas)
+    valores = np.maximum(0.0, np.minimum(100.0, similaridades_base + bonus_grupos[posicoes_grupos]))
+    valores = np.where(motor.array_normalizadas[linhas] == palavra_busca_norm, 100.0, valores)
+
+    ordem = np.argsort(-valores, kind="stable")[:k]
+    return [
+        {
+            'grupo': motor.nomes_grupos[posicoes_grupos[i]],
+            'palavra': motor.palavras[linhas[i]],
+            'similaridade': float(valores[i]),
+        }
+        for i in ordem
+    ]
+
+def preparar_texto(texto):
+    """``TextoAnalisado`` de ``texto`` no vocabulário atual, reaproveitado por todos os detectores.
+
+    A chave do cache é o texto normalizado: "Banco" e "banco " dão o mesmo resultado.
+    """
+    texto_normalizado = normalizar_texto(texto)
+    indice = obter_indice_vocabulario()
+    return CACHE_TEXTOS.obter_ou_calcular(
+        (indice.hash_conteudo, texto_normalizado), lambda: TextoAnalisado(texto_normalizado, indice)
+    )
+
+def detectar_palavras_ambiguas(texto):
+    return preparar_texto(texto).ambiguas(obter_indice_vocabulario())
+
+def analisar_contexto(texto_completo, pesos=None):
+    if not isinstance(texto_completo, str) or not texto_completo.strip():
+        return {nome: 0.0 for nome in GRUPOS.keys()}
+
+    if pesos is None:
+        pesos = PESOS
+
+    analisado = preparar_texto(texto_completo)
+    chave = ("contexto", chave_vocabulario(), tuple(sorted(pesos.items())), analisado.normalizado)
+    scores_contexto = CACHE_ANALISES.obter_ou_calcular(
+        chave, lambda: _pontuar_ocorrencias(analisado.ocorrencias, pesos)
+    )
+    return dict(scores_contexto)
+
+def _pontuar_ocorrencias(ocorrencias, pesos):
+    scores_contexto, _ = obter_indice_vocabulario().pontuar_ocorrencias(ocorrencias, pesos)
+
+    total = sum(scores_contexto.values())
+    if total > 0:
+        scores_contexto = {k: v/total for k, v in scores_contexto.items()}
+
+    return scores_contexto
+
+LIMIAR_EMPATE = 1e-6
+LIMIAR_GRUPO = 0.1
+
+def identificar_grupo(texto):
+    scores = analisar_contexto(texto)
+    if not scores or all(v == 0 for v in scores.values()):
+        return None, scores
+    grupo_principal = max(scores.items(), key=lambda x: x[1])
+    max_score = grupo_principal[1]
+    grupos_top = []
+    for nome, valor in scores.items():
+        if valor > 0 and abs(valor - max_score) < LIMIAR_EMPATE:
+            grupos_top.append(nome)
+    if len(grupos_top) == 1 and max_score > LIMIAR_GRUPO:
+        return grupo_principal[0], scores
+    return None, scores
+
+def detectar_palavras_desconhecidas(texto):
+    return preparar_texto(texto).desconhecidas(obter_indice_vocabulario())
+
+def identificar_grupos_em_lote(textos, pesos=None, tamanho_lote=4096):
+    """Classifica vários textos de uma vez, com a mesma semântica das funções unitárias.
+
+    Para cada texto retorna um dicionário com ``grupo`` (como ``identificar_grupo``),
+    ``scores``, ``ambiguas`` e ``desconhecidas``. Textos repetidos são normalizados
+    e varridos uma única vez; a pontuação de cada bloco é o produto de uma matriz
+    esparsa texto x termo pela matriz termo x grupo de pesos.
+    """
+    if pesos is None:
+        pesos = PESOS
+
+    resultados = []
+    bloco = []
+    for texto in textos:
+        bloco.append(texto)
+        if len(bloco) >= tamanho_lote:
+            resultados.extend(_identificar_bloco(bloco, pesos))
+            bloco = []
+    if bloco:
+        resultados.extend(_identificar_bloco(bloco, pesos))
+    return resultados
+
+def _identificar_bloco(textos, pesos):
+    indice = obter_indice_vocabulario()
+    nomes_grupos = indice.nomes_grupos
+    matriz_pesos = indice.matriz_pesos(pesos)
+
+    linhas_por_texto: Dict[str, int] = {}
+    analisados: List[TextoAnalisado] = []
+    linhas_texto: List[int] = []
+    for texto in textos:
+        texto_normalizado = normalizar_texto(texto)
+        linha = linhas_por_texto.get(texto_normalizado)
+        if linha is None:
+            linha = linhas_por_texto[texto_normalizado] = len(analisados)
+            analisados.append(TextoAnalisado(texto_normalizado, indice))
+        linhas_texto.append(linha)
+
+    linhas: List[int] = []
+    colunas: List[int] = []
+    for linha, analisado in enumerate(analisados):
+        termos = {termo for _, _, termo in analisado.ocorrencias}
+        linhas.extend([linha] * len(termos))
+        colunas.extend(indice.ids_termos[termo] for termo in termos)
+
+    brutos = np.zeros((len(analisados), len(nomes_grupos)), dtype=np.float64)
+    if colunas:
+        np.add.at(brutos, np.array(linhas), matriz_pesos[np.array(colunas)])
+    totais = brutos.sum(axis=1, keepdims=True)
+    scores = np.divide(brutos, totais, out=np.zeros_like(brutos), where=totais > 0)
+
+    maximos = scores.max(axis=1) if len(nomes_grupos) else np.zeros(len(analisados))
+    empatados = ((scores > 0) & (np.abs(scores - maximos[:, None]) < LIMIAR_EMPATE)).sum(axis=1)
+    vencedores = scores.argmax(axis=1) if len(nomes_grupos) else np.zeros(len(analisados), dtype=int)
+    definidos = (empatados == 1) & (maximos > LIMIAR_GRUPO)
+
+    por_linha = []
+    for linha, analisado in enumerate(analisados):
+        por_linha.append({
+            "grupo": nomes_grupos[vencedores[linha]] if definidos[linha] else None,
+            "scores": dict(zip(nomes_grupos, scores[linha].tolist())),
+            "ambiguas": analisado.ambiguas(indice),
+            "desconhecidas": analisado.desconhecidas(indice),
+        })
+
+    resultados = []
+    for texto, linha in zip(textos, linhas_texto):
+        resultado = por_linha[linha]
+        resultados.append({
+            "texto": texto,
+            "grupo": resultado["grupo"],
+            "scores": dict(resultado["scores"]),
+            "ambiguas": [(palavra, list(grupos)) for palavra, grupos in resultado["ambiguas"]],
+            "desconhecidas": list(resultado["desconhecidas"]),
+        })
+    return resultados
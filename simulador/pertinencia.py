@@ -0,0 +1,132 @@
+"""
+Mapa palavra -> grupos como máscara de bits, para detectar palavras compartilhadas em O(1).
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+"""
+
+import copy
+import threading
+from typing import Callable, Dict, Iterable, List, Mapping, Tuple
+
+
+class MapaPertinencia:
+    """Guarda, para cada palavra, a máscara dos grupos em que ela aparece.
+
+    O bit ``i`` corresponde a ``nomes_grupos[i]``. Palavras são comparadas já
+    normalizadas, então "Banco" e "banco" contam como a mesma palavra.
+    """
+
+    def __init__(self, grupos: Mapping[str, Iterable[str]], normalizar: Callable[[str], str]):
+        self.nomes_grupos: List[str] = list(grupos.keys())
+        self.normalizar = normalizar
+        self.mascaras: Dict[str, int] = {}
+        self.representantes: Dict[str, str] = {}
+        normalizadas: Dict[str, str] = {}
+        for bit, palavras in enumerate(grupos.values()):
+            for palavra in palavras:
+                chave = normalizadas.get(palavra)
+                if chave is None:
+                    chave = normalizadas[palavra] = normalizar(palavra)
+                if not chave:
+                    continue
+                self.mascaras[chave] = self.mascaras.get(chave, 0) | (1 << bit)
+                self.representantes.setdefault(chave, palavra)
+        # Atalho para as palavras originais, sem normalizar de novo nos renderizadores.
+        self._chaves_originais = normalizadas
+
+    def estado(self) -> dict:
+        return {
+            "nomes_grupos": self.nomes_grupos,
+            "mascaras": self.mascaras,
+            "representantes": self.representantes,
+            "chaves_originais": self._chaves_originais,
+        }
+
+    @classmethod
+    def de_estado(cls, estado: dict, normalizar: Callable[[str], str]) -> "MapaPertinencia":
+        mapa = cls.__new__(cls)
+        mapa.nomes_grupos = estado["nomes_grupos"]
+        mapa.normalizar = normalizar
+        mapa.mascaras = estado["mascaras"]
+        mapa.representantes = estado["representantes"]
+        mapa._chaves_originais = estado["chaves_originais"]
+        return mapa
+
+    def com_alteracoes(
+        self,
+        grupos: Mapping[str, Iterable[str]],
+        chaves: Mapping[str, Iterable[str]],
+        palavras: Iterable[str] = (),
+    ) -> "MapaPertinencia":
+        """Cópia com as máscaras de ``chaves`` (termo normalizado -> grupos atuais) refeitas.
+
+        ``palavras`` são as palavras originais novas; ``grupos`` só é consultado
+        quando o representante de um termo deixou o vocabulário.
+        """
+        bits = {nome: 1 << bit for bit, nome in enumerate(self.nomes_grupos)}
+        mapa = copy.copy(self)
+        mapa.mascaras = dict(self.mascaras)
+        mapa.representantes = dict(self.representantes)
+        mapa._chaves_originais = dict(self._chaves_originais)
+        for palavra in palavras:
+            if palavra not in mapa._chaves_originais:
+                mapa._chaves_originais[palavra] = self.normalizar(palavra)
+
+        for chave, nomes in chaves.items():
+            if not chave:
+                continue
+            nomes = list(nomes)
+            mascara = 0
+            for nome in nomes:
+                mascara |= bits[nome]
+            if not mascara:
+                mapa.mascaras.pop(chave, None)
+                mapa.representantes.pop(chave, None)
+                continue
+            mapa.mascaras[chave] = mascara
+            representante = mapa.representantes.get(chave)
+            if representante is None or not any(representante in grupos[nome] for nome in nomes):
+                mapa.representantes[chave] = next(
+                    p for nome in nomes for p in grupos[nome] if mapa._chave(p) == chave
+                )
+        return mapa
+
+    def _chave(self, palavra: str) -> str:
+        chave = self._chaves_originais.get(palavra)
+        if chave is None:
+            chave = self.normalizar(palavra)
+        return chave
+
+    def mascara(self, palavra: str) -> int:
+        return self.mascaras.get(self._chave(palavra), 0)
+
+    def grupos(self, palavra: str) -> List[str]:
+        mascara = self.mascara(palavra)
+        return [nome for bit, nome in enumerate(self.nomes_grupos) if mascara >> bit & 1]
+
+    def compartilhada(self, palavra: str) -> bool:
+        mascara = self.mascara(palavra)
+        return mascara & (mascara - 1) != 0
+
+    def compartilhadas(self) -> List[Tuple[str, List[str]]]:
+        """Mesmo formato de ``obter_palavras_compartilhadas``: ``(palavra, grupos ordenados)``."""
+        resultado = []
+        for chave, mascara in self.mascaras.items():
+            if mascara & (mascara - 1):
+                nomes = [nome for bit, nome in enumerate(self.nomes_grupos) if mascara >> bit & 1]
+                resultado.append((self.representantes[chave], sorted(nomes)))
+        resultado.sort(key=lambda item: (item[0].lower(), item[1]))
+        return resultado
+
+
+_mapas: Dict[int, Tuple[tuple, MapaPertinencia]] = {}
+_trava_mapas = threading.Lock()
+
+
+def obter_mapa_pertinencia(grupos: Mapping[str, Iterable[str]], normalizar: Callable[[str], str]) -> MapaPertinencia:
+    """Mapa de ``grupos`` reconstruído só quando nomes, conjuntos ou tamanhos mudam."""
+    assinatura = tuple((nome, id(palavras), len(palavras)) for nome, palavras in grupos.items())
+    with _trava_mapas:
+        atual = _mapas.get(id(grupos))
+        if atual is None or atual[0] != assinatura:
+            atual = _mapas[id(grupos)] = (assinatura, MapaPertinencia(grupos, normalizar))
+        return atual[1]
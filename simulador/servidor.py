@@ -0,0 +1,291 @@
+"""
+Serviço HTTP assíncrono de classificação, só com a biblioteca padrão.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+
+Rotas:
+- ``POST /classify``: ``{"texto": "..."}`` ou ``{"textos": ["...", ...]}``
+- ``POST /similar``: ``{"palavra": "...", "grupo_contexto": "...", "k": 10}``
+- ``GET /health``: estado do serviço e latências p50/p99 por rota
+
+O cálculo roda num pool de processos; o laço de eventos só faz E/S.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Deque, Dict, List, Optional, Tuple
+
+TAMANHO_MAXIMO_CORPO = 10 * 1024 * 1024
+TAMANHO_MAXIMO_CABECALHO = 64 * 1024
+TEMPO_OCIOSO = 30.0
+AMOSTRAS_LATENCIA = 4096
+ROTAS = ("/classify", "/similar", "/health")
+
+
+class ErroHTTP(Exception):
+    def __init__(self, status: HTTPStatus, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+# ==================== TAREFAS DO POOL ====================
+
+def _classificar(textos: List[str]) -> List[dict]:
+    from simulador.nucleo import identificar_grupos_em_lote
+
+    return identificar_grupos_em_lote(textos)
+
+
+def _similares(palavra: str, grupo_contexto: Optional[str], k: Optional[int]) -> Dict[str, list]:
+    from simulador.nucleo import calcular_similaridades_palavra
+
+    similaridades = calcular_similaridades_palavra(palavra, grupo_contexto=grupo_contexto)
+    if k is not None:
+        similaridades = {nome: itens[:k] for nome, itens in similaridades.items()}
+    return similaridades
+
+
+def _estado_vocabulario() -> dict:
+    from simulador.nucleo import GRUPOS, chave_vocabulario, estatisticas_cache
+
+    return {
+        "versao_vocabulario": chave_vocabulario()[0],
+        "grupos": list(GRUPOS.keys()),
+        "cache": estatisticas_cache(),
+    }
+
+
+# ==================== MÉTRICAS ====================
+
+class MetricasLatencia:
+    """Janela das últimas latências de cada rota, para p50/p99 sob demanda."""
+
+    def __init__(self, amostras: int = AMOSTRAS_LATENCIA):
+        self.amostras = amostras
+        self._latencias: Dict[str, Deque[float]] = {}
+        self.requisicoes: Dict[str, int] = {}
+
+    def registrar(self, rota: str, segundos: float) -> None:
+        self._latencias.setdefault(rota, deque(maxlen=self.amostras)).append(segundos)
+        self.requisicoes[rota] = self.requisicoes.get(rota, 0) + 1
+
+    @staticmethod
+    def _percentil(ordenadas: List[float], fracao: float) -> float:
+        posicao = min(len(ordenadas) - 1, max(0, int(round(fracao * (len(ordenadas) - 1)))))
+        return ordenadas[posicao]
+
+    def resumo(self) -> Dict[str, dict]:
+        resumo = {}
+        for rota, latencias in self._latencias.items():
+            ordenadas = sorted(latencias)
+            resumo[rota] = {
+                "requisicoes": self.requisicoes[rota],
+                "p50_ms": round(self._percentil(ordenadas, 0.50) * 1000, 3),
+                "p99_ms": round(self._percentil(ordenadas, 0.99) * 1000, 3),
+            }
+        return resumo
+
+
+# ==================== SERVIDOR ====================
+
+class ServidorClassificacao:
+    def __init__(self, executor: Executor, trabalhadores: int):
+        self.executor = executor
+        self.trabalhadores = trabalhadores
+        self.metricas = MetricasLatencia()
+        self.inicio = time.time()
+        self.conexoes_abertas = 0
+
+    async def _no_pool(self, funcao, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, funcao, *args)
+
+    # ---------- rotas ----------
+
+    async def rota_classify(self, corpo: dict) -> dict:
+        if "textos" in corpo:
+            textos = corpo["textos"]
+            if not isinstance(textos, list) or not all(isinstance(t, str) for t in textos):
+                raise ErroHTTP(HTTPStatus.BAD_REQUEST, "'textos' deve ser uma lista de strings.")
+            return {"resultados": await self._no_pool(_classificar, textos)}
+        texto = corpo.get("texto")
+        if not isinstance(texto, str):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Envie 'texto' (string) ou 'textos' (lista de strings).")
+        return (await self._no_pool(_classificar, [texto]))[0]
+
+    async def rota_similar(self, corpo: dict) -> dict:
+        palavra = corpo.get("palavra")
+        grupo_contexto = corpo.get("grupo_contexto")
+        k = corpo.get("k")
+        if not isinstance(palavra, str):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "'palavra' deve ser uma string.")
+        if grupo_contexto is not None and not isinstance(grupo_contexto, str):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "'grupo_contexto' deve ser uma string.")
+        if k is not None and (not isinstance(k, int) or isinstance(k, bool) or k < 0):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "'k' deve ser um inteiro não negativo.")
+        similaridades = await self._no_pool(_similares, palavra, grupo_contexto, k)
+        return {"palavra": palavra, "grupo_contexto": grupo_contexto, "similaridades": similaridades}
+
+    async def rota_health(self) -> dict:
+        return {
+            "status": "ok",
+            "uptime_s": round(time.time() - self.inicio, 1),
+            "trabalhadores": self.trabalhadores,
+            "conexoes_abertas": self.conexoes_abertas,
+            "latencias": self.metricas.resumo(),
+            **await self._no_pool(_estado_vocabulario),
+        }
+
+    async def despachar(self, metodo: str, caminho: str, corpo: bytes) -> Tuple[HTTPStatus, dict]:
+        rotas_post = {"/classify": self.rota_classify, "/similar": self.rota_similar}
+        if caminho == "/health":
+            if metodo != "GET":
+                raise ErroHTTP(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET em /health.")
+            return HTTPStatus.OK, await self.rota_health()
+        if caminho not in rotas_post:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, f"Rota desconhecida: {caminho}")
+        if metodo != "POST":
+            raise ErroHTTP(HTTPStatus.METHOD_NOT_ALLOWED, f"Use POST em {caminho}.")
+        try:
+            dados = json.loads(corpo.decode("utf-8") or "{}")
+        except (UnicodeDecodeError, json.JSONDecodeError) as erro:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"JSON inválido: {erro}")
+        if not isinstance(dados, dict):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "O corpo deve ser um objeto JSON.")
+        return HTTPStatus.OK, await rotas_post[caminho](dados)
+
+    # ---------- protocolo ----------
+
+    async def _ler_requisicao(self, reader: asyncio.StreamReader):
+        try:
+            bruto = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), TEMPO_OCIOSO)
+        except asyncio.LimitOverrunError:
+            raise ErroHTTP(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Cabeçalho grande demais.")
+        linhas = bruto.decode("latin-1").split("\r\n")
+        try:
+            metodo, alvo, versao = linhas[0].split(" ", 2)
+        except ValueError:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Linha de requisição inválida.")
+        cabecalhos = {}
+        for linha in linhas[1:]:
+            if ":" in linha:
+                nome, valor = linha.split(":", 1)
+                cabecalhos[nome.strip().lower()] = valor.strip()
+
+        if "chunked" in cabecalhos.get("transfer-encoding", "").lower():
+            raise ErroHTTP(HTTPStatus.LENGTH_REQUIRED, "Envie o corpo com Content-Length.")
+        try:
+            tamanho = int(cabecalhos.get("content-length", "0"))
+        except ValueError:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Content-Length inválido.")
+        if tamanho < 0:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Content-Length inválido.")
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroHTTP(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo grande demais.")
+        corpo = await asyncio.wait_for(reader.readexactly(tamanho), TEMPO_OCIOSO) if tamanho else b""
+
+        conexao = cabecalhos.get("connection", "").lower()
+        manter = conexao != "close" if versao == "HTTP/1.1" else conexao == "keep-alive"
+        return metodo.upper(), alvo.split("?", 1)[0], corpo, manter
+
+    @staticmethod
+    def _responder(writer: asyncio.StreamWriter, status: HTTPStatus, dados: dict, manter: bool) -> None:
+        corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        cabecalho = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n"
+        )
+        if manter:
+            cabecalho += f"Keep-Alive: timeout={int(TEMPO_OCIOSO)}\r\n"
+        writer.write(cabecalho.encode("latin-1") + b"\r\n" + corpo)
+
+    async def atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.conexoes_abertas += 1
+        try:
+            manter = True
+            while manter:
+                try:
+                    metodo, caminho, corpo, manter = await self._ler_requisicao(reader)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except ErroHTTP as erro:
+                    self._responder(writer, erro.status, {"erro": erro.mensagem}, False)
+                    await writer.drain()
+                    break
+
+                inicio = time.perf_counter()
+                try:
+                    status, resposta = await self.despachar(metodo, caminho, corpo)
+                except ErroHTTP as erro:
+                    status, resposta = erro.status, {"erro": erro.mensagem}
+                except Exception as erro:
+                    status, resposta = HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": f"Erro interno: {erro}"}
+                self._responder(writer, status, resposta, manter)
+                await writer.drain()
+                rota = f"{metodo} {caminho}" if caminho in ROTAS else "outras"
+                self.metricas.registrar(rota, time.perf_counter() - inicio)
+        except ConnectionError:
+            pass
+        finally:
+            self.conexoes_abertas -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def servir(host: str, porta: int, processos: Optional[int]) -> None:
+    if processos == 0:
+        executor: Executor = ThreadPoolExecutor(max_workers=1)
+        trabalhadores = 1
+    else:
+        trabalhadores = processos or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=trabalhadores)
+    servidor = ServidorClassificacao(executor, trabalhadores)
+    # Aquece os processos do pool para que a primeira requisição não pague a importação do núcleo.
+    await asyncio.gather(*(servidor._no_pool(_classificar, [""]) for _ in range(trabalhadores)))
+
+    servidor_tcp = await asyncio.start_server(
+        servidor.atender, host, porta, limit=TAMANHO_MAXIMO_CABECALHO
+    )
+    parar = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sinal, parar.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    enderecos = ", ".join(str(sock.getsockname()) for sock in servidor_tcp.sockets)
+    print(f"Servindo em {enderecos} com {trabalhadores} trabalhador(es).", file=sys.stderr, flush=True)
+    async with servidor_tcp:
+        await parar.wait()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def executar_servidor(args) -> int:
+    try:
+        asyncio.run(servir(args.host, args.porta, args.processos))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def configurar_parser(subparsers) -> None:
+    parser = subparsers.add_parser("serve", help="Sobe o serviço HTTP de classificação.")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: 127.0.0.1).")
+    parser.add_argument("--porta", type=int, default=8765, help="Porta de escuta (padrão: 8765).")
+    parser.add_argument(
+        "-p", "--processos", type=int, default=None,
+        help="Processos do pool de cálculo (padrão: número de CPUs; 0 usa uma thread).",
+    )
+    parser.set_defaults(funcao=executar_servidor)
@@ -0,0 +1,124 @@
+"""
+Execução de tarefas numa thread de fundo, com resultados entregues à thread da interface.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+
+Não depende de Tk: a interface chama ``processar_resultados()`` periodicamente
+(no Tk, via ``root.after``) e os callbacks rodam nessa chamada, na thread dela.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+
+class TarefaCancelada(Exception):
+    """Levantada por ``Tarefa.verificar()`` quando um pedido mais novo substituiu este."""
+
+
+class Tarefa:
+    """Pedido em andamento; a função de trabalho recebe a tarefa para checar cancelamento e relatar progresso."""
+
+    def __init__(self, executor: "ExecutorEmSegundoPlano", geracao: int, ao_progredir: Optional[Callable]):
+        self._executor = executor
+        self.geracao = geracao
+        self._ao_progredir = ao_progredir
+        self._cancelada = False
+
+    @property
+    def cancelada(self) -> bool:
+        return self._cancelada or self.geracao != self._executor.geracao
+
+    def cancelar(self) -> None:
+        self._cancelada = True
+
+    def verificar(self) -> None:
+        if self.cancelada:
+            raise TarefaCancelada()
+
+    def progresso(self, fracao: float, mensagem: str = "") -> None:
+        """Relata o andamento (0 a 1); ignorado se não houver callback ou se a tarefa foi cancelada."""
+        if self._ao_progredir is not None and not self.cancelada:
+            self._executor._entregar(self, self._ao_progredir, fracao, mensagem)
+
+
+class ExecutorEmSegundoPlano:
+    """Roda um pedido por vez numa thread daemon.
+
+    Com ``substituir=True`` (padrão), um pedido novo cancela o que está em
+    andamento e descarta os que ainda esperavam: só o resultado do último é
+    entregue. Com ``substituir=False`` os pedidos rodam todos, em ordem.
+    """
+
+    def __init__(self, nome: str = "tarefas", substituir: bool = True):
+        self.nome = nome
+        self.substituir = substituir
+        self.geracao = 0
+        self._pendentes: "queue.Queue" = queue.Queue()
+        self._resultados: "queue.Queue" = queue.Queue()
+        self._trava = threading.Lock()
+        self._em_andamento = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ocupado(self) -> bool:
+        """Há pedidos em andamento ou resultados ainda não processados pela interface."""
+        return self._em_andamento > 0 or not self._resultados.empty()
+
+    def enviar(
+        self,
+        funcao: Callable[[Tarefa], Any],
+        ao_concluir: Callable[[Any], None],
+        ao_falhar: Optional[Callable[[BaseException], None]] = None,
+        ao_progredir: Optional[Callable[[float, str], None]] = None,
+    ) -> Tarefa:
+        """Agenda ``funcao(tarefa)``; o retorno vai para ``ao_concluir`` e exceções para ``ao_falhar``."""
+        with self._trava:
+            if self.substituir:
+                self.geracao += 1
+            tarefa = Tarefa(self, self.geracao, ao_progredir)
+            self._em_andamento += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._executar, name=self.nome, daemon=True)
+                self._thread.start()
+        self._pendentes.put((tarefa, funcao, ao_concluir, ao_falhar))
+        return tarefa
+
+    def cancelar(self) -> None:
+        """Descarta o pedido em andamento e os que ainda esperavam."""
+        with self._trava:
+            self.geracao += 1
+
+    def processar_resultados(self, limite: int = 100) -> int:
+        """Chama os callbacks dos resultados prontos; deve rodar na thread da interface."""
+        processados = 0
+        while processados < limite:
+            try:
+                tarefa, callback, argumentos = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            processados += 1
+            if not tarefa.cancelada:
+                callback(*argumentos)
+        return processados
+
+    def _entregar(self, tarefa: Tarefa, callback: Callable, *argumentos) -> None:
+        self._resultados.put((tarefa, callback, argumentos))
+
+    def _executar(self) -> None:
+        while True:
+            tarefa, funcao, ao_concluir, ao_falhar = self._pendentes.get()
+            try:
+                if tarefa.cancelada:
+                    continue
+                try:
+                    resultado = funcao(tarefa)
+                except TarefaCancelada:
+                    continue
+                except Exception as erro:
+                    if ao_falhar is not None:
+                        self._entregar(tarefa, ao_falhar, erro)
+                    continue
+                self._entregar(tarefa, ao_concluir, resultado)
+            finally:
+                with self._trava:
+                    self._em_andamento -= 1
@@ -0,0 +1,47 @@
+"""
+Normalização e tokenização de texto, compartilhadas por todas as análises.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+
+Não depende do vocabulário, então pode ser usado também pelo aplicativo Tk.
+"""
+
+import re
+import unicodedata
+from typing import List, Tuple
+
+# Pontuação retirada das pontas de cada palavra.
+PONTUACAO = '.,!?;:'
+
+_PALAVRA = re.compile(r"\S+")
+
+
+def _sem_acento(texto):
+    texto_nfd = unicodedata.normalize('NFD', texto)
+    return ''.join(char for char in texto_nfd if unicodedata.category(char) != 'Mn')
+
+
+# ASCII e Latin-1 não têm marcas combinantes, então cada caractere pode ser
+# convertido isoladamente: a tabela guarda a forma sem acento e minúscula.
+_TABELA_LATIN1 = {codigo: _sem_acento(chr(codigo)).lower() for codigo in range(256)}
+
+
+def normalizar_texto(texto):
+    """Remove acentuação e converte texto para minúsculas."""
+    if not isinstance(texto, str):
+        return ""
+    if texto.isascii():
+        return texto.lower().strip()
+    if max(texto) <= "\xff":
+        return texto.translate(_TABELA_LATIN1).strip()
+    return _sem_acento(texto).lower().strip()
+
+
+def tokenizar(texto_normalizado) -> List[Tuple[int, int, str]]:
+    """Palavras separadas por espaço, sem a pontuação das pontas: ``(inicio, fim, palavra)``."""
+    tokens = []
+    for casamento in _PALAVRA.finditer(texto_normalizado):
+        bruto = casamento.group()
+        palavra = bruto.strip(PONTUACAO)
+        inicio = casamento.start() + len(bruto) - len(bruto.lstrip(PONTUACAO))
+        tokens.append((inicio, inicio + len(palavra), palavra))
+    return tokens
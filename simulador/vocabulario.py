@@ -0,0 +1,224 @@
+"""
+Vocabulários em arquivos JSON/TOML e snapshots binários compilados a partir deles.
+MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
+
+Formato da fonte (JSON ou TOML, com as mesmas chaves)::
+
+    {
+      "grupos": {"Animais": ["gato", ...], ...},
+      "palavra_comum": {"palavra": "banco", "grupos": ["Móveis", ...]},
+      "contexto_grupos": {"Animais": ["latir", ...], ...},
+      "palavras_inferencia": {"Animais": ["onça", ...], ...},
+      "cores_grupos": {"Animais": "#44FF44", ...},
+      "pesos": {"contexto": 3.0, "inferencia": 2.5, "principal": 0.2}
+    }
+
+O snapshot (``<fonte>.snap``) guarda o vocabulário já processado, os índices e
+os arrays de layout. É lido de uma vez e só vale enquanto o hash da fonte e a
+versão do formato baterem; caso contrário é recompilado.
+"""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import sys
+import tomllib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+FORMATO_SNAPSHOT = 2
+MAGIA_SNAPSHOT = b"MUIRAQUITA-SNAP\n"
+DIRETORIO_VOCABULARIOS = Path(__file__).resolve().parent / "vocabularios"
+CAMINHO_PADRAO = DIRETORIO_VOCABULARIOS / "padrao.json"
+CAMINHO_WINDOWS = DIRETORIO_VOCABULARIOS / "windows.json"
+VARIAVEL_AMBIENTE = "MUIRAQUITA_VOCABULARIO"
+PAPEIS_PESOS = ("contexto", "inferencia", "principal")
+
+Caminho = Union[str, os.PathLike]
+
+
+def caminho_vocabulario(caminho: Optional[Caminho] = None) -> Path:
+    """``caminho``, ou a variável MUIRAQUITA_VOCABULARIO, ou o vocabulário padrão."""
+    return Path(caminho or os.environ.get(VARIAVEL_AMBIENTE) or CAMINHO_PADRAO)
+
+
+def caminho_snapshot(caminho: Caminho) -> Path:
+    caminho = Path(caminho)
+    return caminho.with_name(caminho.name + ".snap")
+
+
+# ==================== FONTE ====================
+
+def _mapa_de_listas(dados: dict, chave: str, origem: str, obrigatorio: bool = False) -> Dict[str, list]:
+    valor = dados.get(chave)
+    if valor is None:
+        if obrigatorio:
+            raise ValueError(f"{origem}: falta a chave '{chave}'.")
+        return {}
+    if not isinstance(valor, dict):
+        raise ValueError(f"{origem}: '{chave}' deve mapear nomes de grupo para listas de termos.")
+    for nome, termos in valor.items():
+        if not isinstance(termos, list) or not all(isinstance(t, str) for t in termos):
+            raise ValueError(f"{origem}: '{chave}.{nome}' deve ser uma lista de strings.")
+    return valor
+
+
+def interpretar_fonte(dados: dict, origem: str = "vocabulário") -> Dict[str, Any]:
+    """Valida a fonte e converte para as estruturas usadas pelo núcleo (conjuntos e listas)."""
+    if not isinstance(dados, dict):
+        raise ValueError(f"{origem}: o conteúdo deve ser um objeto.")
+    grupos = _mapa_de_listas(dados, "grupos", origem, obrigatorio=True)
+    contexto = _mapa_de_listas(dados, "contexto_grupos", origem)
+    inferencia = _mapa_de_listas(dados, "palavras_inferencia", origem)
+    for chave, mapa in (("contexto_grupos", contexto), ("palavras_inferencia", inferencia)):
+        desconhecidos = sorted(set(mapa) - set(grupos))
+        if desconhecidos:
+            raise ValueError(f"{origem}: '{chave}' cita grupos inexistentes: {', '.join(desconhecidos)}.")
+
+    pesos = dados.get("pesos", {})
+    if not isinstance(pesos, dict) or set(pesos) != set(PAPEIS_PESOS):
+        raise ValueError(f"{origem}: 'pesos' deve ter exatamente as chaves {', '.join(PAPEIS_PESOS)}.")
+    try:
+        pesos = {papel: float(pesos[papel]) for papel in PAPEIS_PESOS}
+    except (TypeError, ValueError):
+        raise ValueError(f"{origem}: os valores de 'pesos' devem ser números.")
+
+    cores = dados.get("cores_grupos", {})
+    if not isinstance(cores, dict):
+        raise ValueError(f"{origem}: 'cores_grupos' deve mapear grupos para cores.")
+    faltantes = [nome for nome in grupos if nome not in cores]
+    if faltantes:
+        raise ValueError(f"{origem}: grupos sem cor em 'cores_grupos': {', '.join(faltantes)}.")
+
+    palavra_comum = dados.get("palavra_comum") or {}
+    common_word = palavra_comum.get("palavra", "")
+    common_word_groups = list(palavra_comum.get("grupos", []))
+
+    return {
+        "grupos": {nome: set(termos) for nome, termos in grupos.items()},
+        "contexto_grupos": {nome: set(termos) for nome, termos in contexto.items()},
+        "palavras_inferencia": {nome: list(termos) for nome, termos in inferencia.items()},
+        "cores_grupos": {nome: cores[nome] for nome in cores},
+        "pesos": pesos,
+        "common_word": common_word,
+        "common_word_groups": common_word_groups,
+    }
+
+
+def ler_fonte(caminho: Caminho) -> Tuple[Dict[str, Any], str]:
+    """Lê e valida um vocabulário JSON ou TOML; retorna os dados e o hash do arquivo."""
+    caminho = Path(caminho)
+    bruto = caminho.read_bytes()
+    hash_fonte = hashlib.blake2b(bruto, digest_size=16).hexdigest()
+    try:
+        if caminho.suffix.lower() == ".toml":
+            dados = tomllib.loads(bruto.decode("utf-8"))
+        else:
+            dados = json.loads(bruto.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError, tomllib.TOMLDecodeError) as erro:
+        raise ValueError(f"{caminho}: não foi possível ler o vocabulário ({erro}).")
+    return interpretar_fonte(dados, str(caminho)), hash_fonte
+
+
+def hash_fonte(caminho: Caminho) -> str:
+    return hashlib.blake2b(Path(caminho).read_bytes(), digest_size=16).hexdigest()
+
+
+# ==================== SNAPSHOT ====================
+
+class _LeitorRestrito(pickle.Unpickler):
+    """Só reconstrói tipos básicos e arrays NumPy: o snapshot nunca carrega código."""
+
+    _PERMITIDOS = {
+        ("builtins", "set"), ("builtins", "frozenset"),
+        ("numpy", "dtype"), ("numpy", "ndarray"),
+        ("numpy.core.multiarray", "_reconstruct"), ("numpy._core.multiarray", "_reconstruct"),
+        ("numpy.core.numeric", "_frombuffer"), ("numpy._core.numeric", "_frombuffer"),
+    }
+
+    def find_class(self, modulo, nome):
+        if (modulo, nome) not in self._PERMITIDOS:
+            raise pickle.UnpicklingError(f"Tipo não permitido no snapshot: {modulo}.{nome}")
+        return super().find_class(modulo, nome)
+
+
+def gravar_snapshot(caminho: Caminho, hash_da_fonte: str, conteudo: Dict[str, Any]) -> Path:
+    """Grava o snapshot de forma atômica (arquivo temporário + rename)."""
+    caminho = Path(caminho)
+    cabecalho = MAGIA_SNAPSHOT + FORMATO_SNAPSHOT.to_bytes(4, "little") + hash_da_fonte.encode("ascii")
+    temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}.tmp")
+    try:
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(cabecalho)
+            pickle.dump(conteudo, arquivo, protocol=5)
+        os.replace(temporario, caminho)
+    finally:
+        if temporario.exists():
+            temporario.unlink()
+    return caminho
+
+
+def ler_snapshot(caminho: Caminho, hash_da_fonte: str) -> Optional[Dict[str, Any]]:
+    """Conteúdo do snapshot, ou ``None`` se ele não existir, estiver corrompido ou desatualizado."""
+    try:
+        bruto = Path(caminho).read_bytes()
+    except OSError:
+        return None
+    inicio = len(MAGIA_SNAPSHOT)
+    fim_cabecalho = inicio + 4 + len(hash_da_fonte)
+    if (
+        bruto[:inicio] != MAGIA_SNAPSHOT
+        or int.from_bytes(bruto[inicio:inicio + 4], "little") != FORMATO_SNAPSHOT
+        or bruto[inicio + 4:fim_cabecalho] != hash_da_fonte.encode("ascii")
+    ):
+        return None
+    try:
+        return _LeitorRestrito(io.BytesIO(memoryview(bruto)[fim_cabecalho:])).load()
+    except Exception:
+        return None
+
+
+# ==================== LINHA DE COMANDO ====================
+
+def executar_vocabulario(args) -> int:
+    import time
+
+    from simulador import nucleo
+
+    caminho = caminho_vocabulario(args.fonte)
+    snapshot = caminho_snapshot(caminho)
+    if args.acao == "compilar":
+        inicio = time.perf_counter()
+        try:
+            if snapshot.exists():
+                snapshot.unlink()
+            nucleo.carregar_vocabulario(caminho, gravar_snapshot=True)
+        except OSError as erro:
+            sys.stderr.write(f"Não foi possível gravar o snapshot: {erro}\n")
+            return 2
+        print(f"Snapshot gravado em {snapshot} ({time.perf_counter() - inicio:.2f}s).")
+        return 0
+
+    inicio = time.perf_counter()
+    nucleo.carregar_vocabulario(caminho)
+    decorrido = time.perf_counter() - inicio
+    atual = snapshot.exists() and ler_snapshot(snapshot, hash_fonte(caminho)) is not None
+    print(f"Fonte: {caminho}")
+    print(f"Snapshot: {snapshot} ({'atual' if atual else 'ausente ou desatualizado; use vocab compilar'})")
+    print(f"Grupos: {len(nucleo.GRUPOS)} | palavras: {sum(len(p) for p in nucleo.GRUPOS.values())} | "
+          f"termos normalizados: {len(nucleo.obter_indice_vocabulario().conhecidas)}")
+    print(f"Versão do conteúdo: {nucleo.chave_vocabulario()[0]}")
+    print(f"Carregado em {decorrido:.3f}s")
+    return 0
+
+
+def configurar_parser(subparsers) -> None:
+    parser = subparsers.add_parser("vocab", help="Compila ou inspeciona o vocabulário e seu snapshot.")
+    parser.add_argument("acao", choices=("compilar", "info"), help="compilar: grava o snapshot; info: resumo.")
+    parser.add_argument(
+        "fonte", nargs="?",
+        help=f"Arquivo JSON/TOML (padrão: ${VARIAVEL_AMBIENTE} ou {CAMINHO_PADRAO.name}).",
+    )
+    parser.set_defaults(funcao=executar_vocabulario)
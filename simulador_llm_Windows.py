@@ -1,129 +1,121 @@
 """
 Simulador LLM - Análise Contextual Semântica 3D.
 Versão Final: CORRIGIDA para Importações (Matplotlib) e Tipagem (Tkinter sticky).
+
+A janela abre antes do gráfico: NumPy, Matplotlib e PIL só são importados
+dentro das funções que os usam, e o gráfico é montado depois da primeira
+pintura (``--profile-startup`` mostra o tempo de cada fase).
 """
 
+import time
+
+_INICIO_MODULO = time.perf_counter()
+
+import argparse
+import gzip
+import heapq
+import math
+import os
+import sys
+import threading
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
-import numpy as np
-# 1. CORREÇÃO: Importar NavigationToolbar2Tk do local sugerido
-from matplotlib.backends._backend_tk import NavigationToolbar2Tk 
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
-# 3. CORREÇÃO: Importar Figure do módulo correto
-from matplotlib.figure import Figure 
-from mpl_toolkits.mplot3d import Axes3D
-import unicodedata
 import json
+from contextlib import contextmanager
 from datetime import datetime
-from PIL import Image, ImageTk 
+from pathlib import Path
 
-# ==================== CONFIGURAÇÕES E DADOS (MANTIDOS) ====================
+from simulador.indice_fuzzy import IndiceFuzzy, distancia_levenshtein
+from simulador.indice_termos import IndiceTermos, TextoAnalisado
+from simulador.pertinencia import obter_mapa_pertinencia
+from simulador.tarefas import ExecutorEmSegundoPlano
+from simulador.texto import PONTUACAO, normalizar_texto
+from simulador.vocabulario import CAMINHO_WINDOWS, ler_fonte
 
-# Definição dos grupos semânticos
-GRUPOS = {
-    "Transportes": {"carro", "avião", "ônibus", "bicicleta", "motocicleta", "trem", "veículo"},
-    "Móveis": {"cadeira", "mesa", "banco", "armário", "sofá", "cômoda", "cama"},
-    "Animais": {"cachorro", "gato", "focinho", "rato", "leão", "tigre", "baleia"},
-    "Financeiro": {"banco", "moeda", "cédula", "caixa", "dinheiro", "investimento", "juros"}
-}
+# ==================== CONFIGURAÇÕES E DADOS ====================
 
-# Palavras contextuais
-CONTEXTO_GRUPOS = {
-    "Transportes": {
-        "viajar", "dirigir", "pilotar", "velocidade", "motor", "combustível", 
-        "passageiro", "estrada", "rua", "aeroporto", "garagem", "estacionar",
-        "viagem", "roda", "acelerar", "freio", "transporte", "locomover", "tráfego",
-        "partida", "chegada", "embarque", "desembarque"
-    },
-    "Móveis": {
-        "sentar", "sentei", "sentou", "sentado", "sentada", "sentem", "casa", 
-        "sala", "quarto", "madeira", "decoração", "móvel", "conforto", "decorar", 
-        "residência", "apartamento", "escritório", "design", "estofado", "montagem", 
-        "ergonomia", "praça", "jardim", "parque", "acomodar", "descansar", "repousar",
-        "apoiar", "encostar"
-    },
-    "Animais": {
-        "pet", "animal", "bicho", "selvagem", "doméstico", "natureza", "zoológico",
-        "veterinário", "pelo", "pata", "cauda", "mamífero", "espécie",
-        "fauna", "ração", "alimentar", "latir", "miar", "rugir"
-    },
-    "Financeiro": {
-        "dinheiro", "pagar", "receber", "conta", "depósito", "depositar", "depositei",
-        "saque", "sacar", "transferência", "transferir", "agência", "gerente", 
-        "aplicar", "investir", "economizar", "cartão", "cheque", "empréstimo", 
-        "financiamento", "juros", "taxa", "saldo", "crédito", "débito", "poupança", 
-        "correntista", "cofre", "financeiro", "bancário", "caixa eletrônico"
-    }
-}
+# Grupos, contexto, inferência, cores e pesos ficam em simulador/vocabularios/windows.json.
+_VOCABULARIO, _ = ler_fonte(CAMINHO_WINDOWS)
+GRUPOS = _VOCABULARIO["grupos"]
+CONTEXTO_GRUPOS = _VOCABULARIO["contexto_grupos"]
+PALAVRAS_INFERENCIA = _VOCABULARIO["palavras_inferencia"]
+CORES_GRUPOS = _VOCABULARIO["cores_grupos"]
+PESOS = _VOCABULARIO["pesos"]
 
-# Palavras de inferência
-PALAVRAS_INFERENCIA = {
-    "Animais": ["tartaruga", "cobra", "pássaro", "peixe", "elefante", "girafa", 
-                "macaco", "urso", "lobo", "raposa", "coelho", "hamster", "papagaio",
-                "jacaré", "crocodilo", "tubarão", "golfinho", "pato", "galinha",
-                "vaca", "cavalo", "porco", "ovelha", "cabra", "camelo", "avestruz"],
-    "Transportes": ["moto", "barco", "navio", "helicóptero", "metrô", "taxi",
-                    "caminhão", "van", "ônibus", "scooter", "patinete", "skate"],
-    "Móveis": ["estante", "escrivaninha", "poltrona", "banqueta", "criado-mudo",
-               "guarda-roupa", "buffet", "aparador", "rack", "prateleira"],
-    "Financeiro": ["pix", "boleto", "nota", "real", "dólar", "euro", "bitcoin",
-                   "ação", "fundo", "renda", "lucro", "débito", "crédito"]
-}
+# ==================== PERFIL DE INICIALIZAÇÃO ====================
 
-# Cores dos grupos
-CORES_GRUPOS = {
-    "Transportes": "#FF4444",
-    "Móveis": "#4488FF",
-    "Animais": "#44FF44",
-    "Financeiro": "#FFAA00"
-}
+class PerfilInicializacao:
+    """Tempo de cada fase da abertura, medido desde o início do módulo."""
 
-# Pesos para análise contextual
-PESOS = {
-    "contexto": 3.0,
-    "inferencia": 2.5,
-    "principal": 0.2
-}
+    def __init__(self, inicio):
+        self.inicio = inicio
+        self.ativo = False
+        self.destino = None
+        self.fases = []
+        self._trava = threading.Lock()
+        self._impresso = False
 
-# ==================== FUNÇÕES UTILITÁRIAS (MANTIDAS) ====================
+    @contextmanager
+    def fase(self, nome):
+        comeco = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nome, comeco)
 
-def normalizar_texto(texto):
-    """Remove acentuação e converte texto para minúsculas."""
-    if not isinstance(texto, str): return ""
-    texto_nfd = unicodedata.normalize('NFD', texto)
-    texto_sem_acento = ''.join(char for char in texto_nfd if unicodedata.category(char) != 'Mn')
-    return texto_sem_acento.lower().strip()
+    def registrar(self, nome, comeco, fim=None):
+        fim = time.perf_counter() if fim is None else fim
+        with self._trava:
+            self.fases.append((nome, comeco - self.inicio, fim - comeco, threading.current_thread().name))
+
+    def marcar(self, nome):
+        """Registra um instante (duração zero), como a primeira pintura da janela."""
+        self.registrar(nome, time.perf_counter())
+
+    def relatorio(self):
+        linhas = [f"{'fase':<44} {'início':>9} {'duração':>9}  thread"]
+        for nome, inicio, duracao, thread in sorted(self.fases, key=lambda fase: fase[1]):
+            linhas.append(f"{nome:<44} {inicio*1000:7.0f}ms {duracao*1000:7.0f}ms  {thread}")
+        return "\n".join(linhas)
+
+    def imprimir(self):
+        """Escreve o relatório em ``destino`` (``.json`` para ferramentas), ou em stderr."""
+        if not self.ativo or self._impresso:
+            return
+        self._impresso = True
+        if self.destino and self.destino.endswith(".json"):
+            fases = [
+                {"fase": nome, "inicio_ms": inicio * 1000, "duracao_ms": duracao * 1000, "thread": thread}
+                for nome, inicio, duracao, thread in sorted(self.fases, key=lambda fase: fase[1])
+            ]
+            with open(self.destino, "w", encoding="utf-8") as arquivo:
+                json.dump({"fases": fases}, arquivo, ensure_ascii=False)
+            return
+        relatorio = "Inicialização (--profile-startup):\n" + self.relatorio() + "\n"
+        # No executável sem console não há stderr: sem destino, o relatório vai para um arquivo.
+        destino = self.destino or (None if sys.stderr is not None else "perfil_inicializacao.txt")
+        if destino is None:
+            sys.stderr.write(relatorio)
+            sys.stderr.flush()
+        else:
+            with open(destino, "w", encoding="utf-8") as arquivo:
+                arquivo.write(relatorio)
+
+
+PERFIL = PerfilInicializacao(_INICIO_MODULO)
+
+# ==================== FUNÇÕES UTILITÁRIAS (MANTIDAS) ====================
 
 def carregar_logo(caminho_arquivo, tamanho=(40, 40)): 
     """Carrega e redimensiona a logo."""
     try:
+        from PIL import Image, ImageTk
         imagem = Image.open(caminho_arquivo)
         imagem.thumbnail(tamanho, Image.Resampling.LANCZOS)
         return ImageTk.PhotoImage(imagem)
     except Exception as e:
         return None
 
-def calcular_similaridade_levenshtein(palavra1, palavra2):
-    """Calcula a similaridade usando distância de Levenshtein normalizada."""
-    if palavra1 == palavra2: return 1.0
-    len1, len2 = len(palavra1), len(palavra2)
-    if len1 == 0 or len2 == 0: return 0.0
-    
-    matriz = [[0] * (len2 + 1) for _ in range(len1 + 1)]
-    for i in range(len1 + 1): matriz[i][0] = i
-    for j in range(len2 + 1): matriz[0][j] = j
-    
-    for i in range(1, len1 + 1):
-        for j in range(1, len2 + 1):
-            custo = 0 if palavra1[i-1] == palavra2[j-1] else 1
-            matriz[i][j] = min(matriz[i-1][j] + 1, matriz[i][j-1] + 1, matriz[i-1][j-1] + custo)
-    
-    distancia = matriz[len1][len2]
-    max_len = max(len1, len2)
-    similaridade = 1 - (distancia / max_len)
-    return max(0.0, similaridade)
-
 def calcular_similaridade_caracteres(palavra1, palavra2):
     """Calcula similaridade baseada em caracteres comuns (Jaccard)."""
     if palavra1 == palavra2: return 1.0
@@ -134,85 +126,113 @@ def calcular_similaridade_caracteres(palavra1, palavra2):
     uniao = len(set1.union(set2))
     return intersecao / uniao if uniao > 0 else 0.0
 
-def calcular_similaridade_composta(palavra_busca, palavra_comparacao):
-    """Calcula similaridade composta usando múltiplas métricas."""
+def calcular_similaridade_composta(palavra_busca, palavra_comparacao, similaridade_minima=None):
+    """Calcula similaridade composta usando múltiplas métricas.
+
+    Com ``similaridade_minima`` a distância de edição para assim que o resultado
+    não puder mais alcançá-la, e o retorno abaixo dela vira 0.
+    """
     palavra_busca = normalizar_texto(palavra_busca)
     palavra_comparacao = normalizar_texto(palavra_comparacao)
     if palavra_busca == palavra_comparacao: return 100.0
-    sim_levenshtein = calcular_similaridade_levenshtein(palavra_busca, palavra_comparacao)
     sim_caracteres = calcular_similaridade_caracteres(palavra_busca, palavra_comparacao)
     bonus_substring = 0.0
     if palavra_busca in palavra_comparacao or palavra_comparacao in palavra_busca:
         bonus_substring = 0.2
+    maior = max(len(palavra_busca), len(palavra_comparacao))
+    sim_levenshtein = 0.0
+    if palavra_busca and palavra_comparacao:
+        distancia_maxima = None
+        if similaridade_minima is not None:
+            levenshtein_minima = (similaridade_minima / 100 - sim_caracteres * 0.4 - bonus_substring) / 0.6
+            distancia_maxima = math.floor((1 - levenshtein_minima) * maior + 1e-9)
+            if distancia_maxima < 0: return 0.0
+        distancia = distancia_levenshtein(palavra_busca, palavra_comparacao, distancia_maxima)
+        if distancia_maxima is not None and distancia > distancia_maxima: return 0.0
+        sim_levenshtein = max(0.0, 1 - distancia / maior)
     similaridade_final = (sim_levenshtein * 0.6 + sim_caracteres * 0.4 + bonus_substring) * 100
     return min(100.0, similaridade_final)
 
-def obter_todas_palavras():
-    """Retorna todas as palavras dos grupos organizadas por categoria."""
-    todas_palavras = {}
-    for nome_grupo, palavras_grupo in GRUPOS.items():
-        todas_palavras[nome_grupo] = list(palavras_grupo)
-    return todas_palavras
+def _similaridades_grupo(palavra_busca, palavras_grupo, k=None):
+    """Palavras de um grupo, da mais para a menos parecida com ``palavra_busca`` (só as ``k`` primeiras, se dado).
+
+    Com ``k``, a k-ésima melhor nota até o momento serve de corte para as demais.
+    """
+    if k is None:
+        itens = [
+            {'palavra': palavra, 'similaridade': calcular_similaridade_composta(palavra_busca, palavra)}
+            for palavra in sorted(palavras_grupo)
+        ]
+        itens.sort(key=lambda x: x['similaridade'], reverse=True)
+        return itens
+    melhores = []  # heap de (similaridade, -posição, palavra): a pior das k primeiras no topo
+    for posicao, palavra in enumerate(sorted(palavras_grupo)):
+        minima = melhores[0][0] if len(melhores) >= k else None
+        similaridade = calcular_similaridade_composta(palavra_busca, palavra, minima)
+        item = (similaridade, -posicao, palavra)
+        if len(melhores) < k:
+            heapq.heappush(melhores, item)
+        elif item > melhores[0]:
+            heapq.heapreplace(melhores, item)
+    return [
+        {'palavra': palavra, 'similaridade': similaridade}
+        for similaridade, _, palavra in sorted(melhores, reverse=True)
+    ]
+
+_indice_termos = None
+_indice_fuzzy = None
 
-def calcular_similaridades_palavra(palavra_busca):
-    """Calcula similaridades de uma palavra com todas as outras palavras dos grupos."""
+def obter_indice_termos():
+    """Termos do vocabulário já normalizados, com papéis, grupos e autômato de busca; montado na primeira análise."""
+    global _indice_termos
+    if _indice_termos is None:
+        _indice_termos = IndiceTermos(GRUPOS, CONTEXTO_GRUPOS, PALAVRAS_INFERENCIA)
+    return _indice_termos
+
+def obter_indice_fuzzy():
+    """Índice de trigramas do vocabulário, construído na primeira consulta."""
+    global _indice_fuzzy
+    if _indice_fuzzy is None:
+        _indice_fuzzy = IndiceFuzzy(obter_indice_termos().palavras_ordenadas)
+    return _indice_fuzzy
+
+def preparar_texto(texto):
+    """Normaliza, tokeniza e varre ``texto`` uma única vez; os detectores aceitam o resultado no lugar do texto."""
+    if isinstance(texto, TextoAnalisado):
+        return texto
+    return TextoAnalisado(normalizar_texto(texto), obter_indice_termos())
+
+def calcular_similaridades_proximas(palavra_busca, k=4):
+    """Top-k de cada grupo, pontuando só os candidatos do índice de trigramas."""
     if not palavra_busca or len(palavra_busca.strip()) < 2: return {}
     palavra_busca = palavra_busca.strip()
-    todas_palavras = obter_todas_palavras()
+    palavra_norm = normalizar_texto(palavra_busca)
+    n_candidatos = max(3 * k, 30)
     similaridades = {}
-    for nome_grupo, palavras_grupo in todas_palavras.items():
-        similaridades[nome_grupo] = []
-        for palavra in sorted(palavras_grupo):
-            similaridade = calcular_similaridade_composta(palavra_busca, palavra)
-            similaridades[nome_grupo].append({
-                'palavra': palavra,
-                'similaridade': similaridade
-            })
-        similaridades[nome_grupo].sort(key=lambda x: x['similaridade'], reverse=True)
+    for nome_grupo, palavras_grupo in GRUPOS.items():
+        if len(palavras_grupo) <= n_candidatos:
+            candidatos = palavras_grupo
+        else:
+            proximas = obter_indice_fuzzy().mais_proximas(palavra_norm, k=n_candidatos, grupo=nome_grupo)
+            candidatos = {palavra for _, palavra, _ in proximas}
+        similaridades[nome_grupo] = _similaridades_grupo(palavra_busca, candidatos, k)
     return similaridades
 
 def detectar_palavras_ambiguas(texto):
     """Identifica palavras que pertencem a múltiplos grupos semânticos."""
-    texto_normalizado = normalizar_texto(texto)
-    palavras = texto_normalizado.split()
     ambiguas = []
-    for palavra in palavras:
-        palavra_limpa = palavra.strip('.,!?;:')
-        grupos_encontrados = []
-        for nome_grupo, palavras_grupo in GRUPOS.items():
-            palavras_normalizadas = {normalizar_texto(p) for p in palavras_grupo}
-            if palavra_limpa in palavras_normalizadas:
-                grupos_encontrados.append(nome_grupo)
-        if len(grupos_encontrados) > 1:
-            if not any(item[0] == palavra_limpa for item in ambiguas):
-                ambiguas.append((palavra_limpa, grupos_encontrados))
+    for palavra, grupos_encontrados in preparar_texto(texto).ambiguas(obter_indice_termos()):
+        if not any(item[0] == palavra for item in ambiguas):
+            ambiguas.append((palavra, grupos_encontrados))
     return ambiguas
 
 def analisar_contexto(texto_completo, pesos=None):
     """Analisa o contexto completo do texto e calcula scores de pertinência."""
-    if not isinstance(texto_completo, str) or not texto_completo.strip():
+    analisado = preparar_texto(texto_completo)
+    if not analisado.normalizado:
         return {nome: 0.0 for nome in GRUPOS.keys()}
     if pesos is None: pesos = PESOS
-    texto_normalizado = normalizar_texto(texto_completo)
-    scores_contexto = {nome: 0.0 for nome in GRUPOS.keys()}
-    for nome_grupo, palavras_contexto in CONTEXTO_GRUPOS.items():
-        for palavra_ctx in palavras_contexto:
-            palavra_norm = normalizar_texto(palavra_ctx)
-            if palavra_norm in texto_normalizado:
-                scores_contexto[nome_grupo] += pesos["contexto"]
-    for nome_grupo, palavras_grupo in GRUPOS.items():
-        for palavra_principal in palavras_grupo:
-            palavra_norm = normalizar_texto(palavra_principal)
-            if f" {palavra_norm} " in f" {texto_normalizado} " or \
-               texto_normalizado.startswith(palavra_norm + " ") or \
-               texto_normalizado.endswith(" " + palavra_norm) or \
-               texto_normalizado == palavra_norm: 
-                scores_contexto[nome_grupo] += pesos["principal"]
-    for nome_grupo, palavras_relacionadas in PALAVRAS_INFERENCIA.items():
-        for palavra_rel in palavras_relacionadas:
-            palavra_norm = normalizar_texto(palavra_rel)
-            if palavra_norm in texto_normalizado:
-                scores_contexto[nome_grupo] += pesos["inferencia"]
+    scores_contexto, _ = obter_indice_termos().pontuar_ocorrencias(analisado.ocorrencias, pesos)
     total = sum(scores_contexto.values())
     if total > 0:
         scores_contexto = {k: v/total for k, v in scores_contexto.items()}
@@ -230,132 +250,372 @@ def identificar_grupo(texto):
 
 def detectar_palavras_desconhecidas(texto):
     """Identifica palavras que não pertencem a nenhum grupo ou contexto."""
-    texto_normalizado = normalizar_texto(texto)
-    palavras = texto_normalizado.split()
-    todas_conhecidas = set()
-    for palavras_grupo in GRUPOS.values():
-        todas_conhecidas.update(normalizar_texto(p) for p in palavras_grupo)
-    for palavras_ctx in CONTEXTO_GRUPOS.values():
-        todas_conhecidas.update(normalizar_texto(p) for p in palavras_ctx)
-    for palavras_inf in PALAVRAS_INFERENCIA.values():
-        todas_conhecidas.update(normalizar_texto(p) for p in palavras_inf)
-    desconhecidas = []
-    for palavra in palavras:
-        palavra_limpa = palavra.strip('.,!?;:')
-        if len(palavra_limpa) > 2 and palavra_limpa not in todas_conhecidas:
-            if palavra_limpa not in desconhecidas: 
-                desconhecidas.append(palavra_limpa)
-    return desconhecidas
+    return list(dict.fromkeys(preparar_texto(texto).desconhecidas(obter_indice_termos())))
+
+def preparar_analise(texto, tarefa=None):
+    """Calcula tudo o que a análise exibe, sem tocar na interface (roda na thread de fundo)."""
+    verificar = tarefa.verificar if tarefa is not None else (lambda: None)
+    analisado = preparar_texto(texto)
+    grupo_identificado, scores = identificar_grupo(analisado)
+    verificar()
+    ambiguas = detectar_palavras_ambiguas(analisado)
+    desconhecidas = detectar_palavras_desconhecidas(analisado)
+    verificar()
+
+    palavras_tokenizadas = texto.split()
+    primeira_palavra = palavras_tokenizadas[0].strip(PONTUACAO) if palavras_tokenizadas else ""
+    similaridades = calcular_similaridades_proximas(primeira_palavra, k=4) if primeira_palavra else {}
+    verificar()
+
+    # Deixa layout e pertinência prontos para o gráfico, que é montado na thread do Tk.
+    from simulador.layout import obter_layout
+    obter_layout(GRUPOS, **PARAMETROS_LAYOUT)
+    obter_mapa_pertinencia(GRUPOS, normalizar_texto)
+    return {
+        "texto": texto,
+        "grupo": grupo_identificado,
+        "scores": scores,
+        "ambiguas": ambiguas,
+        "desconhecidas": desconhecidas,
+        "primeira_palavra": primeira_palavra,
+        "similaridades": similaridades,
+    }
 
 # ==================== VISUALIZAÇÃO 3D ====================
 
-def criar_grafico_3d(ax, texto_busca=None):
-    """Cria o gráfico 3D do espaço semântico."""
-    ax.clear()
-    
-    nomes_grupos = list(GRUPOS.keys())
-    n_grupos = len(nomes_grupos)
-    angulos_grupos = np.linspace(0, 2*np.pi, n_grupos, endpoint=False)
-    raio_grupos = 5.0
-    
-    coords_grupos = {}
-    for i, nome_grupo in enumerate(nomes_grupos):
-        x = raio_grupos * np.cos(angulos_grupos[i])
-        y = raio_grupos * np.sin(angulos_grupos[i])
-        coords_grupos[nome_grupo] = (x, y, 0)
-    
-    coords_palavras = {}
-    for nome_grupo, palavras_grupo in GRUPOS.items():
-        centro_x, centro_y, centro_z = coords_grupos[nome_grupo]
-        palavras_lista = sorted(palavras_grupo)
-        n_palavras = len(palavras_lista)
-        raio_interno = 1.2
-        
-        for j, palavra in enumerate(palavras_lista):
-            angulo = 2 * np.pi * j / n_palavras
-            x = centro_x + raio_interno * np.cos(angulo)
-            y = centro_y + raio_interno * np.sin(angulo)
-            z = np.random.randn() * 0.3
-            chave = f"{palavra}_{nome_grupo}"
-            coords_palavras[chave] = (x, y, z, palavra, nome_grupo)
-    
-    for nome_grupo, (x, y, z) in coords_grupos.items():
-        cor = CORES_GRUPOS[nome_grupo]
-        ax.scatter(x, y, z, c=cor, s=500, alpha=0.4, edgecolors='black', 
-                  linewidths=3, marker='o', zorder=1)
-        ax.text(x, y, z-0.6, nome_grupo, fontsize=10, weight='bold', 
-                ha='center', color='black', zorder=2)
-    
-    for chave, (x, y, z, palavra, nome_grupo) in coords_palavras.items():
-        grupos_da_palavra = []
-        for ng, pg in GRUPOS.items():
-            if palavra in pg:
-                grupos_da_palavra.append(ng)
-        
-        if len(grupos_da_palavra) > 1:
-            cor = "#9B59B6"
-            ax.scatter(x, y, z, c=cor, s=120, alpha=0.9, edgecolors='red', 
-                      linewidths=2.5, zorder=3, marker='D')
-            ax.text(x, y, z, f' {palavra}', fontsize=7.5, weight='bold', 
-                    color='purple', alpha=0.95, zorder=3)
-        else:
-            cor = CORES_GRUPOS[nome_grupo]
-            ax.scatter(x, y, z, c=cor, s=80, alpha=0.75, edgecolors='black', 
-                      linewidths=0.8, zorder=3)
-            ax.text(x, y, z, f' {palavra}', fontsize=7.5, alpha=0.8, zorder=3) 
-    
-    if texto_busca:
-        grupo_identificado, scores = identificar_grupo(texto_busca)
-        
-        if grupo_identificado:
-            centro_x, centro_y, centro_z = coords_grupos[grupo_identificado]
-            coord_busca = (centro_x, centro_y, 1.2)
-            cor_destaque = CORES_GRUPOS[grupo_identificado]
-            
-            ax.scatter(coord_busca[0], coord_busca[1], coord_busca[2], 
-                      c=cor_destaque, s=700, marker='*', edgecolors='black', 
-                      linewidths=5, zorder=10)
-            
-            texto_display = f'★ {texto_busca[:20]} ★' 
-            ax.text(coord_busca[0], coord_busca[1], coord_busca[2] + 0.7, 
-                    texto_display, fontsize=10, weight='bold', color='darkred',
-                    ha='center', va='bottom',
-                    # CORREÇÃO DO ERRO: mudando 'edgecolors' para 'edgecolor'
-                    bbox=dict(boxstyle='round,pad=0.5', facecolor=cor_destaque, 
-                              edgecolor='black', linewidth=2.5, alpha=0.95),
-                    zorder=11)
+PARAMETROS_LAYOUT = {"raio_grupos": 5.0, "raio_interno": 1.2, "escala_z": 0.3}
+_CALCULAR = object()
+
+
+class CenaSemantica3D:
+    """Gráfico 3D do espaço semântico, montado uma única vez.
+
+    Grupos e palavras viram uma coleção por grupo (em vez de um ``scatter`` por
+    ponto) e não são recriados a cada análise: ``destacar`` só troca a estrela
+    e o rótulo da entrada, e ``aplicar_limites`` só muda os eixos. Quando o
+    canvas suporta blitting, o destaque e o título são pintados sobre o fundo
+    guardado no último desenho completo, sem redesenhar as palavras.
+    """
+
+    LIMITE_PADRAO = 8
+    VISTA_PADRAO = (20, 45)
+
+    def __init__(self, ax, canvas=None):
+        self.ax = ax
+        self.canvas = canvas
+        self.usar_blit = canvas is not None and getattr(canvas, "supports_blit", False)
+        self._montada = False
+        self._destaque = []
+        self._entrada = (None, None)
+        self._fundo = None
+        if self.usar_blit:
+            canvas.mpl_connect("draw_event", self._ao_desenhar)
+
+    def montar(self):
+        """Cria os artistas fixos (esferas dos grupos, palavras e rótulos), se ainda não existirem."""
+        if self._montada:
+            return
+        import numpy as np
+        from simulador.layout import obter_layout
+
+        ax = self.ax
+        ax.clear()
+        self._destaque = []
+
+        layout = obter_layout(GRUPOS, **PARAMETROS_LAYOUT)
+        pertinencia = obter_mapa_pertinencia(GRUPOS, normalizar_texto)
+
+        for nome_grupo, (x, y, z) in layout.centros.items():
+            ax.scatter(x, y, z, c=CORES_GRUPOS[nome_grupo], s=500, alpha=0.4, edgecolors='black',
+                       linewidths=3, marker='o', zorder=1)
+            ax.text(x, y, z-0.6, nome_grupo, fontsize=10, weight='bold',
+                    ha='center', color='black', zorder=2)
+
+        for nome_grupo in GRUPOS:
+            palavras = layout.palavras[nome_grupo]
+            posicoes = layout.posicoes[nome_grupo]
+            compartilhadas = np.array([pertinencia.compartilhada(p) for p in palavras], dtype=bool)
+            if (~compartilhadas).any():
+                x, y, z = posicoes[~compartilhadas].T
+                ax.scatter(x, y, z, c=CORES_GRUPOS[nome_grupo], s=80, alpha=0.75, edgecolors='black',
+                           linewidths=0.8, zorder=3, depthshade=False)
+            if compartilhadas.any():
+                x, y, z = posicoes[compartilhadas].T
+                ax.scatter(x, y, z, c="#9B59B6", s=120, alpha=0.9, edgecolors='red',
+                           linewidths=2.5, zorder=3, marker='D', depthshade=False)
+            for palavra, (x, y, z), compartilhada in zip(palavras, posicoes, compartilhadas):
+                if compartilhada:
+                    ax.text(x, y, z, f' {palavra}', fontsize=7.5, weight='bold',
+                            color='purple', alpha=0.95, zorder=3)
+                else:
+                    ax.text(x, y, z, f' {palavra}', fontsize=7.5, alpha=0.8, zorder=3)
+
+        ax.set_xlabel('X', fontsize=10, weight='bold')
+        ax.set_ylabel('Y', fontsize=10, weight='bold')
+        ax.set_zlabel('Z', fontsize=10, weight='bold')
+        ax.title.set_animated(self.usar_blit)
+        ax.grid(True, alpha=0.4, linestyle='--')
+        self.restaurar_vista()
+        self._montada = True
+
+    def destacar(self, texto_busca=None, grupo_identificado=None):
+        """Troca a estrela da entrada e o título; ``texto_busca=None`` volta ao estado inicial."""
+        self.montar()
+        ax = self.ax
+        for artista in self._destaque:
+            artista.remove()
+        self._destaque = []
+        self._entrada = (texto_busca, grupo_identificado)
+
+        titulo = f'Grupos Semânticos: {", ".join(GRUPOS.keys())}'
+        if texto_busca:
+            titulo += f'\nEntrada: "{texto_busca[:35]}..."'
+            if grupo_identificado:
+                from simulador.layout import obter_layout
+                centro_x, centro_y, _ = obter_layout(GRUPOS, **PARAMETROS_LAYOUT).centros[grupo_identificado]
+                coord_busca = (centro_x, centro_y, 1.2)
+                cor_estrela = cor_caixa = CORES_GRUPOS[grupo_identificado]
+                texto_display, cor_texto = f'★ {texto_busca[:20]} ★', 'darkred'
+            else:
+                coord_busca = (0, 0, 2.2)
+                cor_estrela, cor_caixa = 'gray', 'lightgray'
+                texto_display, cor_texto = f'★ {texto_busca[:20]} ★\n(SEM CONTEXTO)', 'black'
+
+            self._destaque.append(ax.scatter(
+                coord_busca[0], coord_busca[1], coord_busca[2],
+                c=cor_estrela, s=700, marker='*', edgecolors='black', linewidths=5, zorder=10,
+            ))
+            self._destaque.append(ax.text(
+                coord_busca[0], coord_busca[1], coord_busca[2] + 0.7,
+                texto_display, fontsize=10, weight='bold', color=cor_texto,
+                ha='center', va='bottom',
+                bbox=dict(boxstyle='round,pad=0.5', facecolor=cor_caixa,
+                          edgecolor='black', linewidth=2.5, alpha=0.95),
+                zorder=11,
+            ))
+        ax.set_title(titulo, fontsize=10, weight='bold', pad=15)
+        for artista in self._destaque:
+            artista.set_animated(self.usar_blit)
+        self._atualizar_destaque()
+
+    def aplicar_limites(self, limite):
+        """Zoom: só os limites mudam; o redesenho fica para quando o Tk estiver ocioso."""
+        self.ax.set_xlim([-limite, limite])
+        self.ax.set_ylim([-limite, limite])
+        self.ax.set_zlim([-limite/4, limite/2])
+        if self.canvas is not None:
+            self.canvas.draw_idle()
+
+    def restaurar_vista(self):
+        self.ax.view_init(*self.VISTA_PADRAO)
+        self.aplicar_limites(self.LIMITE_PADRAO)
+
+    def estado(self):
+        """Entrada destacada, vista, limites e tamanho da figura, em tipos simples (para refazer a cena)."""
+        ax = self.ax
+        return {
+            "entrada": self._entrada,
+            "vista": (ax.elev, ax.azim, ax.roll),
+            "limites": (ax.get_xlim3d(), ax.get_ylim3d(), ax.get_zlim3d()),
+            "tamanho": tuple(ax.figure.get_size_inches()),
+            "dpi": ax.figure.dpi,
+        }
+
+    def restaurar_estado(self, estado):
+        self.destacar(*estado["entrada"])
+        self.ax.view_init(*estado["vista"])
+        for definir, limites in zip((self.ax.set_xlim3d, self.ax.set_ylim3d, self.ax.set_zlim3d), estado["limites"]):
+            definir(limites)
+
+    def _atualizar_destaque(self):
+        if self.canvas is None:
+            return
+        if not self.usar_blit or self._fundo is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._fundo)
+        self._pintar_animados()
+        self.canvas.blit(self.ax.figure.bbox)
+
+    def _ao_desenhar(self, evento):
+        # Desenho completo (zoom, rotação, redimensionamento): guarda o fundo sem o destaque.
+        if evento is not None and evento.canvas is not self.canvas:
+            return
+        if not self.ax.title.get_animated():
+            return
+        self._fundo = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        self._pintar_animados()
+
+    def _pintar_animados(self):
+        figura = self.ax.figure
+        for artista in self._destaque:
+            if hasattr(artista, "do_3d_projection"):
+                artista.do_3d_projection()
+            figura.draw_artist(artista)
+        figura.draw_artist(self.ax.title)
+
+
+def importar_modulos_grafico(tarefa=None):
+    """Importa NumPy e Matplotlib e calcula o layout (a parte lenta da abertura), fora da thread do Tk."""
+    with PERFIL.fase("import numpy"):
+        import numpy  # noqa: F401
+    with PERFIL.fase("import matplotlib.figure"):
+        import matplotlib.figure  # noqa: F401
+    with PERFIL.fase("import mpl_toolkits.mplot3d"):
+        import mpl_toolkits.mplot3d  # noqa: F401
+    with PERFIL.fase("import matplotlib.backends.backend_tkagg"):
+        import matplotlib.backends.backend_tkagg  # noqa: F401
+    with PERFIL.fase("layout e pertinência do vocabulário"):
+        from simulador.layout import obter_layout
+        obter_layout(GRUPOS, **PARAMETROS_LAYOUT)
+        obter_mapa_pertinencia(GRUPOS, normalizar_texto)
+
+def criar_grafico_3d(ax, texto_busca=None, grupo_identificado=_CALCULAR):
+    """Cria o gráfico 3D do espaço semântico do zero (para figuras avulsas).
+
+    ``grupo_identificado`` evita refazer a análise quando ela já foi calculada.
+    """
+    if texto_busca and grupo_identificado is _CALCULAR:
+        grupo_identificado, _ = identificar_grupo(texto_busca)
+    cena = CenaSemantica3D(ax)
+    cena.destacar(texto_busca, None if grupo_identificado is _CALCULAR else grupo_identificado)
+    return cena
+
+# ==================== EXPORTAÇÃO ====================
+
+# Nome exibido -> (formato do savefig, dpi). Nos formatos vetoriais o dpi só vale para partes rasterizadas.
+FORMATOS_GRAFICO = {
+    "PNG (300 dpi)": ("png", 300),
+    "PNG prévia (96 dpi)": ("png", 96),
+    "SVG (vetorial)": ("svg", 300),
+    "PDF (vetorial)": ("pdf", 300),
+}
+
+# Nome exibido -> extensão.
+FORMATOS_DADOS = {
+    "JSON": ".json",
+    "JSON compactado (.json.gz)": ".json.gz",
+    "JSONL (um grupo por linha)": ".jsonl",
+}
+
+def _sem_progresso(fracao, mensagem=""):
+    pass
+
+def _gravar_substituindo(caminho, gravar):
+    """Chama ``gravar(temporario)`` e só então troca o arquivo: uma falha não deixa ``caminho`` pela metade."""
+    caminho = Path(caminho)
+    temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}.tmp")
+    try:
+        gravar(temporario)
+        os.replace(temporario, caminho)
+    finally:
+        if temporario.exists():
+            temporario.unlink()
+    return str(caminho)
+
+def copiar_figura(cena):
+    """Estado da cena (entrada, vista, limites e tamanho) para refazer a figura; rápido, roda na thread do Tk.
+
+    Só tipos simples atravessam as threads: a figura da janela não é serializada
+    nem desenhada fora da thread do Tk.
+    """
+    return cena.estado()
+
+def exportar_figura(estado, caminho, formato, dpi, tarefa=None):
+    """Refaz a figura a partir de ``estado`` e grava o arquivo; roda fora da thread do Tk."""
+    from matplotlib.figure import Figure
+
+    progresso = tarefa.progresso if tarefa is not None else _sem_progresso
+    figura = Figure(figsize=estado["tamanho"], dpi=estado["dpi"])
+    CenaSemantica3D(figura.add_subplot(111, projection='3d')).restaurar_estado(estado)
+    progresso(0.2, f"⏳ Gerando {formato.upper()} ({dpi} dpi)...")
+    caminho = _gravar_substituindo(caminho, lambda temporario: figura.savefig(
+        temporario, format=formato, dpi=dpi, bbox_inches='tight', facecolor='white', edgecolor='none'
+    ))
+    progresso(1.0, "✅ Gráfico exportado")
+    return caminho
+
+def exportar_similaridades(caminho, palavra, extensao=".json", similaridades=None, scores=None, tarefa=None):
+    """Grava as similaridades de ``palavra`` em JSON, JSON com gzip ou JSONL (cabeçalho + um grupo por linha).
+
+    Sem ``similaridades`` calcula as listas completas de todos os grupos;
+    ``scores`` acrescenta a pertinência de cada grupo na análise do texto.
+    """
+    progresso = tarefa.progresso if tarefa is not None else _sem_progresso
+    if similaridades is None:
+        similaridades = {}
+        for indice, (nome_grupo, palavras_grupo) in enumerate(GRUPOS.items(), 1):
+            similaridades[nome_grupo] = _similaridades_grupo(palavra, palavras_grupo)
+            progresso(0.8 * indice / len(GRUPOS), f"⏳ Calculando similaridades ({indice}/{len(GRUPOS)})...")
+    progresso(0.8, "⏳ Gravando dados...")
+
+    dados = {
+        'palavra_analisada': palavra,
+        'timestamp_exportacao': datetime.now().isoformat(),
+        'instituicao': 'MPPA - GIIA',
+    }
+    if scores is not None:
+        dados['pertinencia'] = scores
+    dados['similaridades'] = similaridades
+
+    def gravar(temporario):
+        if extensao == ".jsonl":
+            with open(temporario, 'w', encoding='utf-8') as f:
+                cabecalho = {chave: valor for chave, valor in dados.items() if chave not in ('pertinencia', 'similaridades')}
+                f.write(json.dumps(cabecalho, ensure_ascii=False, separators=(',', ':')) + "\n")
+                for nome_grupo, itens in similaridades.items():
+                    linha = {'grupo': nome_grupo}
+                    if scores is not None:
+                        linha['pertinencia'] = scores.get(nome_grupo, 0.0)
+                    linha['similaridades'] = itens
+                    f.write(json.dumps(linha, ensure_ascii=False, separators=(',', ':')) + "\n")
+        elif extensao == ".json.gz":
+            with gzip.open(temporario, 'wt', encoding='utf-8', compresslevel=6) as f:
+                json.dump(dados, f, ensure_ascii=False, separators=(',', ':'))
         else:
-            coord_busca = (0, 0, 2.2)
-            ax.scatter(coord_busca[0], coord_busca[1], coord_busca[2], 
-                      c='gray', s=700, marker='*', edgecolors='black', 
-                      linewidths=5, zorder=10)
-            
-            texto_display = f'★ {texto_busca[:20]} ★\n(SEM CONTEXTO)'
-            ax.text(coord_busca[0], coord_busca[1], coord_busca[2] + 0.7, 
-                    texto_display, fontsize=10, weight='bold', color='black',
-                    ha='center', va='bottom',
-                    # CORREÇÃO DO ERRO: mudando 'edgecolors' para 'edgecolor'
-                    bbox=dict(boxstyle='round,pad=0.5', facecolor='lightgray', 
-                              edgecolor='black', linewidth=2.5, alpha=0.95),
-                    zorder=11)
-    
-    ax.set_xlabel('X', fontsize=10, weight='bold') 
-    ax.set_ylabel('Y', fontsize=10, weight='bold') 
-    ax.set_zlabel('Z', fontsize=10, weight='bold') 
-    
-    grupos = ', '.join(GRUPOS.keys())
-    titulo = f'Grupos Semânticos: {grupos}'
-    if texto_busca:
-        titulo += f'\nEntrada: "{texto_busca[:35]}..."' 
-    
-    ax.set_title(titulo, fontsize=10, weight='bold', pad=15) 
-    
-    limite = 8
-    ax.set_xlim([-limite, limite])
-    ax.set_ylim([-limite, limite])
-    ax.set_zlim([-2, 4])
-    ax.grid(True, alpha=0.4, linestyle='--')
-    ax.view_init(elev=20, azim=45)
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(dados, f, ensure_ascii=False, indent=2)
+
+    caminho = _gravar_substituindo(caminho, gravar)
+    progresso(1.0, "✅ Dados exportados")
+    return caminho
+
+def escolher_opcoes_exportacao(parent, titulo, formatos, opcoes=()):
+    """Janela modal com o formato e caixas de seleção ``(chave, rótulo, padrão)``.
+
+    Retorna ``(nome_do_formato, {chave: marcada})``, ou ``None`` se cancelada.
+    """
+    janela = tk.Toplevel(parent)
+    janela.title(titulo)
+    janela.transient(parent)
+    janela.resizable(False, False)
+    quadro = ttk.Frame(janela, padding=12)
+    quadro.pack(fill=tk.BOTH, expand=True)
+
+    ttk.Label(quadro, text="Formato:", font=('Arial', 10, 'bold')).pack(anchor=tk.W)
+    formato = tk.StringVar(value=next(iter(formatos)))
+    for nome in formatos:
+        ttk.Radiobutton(quadro, text=nome, value=nome, variable=formato).pack(anchor=tk.W, padx=8)
+    marcadas = {}
+    for chave, rotulo, padrao in opcoes:
+        marcadas[chave] = tk.BooleanVar(value=padrao)
+        ttk.Checkbutton(quadro, text=rotulo, variable=marcadas[chave]).pack(anchor=tk.W, pady=(6, 0))
+
+    escolha = []
+    def confirmar(event=None):
+        escolha.append((formato.get(), {chave: variavel.get() for chave, variavel in marcadas.items()}))
+        janela.destroy()
+
+    botoes = ttk.Frame(quadro)
+    botoes.pack(fill=tk.X, pady=(12, 0))
+    ttk.Button(botoes, text="Cancelar", command=janela.destroy).pack(side=tk.RIGHT, padx=2)
+    ttk.Button(botoes, text="Continuar", command=confirmar, style='Accent.TButton').pack(side=tk.RIGHT, padx=2)
+    janela.bind("<Return>", confirmar)
+    janela.bind("<Escape>", lambda event: janela.destroy())
+    janela.wait_visibility()
+    janela.grab_set()
+    parent.wait_window(janela)
+    return escolha[0] if escolha else None
 
 # ==================== TOOLTIP (MANTIDO) ====================
 
@@ -404,11 +664,27 @@ class AplicacaoLLM:
         self.default_limits = 8
         self.palavra_atual = ""
         self.logo_image = None
+        self.executor_analise = ExecutorEmSegundoPlano("analise")
+        self.executor_carga = ExecutorEmSegundoPlano("carga", substituir=False)
+        # Exportações rodam todas, em ordem, sem serem canceladas por uma análise nova.
+        self.executor_exportacao = ExecutorEmSegundoPlano("exportacao", substituir=False)
+        self._executores = [self.executor_analise, self.executor_carga, self.executor_exportacao]
+        self._acompanhando_tarefas = False
+        self._ocupado_visivel = False
+        self._barra_animada = False
+        self.analise_atual = None
+        # O gráfico só existe depois que Matplotlib termina de carregar (_montar_grafico).
+        self.fig = self.ax = self.canvas = self.cena = None
+        self._destaque_pendente = None
+        self.fechar_apos_abrir = False
         
         self._configurar_estilo()
         self._carregar_logo()
         self._criar_interface()
         self.mostrar_inicial()
+        
+        self.executor_carga.enviar(importar_modulos_grafico, self._montar_grafico, self._falha_grafico)
+        self._acompanhar_tarefas()
     
     def _configurar_estilo(self):
         style = ttk.Style()
@@ -419,7 +695,8 @@ class AplicacaoLLM:
     
     def _carregar_logo(self):
         """Carrega a logo do MPPA/GIIA com tamanho reduzido."""
-        self.logo_image = carregar_logo("Mui.png", (40, 40)) 
+        with PERFIL.fase("janela: logo (PIL)"):
+            self.logo_image = carregar_logo("Mui.png", (40, 40)) 
     
     def _criar_interface(self):
         main_frame = ttk.Frame(self.root, padding="5")
@@ -496,6 +773,13 @@ class AplicacaoLLM:
         self.btn_exportar_dados = ttk.Button(btn_frame2, text="📊 Exportar Dados", command=self.exportar_dados)
         self.btn_exportar_dados.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
         
+        # Indicador de ocupado: só aparece enquanto há tarefas na thread de fundo.
+        self.frame_ocupado = ttk.Frame(btn_frame)
+        self.status_ocupado = ttk.Label(self.frame_ocupado, text="", foreground="#0066CC")
+        self.status_ocupado.pack(side=tk.LEFT, padx=2)
+        self.barra_ocupado = ttk.Progressbar(self.frame_ocupado, mode='indeterminate', length=120)
+        self.barra_ocupado.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
+        
     def _criar_controles_zoom_panel(self, parent):
         """Cria os controles de zoom diretamente no Painel de Controle (lado esquerdo)."""
         zoom_frame = ttk.Frame(parent)
@@ -573,25 +857,64 @@ class AplicacaoLLM:
         graph_frame.grid(row=0, column=1, sticky=f"{tk.W}{tk.E}{tk.N}{tk.S}", padx=(5, 5), pady=(5, 5))
         graph_frame.columnconfigure(0, weight=1)
         graph_frame.rowconfigure(0, weight=1)
+        self.graph_frame = graph_frame
         
-        self.fig = Figure(figsize=(8, 7), dpi=100) # 3. CORREÇÃO: Usando Figure do módulo figure
-        self.ax = self.fig.add_subplot(111, projection='3d')
+        self.grafico_provisorio = ttk.Label(graph_frame, text="⏳ Carregando visualização 3D...",
+                                            font=('Arial', 12), foreground="#0066CC", anchor=tk.CENTER)
+        self.grafico_provisorio.pack(fill=tk.BOTH, expand=True)
+    
+    def _montar_grafico(self, _=None):
+        """Troca o aviso de carregamento pelo gráfico; roda na thread do Tk após os imports de fundo."""
+        # 1. CORREÇÃO: Importar NavigationToolbar2Tk do local sugerido
+        from matplotlib.backends._backend_tk import NavigationToolbar2Tk
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        # 3. CORREÇÃO: Importar Figure do módulo correto
+        from matplotlib.figure import Figure
         
-        self.canvas = FigureCanvasTkAgg(self.fig, master=graph_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        with PERFIL.fase("gráfico: figura, canvas e barra"):
+            self.fig = Figure(figsize=(8, 7), dpi=100)
+            self.ax = self.fig.add_subplot(111, projection='3d')
+            
+            self.canvas = FigureCanvasTkAgg(self.fig, master=self.graph_frame)
+            self.cena = CenaSemantica3D(self.ax, self.canvas)
+            self.grafico_provisorio.destroy()
+            self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            
+            toolbar_frame = ttk.Frame(self.graph_frame)
+            toolbar_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
+            toolbar = NavigationToolbar2Tk(self.canvas, toolbar_frame)
+            toolbar.update()
         
-        toolbar_frame = ttk.Frame(graph_frame)
-        toolbar_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
-        toolbar = NavigationToolbar2Tk(self.canvas, toolbar_frame)
-        toolbar.update()
+        with PERFIL.fase("gráfico: cena e primeiro desenho"):
+            if self._destaque_pendente is not None:
+                self.cena.destacar(*self._destaque_pendente)
+                self._destaque_pendente = None
+            else:
+                self.cena.destacar()
+            self.canvas.draw()
+        self._abertura_concluida()
+    
+    def _falha_grafico(self, erro):
+        self.grafico_provisorio.config(text=f"⚠️ Não foi possível carregar o gráfico:\n{erro}")
+        self._abertura_concluida()
+    
+    def _abertura_concluida(self):
+        PERFIL.imprimir()
+        if self.fechar_apos_abrir:
+            self.root.after(0, self.root.destroy)
         
     # --- Métodos de Lógica e Ação (MANTIDOS) ---
 
     def mostrar_inicial(self):
+        self.executor_analise.cancelar()
+        if not self.executor_exportacao.ocupado:
+            self._esconder_ocupado()
         try:
-            criar_grafico_3d(self.ax)
-            self.canvas.draw()
+            self.zoom_level = 1.0
+            self._destaque_pendente = None
+            if self.cena is not None:
+                self.cena.destacar()
+                self.cena.restaurar_vista()
             self.resultado_texto.config(state=tk.NORMAL)
             self.resultado_texto.delete(1.0, tk.END)
             self.resultado_texto.insert(tk.END, "🎨 Estado inicial carregado!\n\n")
@@ -609,8 +932,9 @@ class AplicacaoLLM:
         self.similaridade_texto.insert(tk.END, "🎯 Desenvolvido pelo GIIA\nEscritório de Inovação - MPPA", 'info')
         self.similaridade_texto.config(state=tk.DISABLED)
     
-    def _exibir_similaridades(self, palavra_busca):
-        similaridades = calcular_similaridades_palavra(palavra_busca)
+    def _exibir_similaridades(self, palavra_busca, similaridades=None):
+        if similaridades is None:
+            similaridades = calcular_similaridades_proximas(palavra_busca, k=4)
         
         self.similaridade_texto.config(state=tk.NORMAL)
         self.similaridade_texto.delete(1.0, tk.END)
@@ -645,28 +969,85 @@ class AplicacaoLLM:
             messagebox.showwarning("Atenção", "Por favor, digite uma frase ou palavra válida (mínimo 2 caracteres).")
             return
         
+        # Um pedido novo substitui o que ainda estiver em andamento.
+        self.executor_analise.enviar(
+            lambda tarefa: preparar_analise(texto, tarefa),
+            self._aplicar_analise,
+            self._falha_analise,
+        )
+        self._mostrar_ocupado("⏳ Analisando...")
+        self._acompanhar_tarefas()
+    
+    def _aplicar_analise(self, analise):
         try:
-            criar_grafico_3d(self.ax, texto)
-            self.canvas.draw()
-            
-            grupo_identificado, scores = identificar_grupo(texto)
-            ambiguas = detectar_palavras_ambiguas(texto)
-            desconhecidas = detectar_palavras_desconhecidas(texto)
+            texto = analise["texto"]
+            if self.cena is not None:
+                self.cena.destacar(texto, analise["grupo"])
+            else:
+                self._destaque_pendente = (texto, analise["grupo"])
             
-            self._exibir_resultados(texto, grupo_identificado, scores, ambiguas, desconhecidas)
+            self._exibir_resultados(texto, analise["grupo"], analise["scores"],
+                                    analise["ambiguas"], analise["desconhecidas"])
             
-            palavras_tokenizadas = texto.split()
-            if palavras_tokenizadas:
-                primeira_palavra = palavras_tokenizadas[0].strip('.,!?;:')
-                self.palavra_atual = primeira_palavra
-                self._exibir_similaridades(primeira_palavra)
+            self.analise_atual = analise
+            self.palavra_atual = analise["primeira_palavra"]
+            if self.palavra_atual:
+                self._exibir_similaridades(self.palavra_atual, analise["similaridades"])
             else:
-                self.palavra_atual = ""
                 self._limpar_similaridades()
             
         except Exception as e:
-            messagebox.showerror("Erro ao Analisar Texto", 
-                                 f"Ocorreu um erro interno durante a análise:\n{str(e)}")
+            self._falha_analise(e)
+    
+    def _falha_analise(self, erro):
+        messagebox.showerror("Erro ao Analisar Texto", 
+                             f"Ocorreu um erro interno durante a análise:\n{str(erro)}")
+    
+    # --- Tarefas em segundo plano ---
+    
+    INTERVALO_TAREFAS_MS = 40
+    
+    def _acompanhar_tarefas(self):
+        """Repassa à thread do Tk os resultados da thread de fundo enquanto houver tarefas."""
+        if self._acompanhando_tarefas:
+            return
+        self._acompanhando_tarefas = True
+        self.root.after(self.INTERVALO_TAREFAS_MS, self._processar_tarefas)
+    
+    def _processar_tarefas(self):
+        for executor in self._executores:
+            executor.processar_resultados()
+        if not (self.executor_analise.ocupado or self.executor_exportacao.ocupado):
+            self._esconder_ocupado()
+        if any(executor.ocupado for executor in self._executores):
+            self.root.after(self.INTERVALO_TAREFAS_MS, self._processar_tarefas)
+        else:
+            self._acompanhando_tarefas = False
+    
+    def _mostrar_ocupado(self, mensagem, fracao=None):
+        """Sem ``fracao`` a barra fica em movimento contínuo; com ela (0 a 1) mostra o andamento."""
+        self.status_ocupado.config(text=mensagem)
+        if not self._ocupado_visivel:
+            self._ocupado_visivel = True
+            self.frame_ocupado.pack(fill=tk.X, pady=3)
+        if fracao is None:
+            if not self._barra_animada:
+                self._barra_animada = True
+                self.barra_ocupado.config(mode='indeterminate')
+                self.barra_ocupado.start(15)
+        else:
+            if self._barra_animada:
+                self._barra_animada = False
+                self.barra_ocupado.stop()
+            self.barra_ocupado.config(mode='determinate', value=fracao * 100)
+    
+    def _esconder_ocupado(self):
+        if self._ocupado_visivel:
+            self._ocupado_visivel = False
+            if self._barra_animada:
+                self._barra_animada = False
+                self.barra_ocupado.stop()
+            self.frame_ocupado.pack_forget()
     
     def _exibir_resultados(self, texto, grupo, scores, ambiguas, desconhecidas):
         self.resultado_texto.config(state=tk.NORMAL)
@@ -712,44 +1093,67 @@ class AplicacaoLLM:
         self.mostrar_inicial()
     
     def exportar_grafico(self):
+        if self.cena is None:
+            messagebox.showwarning("Atenção", "O gráfico ainda está sendo carregado.")
+            return
+        escolha = escolher_opcoes_exportacao(self.root, "Exportar Gráfico", FORMATOS_GRAFICO)
+        if escolha is None:
+            return
+        formato, dpi = FORMATOS_GRAFICO[escolha[0]]
         try:
             filepath = filedialog.asksaveasfilename(
-                defaultextension=".png", filetypes=[("PNG files", "*.png"), ("All files", "*.*")],
-                initialfile=f"grafico_semantico_MPPA_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+                defaultextension=f".{formato}", filetypes=[(f"{formato.upper()} files", f"*.{formato}"), ("All files", "*.*")],
+                initialfile=f"grafico_semantico_MPPA_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{formato}"
             )
-            if filepath:
-                self.fig.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white', edgecolor='none')
-                messagebox.showinfo("Sucesso", f"Gráfico exportado!\n{filepath}")
+            if not filepath:
+                return
+            # Só o estado da cena é copiado aqui; a figura é refeita e desenhada na thread de exportação.
+            estado = copiar_figura(self.cena)
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao exportar gráfico:\n{str(e)}")
+            return
+        self._enviar_exportacao(
+            lambda tarefa: exportar_figura(estado, filepath, formato, dpi, tarefa),
+            "Gráfico exportado!", "Erro ao exportar gráfico", f"⏳ Exportando {formato.upper()}...",
+        )
     
     def exportar_dados(self):
-        try:
-            if not self.palavra_atual:
-                messagebox.showwarning("Atenção", "Não há dados de similaridade para exportar!")
-                return
-            
-            filepath = filedialog.asksaveasfilename(
-                defaultextension=".json", filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-                initialfile=f"similaridades_MPPA_{self.palavra_atual}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            )
-            
-            if filepath:
-                similaridades = calcular_similaridades_palavra(self.palavra_atual)
-                dados_exportar = {
-                    'palavra_analisada': self.palavra_atual,
-                    'timestamp_exportacao': datetime.now().isoformat(),
-                    'instituicao': 'MPPA - GIIA',
-                    'similaridades': similaridades
-                }
-                
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(dados_exportar, f, ensure_ascii=False, indent=2)
-                
-                messagebox.showinfo("Sucesso", f"Dados exportados!\n{filepath}")
-        
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao exportar dados:\n{str(e)}")
+        if not self.palavra_atual:
+            messagebox.showwarning("Atenção", "Não há dados de similaridade para exportar!")
+            return
+        escolha = escolher_opcoes_exportacao(self.root, "Exportar Dados", FORMATOS_DADOS, (
+            ("completas", "Listas completas de similaridade (todas as palavras)", True),
+            ("pertinencia", "Incluir pertinência por grupo", False),
+        ))
+        if escolha is None:
+            return
+        nome_formato, opcoes = escolha
+        extensao = FORMATOS_DADOS[nome_formato]
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=extensao, filetypes=[(nome_formato, f"*{extensao}"), ("All files", "*.*")],
+            initialfile=f"similaridades_MPPA_{self.palavra_atual}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extensao}"
+        )
+        if not filepath:
+            return
+        palavra = self.palavra_atual
+        # Sem as listas completas, exporta as mais próximas já calculadas pela análise.
+        similaridades = None if opcoes["completas"] else self.analise_atual["similaridades"]
+        scores = self.analise_atual["scores"] if opcoes["pertinencia"] else None
+        self._enviar_exportacao(
+            lambda tarefa: exportar_similaridades(filepath, palavra, extensao, similaridades, scores, tarefa),
+            "Dados exportados!", "Erro ao exportar dados", "⏳ Exportando dados...",
+        )
+    
+    def _enviar_exportacao(self, funcao, sucesso, erro, mensagem):
+        """Roda ``funcao(tarefa)``, que retorna o caminho gravado, na thread de exportação."""
+        self.executor_exportacao.enviar(
+            funcao,
+            lambda caminho: messagebox.showinfo("Sucesso", f"{sucesso}\n{caminho}"),
+            lambda e: messagebox.showerror("Erro", f"{erro}:\n{str(e)}"),
+            lambda fracao, texto: self._mostrar_ocupado(texto, fracao),
+        )
+        self._mostrar_ocupado(mensagem, 0.0)
+        self._acompanhar_tarefas()
     
     def zoom_in(self):
         self.zoom_level *= 0.8
@@ -764,19 +1168,37 @@ class AplicacaoLLM:
         self.aplicar_zoom()
     
     def aplicar_zoom(self):
-        limite = self.default_limits * self.zoom_level
-        self.ax.set_xlim([-limite, limite])
-        self.ax.set_ylim([-limite, limite])
-        self.ax.set_zlim([-limite/4, limite/2])
-        self.canvas.draw()
+        if self.cena is not None:
+            self.cena.aplicar_limites(self.default_limits * self.zoom_level)
+
 
+PERFIL.registrar("módulo: imports e vocabulário", _INICIO_MODULO)
 
 # ==================== EXECUÇÃO ====================
 
-def main():
+def main(argv=None):
     """Função principal de execução."""
-    root = tk.Tk()
-    app = AplicacaoLLM(root)
+    parser = argparse.ArgumentParser(description="Muiraquitã - Simulador de LLM (aplicativo Tk).")
+    parser.add_argument("--profile-startup", nargs="?", const="", metavar="ARQUIVO",
+                        help="Mostra o tempo de cada fase da abertura (imports, janela e gráfico); "
+                             "com ARQUIVO, grava nele (JSON se terminar em .json).")
+    parser.add_argument("--fechar-apos-abrir", action="store_true",
+                        help="Fecha assim que o gráfico é desenhado (para medir a abertura).")
+    args = parser.parse_args(argv)
+    PERFIL.ativo = args.profile_startup is not None
+    PERFIL.destino = args.profile_startup or None
+    
+    with PERFIL.fase("janela: tk.Tk()"):
+        root = tk.Tk()
+    with PERFIL.fase("janela: widgets"):
+        app = AplicacaoLLM(root)
+    app.fechar_apos_abrir = args.fechar_apos_abrir
+    
+    def ao_exibir(evento):
+        if evento.widget is root:
+            PERFIL.marcar("janela: primeira exibição")
+            root.unbind("<Map>", id_exibicao)
+    id_exibicao = root.bind("<Map>", ao_exibir, add="+")
     
     # 4. AVISO CORRIGIDO: Removido o bloco try/except de wm_iconphoto que gerava avisos de tipagem
     # Deixando apenas a lógica de centralização.
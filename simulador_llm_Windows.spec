@@ -1,7 +1,7 @@
 # -*- mode: python ; coding: utf-8 -*-
 from PyInstaller.utils.hooks import collect_all
 
-datas = [('Mui.png', '.')]
+datas = [('Mui.png', '.'), ('simulador/vocabularios', 'simulador/vocabularios')]
 binaries = []
 hiddenimports = ['PIL', 'PIL._imagingtk', 'PIL._tkinter_finder', 'numpy', 'matplotlib', 'mpl_toolkits.mplot3d']
 tmp_ret = collect_all('matplotlib')
@@ -0,0 +1,88 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Perfil "rápido" do executável Windows: pasta (onedir) em vez de arquivo único,
+# sem extração para %TEMP% a cada abertura, bytecode com -OO e só o que o
+# aplicativo Tk usa. Gerar com 3_gerar_executavel_rapido.bat; comparar com o
+# perfil de arquivo único via "python -m simulador exe".
+import os
+
+# UPX é opcional (MUIRAQUITA_UPX=1): reduz a pasta, mas descompactar as DLLs
+# custa tempo em cada abertura e antivírus costumam desconfiar delas.
+usar_upx = os.environ.get('MUIRAQUITA_UPX') == '1'
+upx_exclude = [
+    'vcruntime140.dll', 'vcruntime140_1.dll', 'msvcp140.dll', 'ucrtbase.dll',
+    'python3.dll', 'python312.dll', 'tcl86t.dll', 'tk86t.dll', '_tkinter.pyd',
+]
+
+datas = [('Mui.png', '.'), ('simulador/vocabularios', 'simulador/vocabularios')]
+hiddenimports = [
+    'PIL._imagingtk', 'PIL._tkinter_finder',
+    # savefig escolhe o backend pela extensão em tempo de execução
+    'matplotlib.backends.backend_pdf', 'matplotlib.backends.backend_svg',
+]
+
+excludes = [
+    # dependências das versões Streamlit e do serviço HTTP
+    'streamlit', 'plotly', 'google', 'google.generativeai', 'dotenv', 'pandas', 'pyarrow',
+    'IPython', 'tornado', 'scipy',
+    'simulador.servidor', 'simulador.classificador', 'simulador.benchmark', 'simulador.nucleo',
+    # toolkits gráficos e backends do matplotlib que o aplicativo não usa
+    'PyQt5', 'PyQt6', 'PySide2', 'PySide6', 'wx', 'gi', 'cairo',
+    'matplotlib.backends.backend_qt', 'matplotlib.backends.backend_qt5', 'matplotlib.backends.backend_qtagg',
+    'matplotlib.backends.backend_qt5agg', 'matplotlib.backends.backend_qtcairo',
+    'matplotlib.backends.backend_qt5cairo', 'matplotlib.backends.qt_compat', 'matplotlib.backends.qt_editor',
+    'matplotlib.backends.backend_gtk3', 'matplotlib.backends.backend_gtk3agg',
+    'matplotlib.backends.backend_gtk3cairo', 'matplotlib.backends.backend_gtk4',
+    'matplotlib.backends.backend_gtk4agg', 'matplotlib.backends.backend_gtk4cairo',
+    'matplotlib.backends.backend_wx', 'matplotlib.backends.backend_wxagg', 'matplotlib.backends.backend_wxcairo',
+    'matplotlib.backends.backend_macosx', 'matplotlib.backends.backend_webagg',
+    'matplotlib.backends.backend_webagg_core', 'matplotlib.backends.backend_nbagg',
+    'matplotlib.backends.backend_cairo', 'matplotlib.backends.backend_tkcairo',
+    'matplotlib.backends.backend_pgf', 'matplotlib.backends.backend_template',
+]
+
+
+a = Analysis(
+    ['simulador_llm_Windows.py'],
+    pathex=[],
+    binaries=[],
+    datas=datas,
+    hiddenimports=hiddenimports,
+    hookspath=[],
+    hooksconfig={'matplotlib': {'backends': ['TkAgg', 'Agg']}},
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+    optimize=2,
+)
+# Os dados de exemplo do matplotlib (mpl-data/sample_data) não são usados.
+a.datas = [entrada for entrada in a.datas if 'sample_data' not in entrada[0].replace('\\', '/').split('/')]
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='simulador_llm_Windows_rapido',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=usar_upx,
+    upx_exclude=upx_exclude,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=['Mui.png'],
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=usar_upx,
+    upx_exclude=upx_exclude,
+    name='simulador_llm_Windows_rapido',
+)
@@ -5,127 +5,26 @@ MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
 
 import streamlit as st
 import numpy as np
-import unicodedata
-import json
-from typing import Dict, Set, List, Tuple
 import plotly.graph_objects as go
 
-# ==================== DADOS ====================
-
-GRUPOS = {
-    "Transportes": {
-        "carro", "avião", "ônibus", "bicicleta", "motocicleta", "trem", "veículo",
-        "barco", "navio", "metrô", "estrada", "aeroporto", "garagem", "rota",
-        "lavagem","combustível","posto de gasolina","gasolina","diesel","etanol","flex",
-        "transporte","locomover","tráfego","acidente","engarrafamento","congestionamento"
-    },
-    "Móveis": {
-        "cadeira", "mesa", "banco", "armário", "sofá", "cômoda", "cama",
-        "poltrona", "estante","lavagem","geladeira","fogão","micro-ondas","forno",
-        "máquina de lavar","ventilador","ar condicionado","televisão","TV",
-        "decoração", "residência", "apartamento", "escritório", "design",       
-    },
-    "Animais": {
-        "cachorro", "gato", "focinho", "rato", "leão", "tigre", "baleia",
-        "rabo", "crocodilo", "cavalo", "ferradura","mucura","onça","arara",
-        "jacaré","réptil","selva","pantanal","floresta","aquático","marinho",
-        "mamífero", "espécie", "fauna", "veterinário", "alimentar", "selvagem",    
-    },
-    "Financeiro": {
-        "banco", "moeda", "cédula", "caixa", "dinheiro", "investimento", "juros",
-        "pix", "boleto", "cartão", "cheque", "saldo", "crédito", "débito",
-        "depósito", "transferência", "poupança","saque", "extrato", "assalto",
-        "empréstimo","lavagem","dinheiro sujo","corrupção","suborno","propina"
-    }
-}
-
-COMMON_WORD = "banco"
-COMMON_WORD_GROUPS = ["Móveis", "Financeiro", "Transportes"]
-
-
-def _validar_grupos_comuns():
-    grupos_definidos = set(GRUPOS.keys())
-    faltantes = [nome for nome in COMMON_WORD_GROUPS if nome not in grupos_definidos]
-    if faltantes:
-        faltantes_fmt = ", ".join(sorted(faltantes))
-        raise ValueError(
-            f"COMMON_WORD_GROUPS contém grupos inexistentes: {faltantes_fmt}. "
-            "Verifique os nomes definidos em GRUPOS."
-        )
-
-
-_validar_grupos_comuns()
-
-
-CONTEXTO_GRUPOS = {
-    "Transportes": {
-        "viajar", "dirigir", "pilotar", "velocidade", "motor", "combustível", 
-        "passageiro", "estrada", "rua", "aeroporto", "garagem", "estacionar",
-        "partida", "chegada", "embarque", "desembarque", "trajeto", "rodovia",
-        "ponto", "embarcar", "porto", "metrô"
-    },
-    "Móveis": {
-        "sentar", "sentei", "sentou", "sentado", "sentada", "sentem", "casa", 
-        "sala", "quarto", "madeira", "decoração", "móvel", "conforto", "decorar", 
-        "ergonomia", "praça", "jardim", "parque", "acomodar", "descansar", "repousar",
-        "apoiar", "encostar", "interior", "decoração"
-    },
-    "Animais": {
-        "pet", "animal", "bicho", "selvagem", "doméstico", "natureza", "zoológico",
-        "veterinário", "pelo", "pata", "cauda", "mamífero", "espécie",
-        "fauna", "ração", "alimentar", "latir", "miar", "rugir", "jacaré",
-        "réptil", "selva", "pantanal", "floresta", "crocodilo", "aquático"
-    },
-    "Financeiro": {
-        "dinheiro", "pagar", "receber", "conta", "depósito", "saque", 
-        "transferência", "agência", "gerente", "aplicar", "investir", 
-        "economizar", "cartão", "cheque", "empréstimo", 
-        "financiamento", "juros", "taxa", "saldo", "crédito", "débito", "poupança", 
-        "correntista", "cofre", "financeiro", "bancário", "caixa eletrônico"
-    }
-}
-
-PALAVRAS_INFERENCIA = {
-    "Animais": [
-        "tartaruga", "cobra", "pássaro", "peixe", "elefante", "girafa",
-        "macaco", "urso", "lobo", "raposa", "coelho", "hamster", "papagaio",
-        "jacaré", "crocodilo", "cavalo", "lagarto", "onça", "sapo",
-        "hipopótamo", "panda", "golfinho", "falcão", "abutre","jabuti","jaboti",
-        "arara","mucura","réptil","anfíbio","aquático","marinho","selvagem",
-        "perema","catita","jiboia","serpente","surucucu","anaconda"
-    ],
-    "Transportes": [
-        "moto", "barco", "navio", "helicóptero", "metrô", "taxi",
-        "caminhão", "van", "scooter", "patinete", "skate", "uber",
-        "barca", "bicicletário", "teleférico", "bondinho", "aeronave"
-    ],
-    "Móveis": [
-        "estante", "escrivaninha", "poltrona", "banqueta", "criado-mudo",
-        "guarda-roupa", "buffet", "aparador", "rack", "prateleira",
-        "puff", "cômoda", "sapateira", "balcão", "cabideiro", "divã"
-    ],
-    "Financeiro": [
-        "pix", "boleto", "nota", "real", "dólar", "euro", "bitcoin",
-        "ação", "fundo", "renda", "lucro", "poupança", "cartão",
-        "investidor", "fintech", "depósito", "transferência", "remessa",
-        "depósito bancário", "tesouro", "derivativo", "swap", "portfólio",
-        "cidade", "prefeitura", "governo", "imposto", "tributo", "corrupção", "suborno", 
-        "Brasil",
-    ]
-}
-
-CORES_GRUPOS = {
-    "Transportes": "#FF4444",
-    "Móveis": "#4488FF", 
-    "Animais": "#44FF44",
-    "Financeiro": "#FFAA00"
-}
-
-PESOS = {
-    "contexto": 3.0,
-    "inferencia": 2.5,
-    "principal": 0.2
-}
+from simulador.cache import CacheLRU
+from simulador.layout import obter_layout
+
+# Nomes do núcleo usados aqui. Valores que o recarregamento substitui (como
+# COMMON_WORD) devem ser lidos como ``nucleo.NOME``, não importados.
+from simulador.nucleo import (
+    GRUPOS,
+    CORES_GRUPOS,
+    normalizar_texto,
+    obter_indice_vocabulario,
+    verificar_vocabulario,
+    grupos_alterados_desde,
+    chave_vocabulario,
+    buscar_similares,
+    detectar_palavras_ambiguas,
+    identificar_grupo,
+    detectar_palavras_desconhecidas,
+)
 
 SESSION_STATE_DEFAULTS = {
     "texto_entrada": "",
@@ -134,8 +33,9 @@ SESSION_STATE_DEFAULTS = {
     "palavra_atual": "",
     "scores": {},
     "grupo_identificado": None,
-    "_reset_requested": False,
-    "force_rerun": False
+    "_analise_atualizada": False,
+    "_aviso_texto_vazio": False,
+    "_versao_analise": None
 }
 
 INFO_GRAFICO_3D = """
@@ -153,253 +53,84 @@ INFO_GRAFICO_3D = """
 - ❓ amarelo: texto sem contexto claro
 """
 
-# ==================== FUNÇÕES ====================
-
-def normalizar_texto(texto):
-    if not isinstance(texto, str):
-        return ""
-    texto_nfd = unicodedata.normalize('NFD', texto)
-    texto_sem_acento = ''.join(char for char in texto_nfd if unicodedata.category(char) != 'Mn')
-    return texto_sem_acento.lower().strip()
-
-def sincronizar_palavra_comum():
-    palavra_norm = normalizar_texto(COMMON_WORD)
-    for nome, palavras in list(GRUPOS.items()):
-        if not isinstance(palavras, set):
-            GRUPOS[nome] = set(palavras)
-
-    for nome in COMMON_WORD_GROUPS:
-        if nome in GRUPOS:
-            if COMMON_WORD not in GRUPOS[nome]:
-                GRUPOS[nome].add(COMMON_WORD)
-
-    for nome, palavras in list(GRUPOS.items()):
-        if nome not in COMMON_WORD_GROUPS:
-            GRUPOS[nome] = {p for p in palavras if normalizar_texto(p) != palavra_norm}
-
-sincronizar_palavra_comum()
-
-def obter_palavras_compartilhadas(grupos: Dict[str, Set[str]]) -> List[Tuple[str, List[str]]]:
-    ocorrencias: Dict[str, Set[str]] = {}
-    representantes: Dict[str, str] = {}
-
-    for nome_grupo, palavras in grupos.items():
-        for palavra in palavras:
-            chave = normalizar_texto(palavra)
-            if not chave:
-                continue
-            ocorrencias.setdefault(chave, set()).add(nome_grupo)
-            representantes.setdefault(chave, palavra)
-
-    compartilhadas: List[Tuple[str, List[str]]] = []
-    for chave, nomes in ocorrencias.items():
-        if len(nomes) > 1:
-            compartilhadas.append((representantes.get(chave, chave), sorted(nomes)))
-
-    compartilhadas.sort(key=lambda item: (item[0].lower(), item[1]))
-    return compartilhadas
-
-def calcular_similaridade_levenshtein(palavra1, palavra2):
-    if palavra1 == palavra2:
-        return 1.0
-    len1, len2 = len(palavra1), len(palavra2)
-    if len1 == 0 or len2 == 0:
-        return 0.0
-
-    matriz = [[0] * (len2 + 1) for _ in range(len1 + 1)]
-    for i in range(len1 + 1):
-        matriz[i][0] = i
-    for j in range(len2 + 1):
-        matriz[0][j] = j
-
-    for i in range(1, len1 + 1):
-        for j in range(1, len2 + 1):
-            custo = 0 if palavra1[i-1] == palavra2[j-1] else 1
-            matriz[i][j] = min(
-                matriz[i-1][j] + 1,
-                matriz[i][j-1] + 1,
-                matriz[i-1][j-1] + custo
-            )
+CACHE_FIGURAS = CacheLRU(capacidade=8)
+# Partes da última base de cada gráfico, reaproveitadas quando o vocabulário é recarregado.
+_PARTES_RECENTES = {}
 
-    distancia = matriz[len1][len2]
-    similaridade = 1 - (distancia / max(len1, len2))
-    return max(0.0, similaridade)
-
-def calcular_similaridade_caracteres(palavra1, palavra2):
-    if palavra1 == palavra2:
-        return 1.0
-    set1, set2 = set(palavra1.lower()), set(palavra2.lower())
-    if not set1 or not set2:
-        return 0.0
-    intersecao = len(set1.intersection(set2))
-    uniao = len(set1.union(set2))
-    return intersecao / uniao if uniao > 0 else 0.0
-
-def calcular_similaridade_composta(palavra_busca, palavra_comparacao):
-    palavra_busca = normalizar_texto(palavra_busca)
-    palavra_comparacao = normalizar_texto(palavra_comparacao)
-
-    if palavra_busca == palavra_comparacao:
-        return 100.0
-
-    sim_levenshtein = calcular_similaridade_levenshtein(palavra_busca, palavra_comparacao)
-    sim_caracteres = calcular_similaridade_caracteres(palavra_busca, palavra_comparacao)
-    bonus_substring = 0.2 if palavra_busca in palavra_comparacao or palavra_comparacao in palavra_busca else 0.0
-
-    similaridade_final = (sim_levenshtein * 0.6 + sim_caracteres * 0.4 + bonus_substring) * 100
-    return min(100.0, similaridade_final)
-
-def _buscar_grupos_por_palavra(palavra):
-    palavra_normalizada = normalizar_texto(palavra)
-    if not palavra_normalizada:
-        return set()
-
-    grupos_encontrados = set()
-    for nome_grupo, palavras_grupo in GRUPOS.items():
-        palavras_normalizadas = {normalizar_texto(p) for p in palavras_grupo}
-        if palavra_normalizada in palavras_normalizadas:
-            grupos_encontrados.add(nome_grupo)
-
-    return grupos_encontrados
-
-def calcular_similaridades_palavra(palavra_busca, grupo_contexto=None):
-    if not palavra_busca or len(palavra_busca.strip()) < 2:
-        return {}
 
-    palavra_busca = palavra_busca.strip()
-    palavra_busca_norm = normalizar_texto(palavra_busca)
-    grupos_palavra = _buscar_grupos_por_palavra(palavra_busca_norm)
-    similaridades = {}
-
-    for nome_grupo, palavras_grupo in GRUPOS.items():
-        similaridades[nome_grupo] = []
-        for palavra in sorted(palavras_grupo):
-            similaridade_base = calcular_similaridade_composta(palavra_busca, palavra)
-            palavra_norm = normalizar_texto(palavra)
-
-            if palavra_norm == palavra_busca_norm:
-                similaridade_final = 100.0
-            else:
-                bonus = 0.0
-
-                if grupos_palavra:
-                    if nome_grupo in grupos_palavra:
-                        bonus += 35.0
-                    else:
-                        bonus -= 5.0
-
-                if grupo_contexto:
-                    if nome_grupo == grupo_contexto:
-                        bonus += 15.0
-                    else:
-                        bonus -= 5.0
-
-                similaridade_final = max(0.0, min(100.0, similaridade_base + bonus))
-
-            similaridades[nome_grupo].append({
-                'palavra': palavra,
-                'similaridade': similaridade_final
-            })
-        similaridades[nome_grupo].sort(key=lambda x: x['similaridade'], reverse=True)
-
-    return similaridades
-
-def detectar_palavras_ambiguas(texto):
-    texto_normalizado = normalizar_texto(texto)
-    palavras = texto_normalizado.split()
-    ambiguas = []
-
-    for palavra in palavras:
-        palavra_limpa = palavra.strip('.,!?;:')
-        grupos_encontrados = []
-        for nome_grupo, palavras_grupo in GRUPOS.items():
-            palavras_normalizadas = {normalizar_texto(p) for p in palavras_grupo}
-            if palavra_limpa in palavras_normalizadas:
-                grupos_encontrados.append(nome_grupo)
-        if len(grupos_encontrados) > 1:
-            ambiguas.append((palavra_limpa, grupos_encontrados))
-
-    return ambiguas
-
-def analisar_contexto(texto_completo, pesos=None):
-    if not isinstance(texto_completo, str) or not texto_completo.strip():
-        return {nome: 0.0 for nome in GRUPOS.keys()}
-
-    if pesos is None:
-        pesos = PESOS
-
-    texto_normalizado = normalizar_texto(texto_completo)
-    scores_contexto = {nome: 0.0 for nome in GRUPOS.keys()}
-
-    for nome_grupo, palavras_contexto in CONTEXTO_GRUPOS.items():
-        for palavra_ctx in palavras_contexto:
-            palavra_norm = normalizar_texto(palavra_ctx)
-            if palavra_norm in texto_normalizado:
-                scores_contexto[nome_grupo] += pesos["contexto"]
-
-    for nome_grupo, palavras_grupo in GRUPOS.items():
-        for palavra_principal in palavras_grupo:
-            palavra_norm = normalizar_texto(palavra_principal)
-            if f" {palavra_norm} " in f" {texto_normalizado} " or                texto_normalizado.startswith(palavra_norm + " ") or                texto_normalizado.endswith(" " + palavra_norm):
-                scores_contexto[nome_grupo] += pesos["principal"]
-
-    for nome_grupo, palavras_relacionadas in PALAVRAS_INFERENCIA.items():
-        for palavra_rel in palavras_relacionadas:
-            palavra_norm = normalizar_texto(palavra_rel)
-            if palavra_norm in texto_normalizado:
-                scores_contexto[nome_grupo] += pesos["inferencia"]
-
-    total = sum(scores_contexto.values())
-    if total > 0:
-        scores_contexto = {k: v/total for k, v in scores_contexto.items()}
-
-    return scores_contexto
-
-def identificar_grupo(texto):
-    scores = analisar_contexto(texto)
-    if not scores or all(v == 0 for v in scores.values()):
-        return None, scores
-    grupo_principal = max(scores.items(), key=lambda x: x[1])
-    max_score = grupo_principal[1]
-    grupos_top = []
-    for nome, valor in scores.items():
-        if valor > 0 and abs(valor - max_score) < 1e-6:
-            grupos_top.append(nome)
-    if len(grupos_top) == 1 and max_score > 0.1:
-        return grupo_principal[0], scores
-    return None, scores
-
-def detectar_palavras_desconhecidas(texto):
-    texto_normalizado = normalizar_texto(texto)
-    palavras = texto_normalizado.split()
-    todas_conhecidas = set()
-
-    for palavras_grupo in GRUPOS.values():
-        todas_conhecidas.update(normalizar_texto(p) for p in palavras_grupo)
-    for palavras_ctx in CONTEXTO_GRUPOS.values():
-        todas_conhecidas.update(normalizar_texto(p) for p in palavras_ctx)
-    for palavras_inf in PALAVRAS_INFERENCIA.values():
-        todas_conhecidas.update(normalizar_texto(p) for p in palavras_inf)
-
-    desconhecidas = []
-    for palavra in palavras:
-        palavra_limpa = palavra.strip('.,!?;:')
-        if len(palavra_limpa) > 2 and palavra_limpa not in todas_conhecidas:
-            desconhecidas.append(palavra_limpa)
-
-    return desconhecidas
+def obter_figura_base(nome, construir):
+    """Clona a parte estática de um gráfico, construída uma vez por versão do vocabulário.
+
+    ``construir(anterior)`` retorna ``(figura, extras, partes)``; ``extras`` guarda
+    o que a camada da consulta precisa (coordenadas, rótulos) e não deve ser
+    alterado, e ``partes`` (por grupo) volta em ``anterior`` junto com os grupos
+    alterados quando o vocabulário é recarregado, para refazer só esses grupos.
+    """
+    hash_conteudo = chave_vocabulario()[0]
+    cores = tuple(sorted(CORES_GRUPOS.items()))
+
+    def construir_base():
+        anterior = None
+        recente = _PARTES_RECENTES.get(nome)
+        if recente is not None and recente[1] == cores:
+            alterados = grupos_alterados_desde(recente[0])
+            if alterados is not None:
+                anterior = (recente[2], alterados)
+        return construir(anterior)
+
+    base, extras, partes = CACHE_FIGURAS.obter_ou_calcular((nome, hash_conteudo, cores), construir_base)
+    _PARTES_RECENTES[nome] = (hash_conteudo, cores, partes)
+    # A base foi validada ao ser construída; copiar sem validar custa uma fração disso.
+    return go.Figure(base, _validate=False), extras
+
+
+def partes_reaproveitaveis(anterior):
+    """Partes da base anterior que continuam valendo: ``{grupo: parte}`` sem os grupos alterados."""
+    if anterior is None:
+        return {}
+    partes, alterados = anterior
+    return {nome: parte for nome, parte in partes.items() if nome not in alterados}
+
+
+def _parte_grupo_3d(nome_grupo, layout, pertinencia):
+    """Trace (JSON) das palavras exclusivas do grupo e os pontos que vão para a trace das compartilhadas."""
+    palavras_lista = layout.palavras[nome_grupo]
+    compartilhadas = {"x": [], "y": [], "z": [], "text": [], "hovertext": []}
+    if not palavras_lista:
+        return None, compartilhadas
+    cor = CORES_GRUPOS[nome_grupo]
+
+    xs, ys, zs = layout.posicoes[nome_grupo].T
+    eh_compartilhada = np.array([pertinencia.compartilhada(palavra) for palavra in palavras_lista], dtype=bool)
+    hover = [f"{palavra}<br>{', '.join(pertinencia.grupos(palavra))}" for palavra in palavras_lista]
+
+    for j in np.flatnonzero(eh_compartilhada):
+        compartilhadas["x"].append(xs[j])
+        compartilhadas["y"].append(ys[j])
+        compartilhadas["z"].append(zs[j])
+        compartilhadas["text"].append(palavras_lista[j])
+        compartilhadas["hovertext"].append(hover[j])
+
+    exclusivas = np.flatnonzero(~eh_compartilhada)
+    trace = go.Scatter3d(
+        x=xs[exclusivas], y=ys[exclusivas], z=zs[exclusivas],
+        mode='markers+text',
+        marker=dict(size=np.full(len(exclusivas), 9), color=[cor] * len(exclusivas), opacity=0.8,
+                    symbol='circle', line=dict(width=1, color='black')),
+        text=[palavras_lista[j] for j in exclusivas],
+        hovertext=[hover[j] for j in exclusivas],
+        hovertemplate='%{hovertext}<extra></extra>',
+        textposition='top center',
+        textfont=dict(size=10, color=cor),
+        name=nome_grupo,
+        showlegend=False
+    )
+    return trace.to_plotly_json(), compartilhadas
 
-def criar_grafico_3d_plotly(texto_busca=""):
-    nomes_grupos = list(GRUPOS.keys())
-    n_grupos = len(nomes_grupos)
-    angulos_grupos = np.linspace(0, 2*np.pi, n_grupos, endpoint=False)
-    raio_grupos = 5.0
 
-    coords_grupos = {}
-    for i, nome_grupo in enumerate(nomes_grupos):
-        x = raio_grupos * np.cos(angulos_grupos[i])
-        y = raio_grupos * np.sin(angulos_grupos[i])
-        coords_grupos[nome_grupo] = (x, y, 0)
+def _construir_base_3d(anterior=None):
+    layout = obter_layout(GRUPOS, raio_grupos=5.0, raio_interno=0.8, escala_z=0.3)
+    coords_grupos = {nome: tuple(centro) for nome, centro in layout.centros.items()}
 
     fig = go.Figure()
 
@@ -416,45 +147,71 @@ def criar_grafico_3d_plotly(texto_busca=""):
             showlegend=False
         ))
 
-    for nome_grupo, palavras_grupo in GRUPOS.items():
-        centro_x, centro_y, centro_z = coords_grupos[nome_grupo]
-        palavras_lista = sorted(palavras_grupo)
-        n_palavras = len(palavras_lista)
-        raio_interno = 0.8
-        cor = CORES_GRUPOS[nome_grupo]
-
-        for j, palavra in enumerate(palavras_lista):
-            angulo = 2 * np.pi * j / n_palavras
-            x = centro_x + raio_interno * np.cos(angulo)
-            y = centro_y + raio_interno * np.sin(angulo)
-            z = np.random.randn() * 0.3
-
-            grupos_da_palavra = [ng for ng, pg in GRUPOS.items() if palavra in pg]
-
-            if len(grupos_da_palavra) > 1:
-                cor_marker = "#FFFFFF"
-                simbolo = 'circle'
-                tamanho = 10
-                cor_borda = 'black'
-                cor_texto = "#FFFFFF"
-            else:
-                cor_marker = cor
-                simbolo = 'circle'
-                tamanho = 9
-                cor_borda = 'black'
-                cor_texto = cor
+    pertinencia = obter_indice_vocabulario().pertinencia
+
+    # Uma trace por grupo e uma para as compartilhadas: o custo do WebGL não cresce com o vocabulário.
+    # Numa recarga do vocabulário só os grupos alterados são refeitos.
+    partes = partes_reaproveitaveis(anterior)
+    compartilhadas = {"x": [], "y": [], "z": [], "text": [], "hovertext": []}
+    traces_palavras = []
+    for nome_grupo in GRUPOS:
+        if nome_grupo not in partes:
+            partes[nome_grupo] = _parte_grupo_3d(nome_grupo, layout, pertinencia)
+        trace, pontos = partes[nome_grupo]
+        if trace is not None:
+            traces_palavras.append(trace)
+        for campo, valores in pontos.items():
+            compartilhadas[campo].extend(valores)
+
+    traces_compartilhadas = []
+    if compartilhadas["text"]:
+        total = len(compartilhadas["text"])
+        traces_compartilhadas.append(go.Scatter3d(
+            x=compartilhadas["x"], y=compartilhadas["y"], z=compartilhadas["z"],
+            mode='markers+text',
+            marker=dict(size=np.full(total, 10), color=["#FFFFFF"] * total, opacity=0.8,
+                        symbol='circle', line=dict(width=1, color='black')),
+            text=compartilhadas["text"],
+            hovertext=compartilhadas["hovertext"],
+            hovertemplate='%{hovertext}<extra></extra>',
+            textposition='top center',
+            textfont=dict(size=10, color="#FFFFFF"),
+            name='Palavras compartilhadas',
+            showlegend=False
+        ).to_plotly_json())
 
-            fig.add_trace(go.Scatter3d(
-                x=[x], y=[y], z=[z],
-                mode='markers+text',
-                marker=dict(size=tamanho, color=cor_marker, opacity=0.8,
-                           symbol=simbolo, line=dict(width=1, color=cor_borda)),
-                text=palavra,
-                textposition='top center',
-                textfont=dict(size=10, color=cor_texto),
-                name=palavra,
-                showlegend=False
-            ))
+    grupos_lista = ', '.join(GRUPOS.keys())
+    fig.update_layout(
+        title=dict(text=f'Grupos Semânticos: {grupos_lista}', font=dict(color='white', size=16)),
+        scene=dict(
+            xaxis_title='X',
+            yaxis_title='Y', 
+            zaxis_title='Z',
+            camera=dict(eye=dict(x=1.2, y=1.2, z=0.8)),
+            bgcolor='black',
+            xaxis=dict(gridcolor='gray', color='white', range=[-8, 8]),
+            yaxis=dict(gridcolor='gray', color='white', range=[-8, 8]),
+            zaxis=dict(gridcolor='gray', color='white', range=[-2, 4])
+        ),
+        height=700,
+        autosize=True,
+        margin=dict(l=0, r=0, b=0, t=25),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='black',
+        font=dict(color='white')
+    )
+
+    # As traces das palavras já foram validadas ao serem criadas: monta a figura sem validar de novo.
+    fig = go.Figure(
+        {"data": list(fig.to_plotly_json()["data"]) + traces_palavras + traces_compartilhadas,
+         "layout": fig.layout.to_plotly_json()},
+        _validate=False
+    )
+    return fig, coords_grupos, partes
+
+
+def criar_grafico_3d_plotly(texto_busca=""):
+    fig, coords_grupos = obter_figura_base("3d", _construir_base_3d)
 
     if texto_busca:
         grupo_identificado, scores = identificar_grupo(texto_busca)
@@ -462,7 +219,6 @@ def criar_grafico_3d_plotly(texto_busca=""):
         if grupo_identificado:
             centro_x, centro_y, centro_z = coords_grupos[grupo_identificado]
             coord_busca = (centro_x, centro_y, 1.5)
-            cor_destaque = CORES_GRUPOS[grupo_identificado]
 
             vetor = np.array([
                 centro_x - coord_busca[0],
@@ -524,32 +280,48 @@ def criar_grafico_3d_plotly(texto_busca=""):
                 showlegend=False
             ))
 
-    grupos_lista = ', '.join(GRUPOS.keys())
-    titulo = f'Grupos Semânticos: {grupos_lista}'
-    if texto_busca:
-        titulo += f'\nEntrada: "{texto_busca[:50]}"'
+        titulo = f'{fig.layout.title.text}\nEntrada: "{texto_busca[:50]}"'
+        fig.update_layout(title_text=titulo)
 
-    fig.update_layout(
-        title=dict(text=titulo, font=dict(color='white', size=16)),
-        scene=dict(
-            xaxis_title='X',
-            yaxis_title='Y', 
-            zaxis_title='Z',
-            camera=dict(eye=dict(x=1.2, y=1.2, z=0.8)),
-            bgcolor='black',
-            xaxis=dict(gridcolor='gray', color='white', range=[-8, 8]),
-            yaxis=dict(gridcolor='gray', color='white', range=[-8, 8]),
-            zaxis=dict(gridcolor='gray', color='white', range=[-2, 4])
-        ),
-        height=700,
-        autosize=True,
-        margin=dict(l=0, r=0, b=0, t=25),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='black',
-        font=dict(color='white')
+    return fig
+
+LIMITE_PAINEL_SIMILARIDADES = 35.0
+CACHE_PAINEL_SIMILARIDADES = CacheLRU(capacidade=256)
+
+
+def itens_painel_similaridades(palavra_atual, grupo_foco):
+    """Itens e aviso do painel 🔍 Similaridades, memorizados entre reruns.
+
+    A chave é (palavra normalizada, grupo em foco, versão do vocabulário), então
+    reruns causados por outros widgets só refazem a formatação.
+    """
+    chave = (normalizar_texto(palavra_atual), grupo_foco, chave_vocabulario())
+    return CACHE_PAINEL_SIMILARIDADES.obter_ou_calcular(
+        chave, lambda: _calcular_itens_painel(palavra_atual, grupo_foco)
     )
 
-    return fig
+
+def _calcular_itens_painel(palavra_atual, grupo_foco):
+    limite = LIMITE_PAINEL_SIMILARIDADES
+    similares_filtrados = [
+        item for item in buscar_similares(palavra_atual, k=20, grupo=grupo_foco, grupo_contexto=grupo_foco)
+        if item["similaridade"] >= limite
+    ]
+    if grupo_foco and len(similares_filtrados) <= 1:
+        similares_filtrados = buscar_similares(
+            palavra_atual, k=5, grupo=grupo_foco, grupo_contexto=grupo_foco
+        )
+
+    aviso = None
+    if not similares_filtrados:
+        similares_filtrados = buscar_similares(palavra_atual, k=20, grupo_contexto=grupo_foco)
+        if similares_filtrados:
+            aviso = (
+                f"Sem similaridades acima de {limite:.0f}% "
+                f"para o grupo detectado ({grupo_foco if grupo_foco else 'n/d'}). "
+                "Listando os resultados mais próximos, independentemente do grupo."
+            )
+    return tuple(similares_filtrados[:20]), aviso
 
 # ==================== INTERFACE ====================
 
@@ -564,6 +336,80 @@ def resetar_estado():
         st.session_state[chave] = valor.copy() if isinstance(valor, dict) else valor
 
 
+def analisar_texto_entrada():
+    """Callback do botão Analisar: roda antes do script, então um clique gera uma única execução."""
+    texto_analisar = st.session_state.texto_entrada.strip()
+    if not texto_analisar:
+        st.session_state._aviso_texto_vazio = True
+        return
+    registrar_analise(texto_analisar)
+    st.session_state._analise_atualizada = True
+
+
+def registrar_analise(texto_analisar):
+    """Calcula a análise de ``texto_analisar`` e guarda o resultado na sessão."""
+    grupo_identificado, scores = identificar_grupo(texto_analisar)
+    ambiguas = detectar_palavras_ambiguas(texto_analisar)
+    desconhecidas = sorted(set(detectar_palavras_desconhecidas(texto_analisar)))
+
+    st.session_state.palavra_atual = (
+        texto_analisar.split()[0].strip('.,!?;:')
+        if texto_analisar else ""
+    )
+
+    resultado = []
+    if ambiguas:
+        resultado.append("🔀 **PALAVRAS AMBÍGUAS:**")
+        for palavra_amb, grupos_amb in ambiguas:
+            resultado.append(f"  • '{palavra_amb}' pertence a: {', '.join(grupos_amb)}")
+        resultado.append("")
+
+    if desconhecidas:
+        resultado.append("❓ **PALAVRAS DESCONHECIDAS:**")
+        resultado.append(f"  {', '.join(desconhecidas)}")
+        resultado.append("")
+
+    if grupo_identificado:
+        resultado.append(f"✅ **GRUPO:** {grupo_identificado}")
+        resultado.append(f"   Confiança: {scores[grupo_identificado]*100:.1f}%")
+        resultado.append("")
+    else:
+        resultado.append("⚠️ **SEM CONTEXTO**")
+        resultado.append("")
+
+    resultado.append("🎯 **Pertinência por grupo:**")
+    for nome, valor in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+        resultado.append(f"   - {nome}: {valor*100:.1f}%")
+
+    st.session_state.resultado_analise = "\n".join(resultado).strip()
+    st.session_state.scores = dict(scores)
+    st.session_state.texto_analisado = texto_analisar
+    st.session_state.grupo_identificado = grupo_identificado
+    st.session_state._versao_analise = chave_vocabulario()
+
+
+def acompanhar_vocabulario():
+    """Aplica edições no arquivo do vocabulário sem reiniciar o servidor.
+
+    A recarga é incremental e vale para todas as sessões; cada sessão refaz a
+    própria análise na versão nova e mantém o restante do estado.
+    """
+    try:
+        resumo = verificar_vocabulario()
+    except ValueError as erro:
+        st.warning(f"O vocabulário editado não foi aplicado: {erro}")
+        resumo = None
+    if resumo:
+        adicionados = sum(len(a) for por_grupo in resumo["alteracoes"].values() for a, _ in por_grupo.values())
+        removidos = sum(len(r) for por_grupo in resumo["alteracoes"].values() for _, r in por_grupo.values())
+        detalhe = "recarregado por completo" if resumo["completa"] else f"+{adicionados} / -{removidos} termos"
+        st.toast(f"Vocabulário atualizado ({detalhe}).")
+
+    texto = st.session_state.texto_analisado
+    if texto and st.session_state._versao_analise != chave_vocabulario():
+        registrar_analise(texto)
+
+
 def executar_interface(
     criar_grafico_func,
     info_grafico_texto,
@@ -578,11 +424,10 @@ def executar_interface(
     )
 
     inicializar_estado()
-    if st.session_state.force_rerun:
+    acompanhar_vocabulario()
+    if st.session_state._analise_atualizada:
         st.success("Análise atualizada com os últimos resultados.")
-        st.session_state.force_rerun = False
-    if st.session_state._reset_requested:
-        resetar_estado()
+        st.session_state._analise_atualizada = False
 
     st.title(titulo_cabecalho)
     st.markdown("**MPPA - CIIA | Escritório de Inovação e Inteligência Artificial**")
@@ -595,63 +440,18 @@ def executar_interface(
         key="texto_entrada"
     )
 
+    # Os botões agem por callback: o estado já está atualizado quando o script roda, sem st.rerun().
     col_btn1, col_btn2, col_btn3 = st.columns(3)
     with col_btn1:
-        analisar = st.button("🔍 Analisar", type="primary", use_container_width=True)
+        st.button("🔍 Analisar", type="primary", use_container_width=True, on_click=analisar_texto_entrada)
     with col_btn2:
-        limpar = st.button("🔄 Limpar", use_container_width=True)
+        st.button("🔄 Limpar", use_container_width=True, on_click=resetar_estado)
     with col_btn3:
-        inicial = st.button("🏠 Inicial", use_container_width=True)
-
-    if limpar or inicial:
-        st.session_state._reset_requested = True
-        st.rerun()
-
-    texto_analisar = st.session_state.texto_entrada.strip()
-
-    if analisar:
-        if not texto_analisar:
-            st.warning("Digite uma palavra ou frase para análise.")
-        else:
-            grupo_identificado, scores = identificar_grupo(texto_analisar)
-            ambiguas = detectar_palavras_ambiguas(texto_analisar)
-            desconhecidas = sorted(set(detectar_palavras_desconhecidas(texto_analisar)))
-
-            st.session_state.palavra_atual = (
-                texto_analisar.split()[0].strip('.,!?;:')
-                if texto_analisar else ""
-            )
+        st.button("🏠 Inicial", use_container_width=True, on_click=resetar_estado)
 
-            resultado = []
-            if ambiguas:
-                resultado.append("🔀 **PALAVRAS AMBÍGUAS:**")
-                for palavra_amb, grupos_amb in ambiguas:
-                    resultado.append(f"  • '{palavra_amb}' pertence a: {', '.join(grupos_amb)}")
-                resultado.append("")
-
-            if desconhecidas:
-                resultado.append("❓ **PALAVRAS DESCONHECIDAS:**")
-                resultado.append(f"  {', '.join(desconhecidas)}")
-                resultado.append("")
-
-            if grupo_identificado:
-                resultado.append(f"✅ **GRUPO:** {grupo_identificado}")
-                resultado.append(f"   Confiança: {scores[grupo_identificado]*100:.1f}%")
-                resultado.append("")
-            else:
-                resultado.append("⚠️ **SEM CONTEXTO**")
-                resultado.append("")
-
-            resultado.append("🎯 **Pertinência por grupo:**")
-            for nome, valor in sorted(scores.items(), key=lambda item: item[1], reverse=True):
-                resultado.append(f"   - {nome}: {valor*100:.1f}%")
-
-            st.session_state.resultado_analise = "\n".join(resultado).strip()
-            st.session_state.scores = dict(scores)
-            st.session_state.texto_analisado = texto_analisar
-            st.session_state.grupo_identificado = grupo_identificado
-            st.session_state.force_rerun = True
-            st.rerun()
+    if st.session_state._aviso_texto_vazio:
+        st.warning("Digite uma palavra ou frase para análise.")
+        st.session_state._aviso_texto_vazio = False
 
     st.subheader("🌐 Visualização 3D")
     fig = criar_grafico_func(st.session_state.texto_analisado)
@@ -720,70 +520,21 @@ def executar_interface(
     st.subheader("🔍 Similaridades")
     if st.session_state.palavra_atual:
         grupo_foco = st.session_state.get("grupo_identificado")
-        similaridades_por_grupo = calcular_similaridades_palavra(
-            st.session_state.palavra_atual,
-            grupo_contexto=grupo_foco
-        )
+        palavra_atual = st.session_state.palavra_atual
+        similares_filtrados, aviso = itens_painel_similaridades(palavra_atual, grupo_foco)
+        if aviso:
+            st.markdown(aviso)
 
-        todas_similaridades = []
-        for nome_grupo, itens in similaridades_por_grupo.items():
-            for item in itens:
-                todas_similaridades.append({
-                    "grupo": nome_grupo,
-                    "palavra": item["palavra"],
-                    "similaridade": item["similaridade"],
-                    "cor": CORES_GRUPOS.get(nome_grupo, "#FFFFFF")
-                })
-
-        if not todas_similaridades:
+        if not similares_filtrados:
             st.markdown("Nenhum resultado de similaridade para esta palavra.")
         else:
-            limite = 35.0
-            similares_filtrados = [
-                item for item in todas_similaridades
-                if item["similaridade"] >= limite
-            ]
-
-            if grupo_foco:
-                similares_filtrados = [
-                    item for item in similares_filtrados
-                    if item["grupo"] == grupo_foco
-                ]
-                if len(similares_filtrados) <= 1:
-                    candidatos_grupo = sorted(
-                        similaridades_por_grupo.get(grupo_foco, []),
-                        key=lambda x: x["similaridade"],
-                        reverse=True
-                    )[:5]
-                    similares_filtrados = [
-                        {
-                            "grupo": grupo_foco,
-                            "palavra": item["palavra"],
-                            "similaridade": item["similaridade"],
-                            "cor": CORES_GRUPOS.get(grupo_foco, "#FFFFFF")
-                        }
-                        for item in candidatos_grupo
-                    ]
-
-            if not similares_filtrados:
-                st.markdown(
-                    f"Sem similaridades acima de {limite:.0f}% "
-                    f"para o grupo detectado ({grupo_foco if grupo_foco else 'n/d'}). "
-                    "Listando os resultados mais próximos, independentemente do grupo."
-                )
-                similares_filtrados = sorted(
-                    todas_similaridades,
-                    key=lambda x: x["similaridade"],
-                    reverse=True
-                )[:20]
-
-            similares_filtrados.sort(key=lambda x: x["similaridade"], reverse=True)
-            st.markdown(f"🔍 **Similaridades globais para '{st.session_state.palavra_atual}'**")
+            st.markdown(f"🔍 **Similaridades globais para '{palavra_atual}'**")
             for item in similares_filtrados[:20]:
+                cor = CORES_GRUPOS.get(item["grupo"], "#FFFFFF")
                 st.markdown(
                     f"<span style='display:inline-flex; align-items:center;'>"
                     f"<span style='width:10px; height:10px; border-radius:50%; "
-                    f"background:{item['cor']}; display:inline-block; margin-right:8px;'></span>"
+                    f"background:{cor}; display:inline-block; margin-right:8px;'></span>"
                     f"{item['palavra']} &mdash; <em>{item['grupo']}</em> "
                     f"({item['similaridade']:.1f}%)"
                     f"</span>",
@@ -797,7 +548,7 @@ def executar_interface(
         with st.expander(f"{nome} ({len(palavras)} palavras)"):
             st.write(", ".join(sorted(palavras)))
 
-    palavras_compartilhadas = obter_palavras_compartilhadas(GRUPOS)
+    palavras_compartilhadas = obter_indice_vocabulario().pertinencia.compartilhadas()
     st.subheader("🔁 Palavras em mais de um grupo")
     if palavras_compartilhadas:
         for palavra, grupos_relacionados in palavras_compartilhadas:
@@ -6,12 +6,17 @@ MPPA - CIIA | Escritório de Inovação e Inteligência Artificial
 import numpy as np
 import plotly.graph_objects as go
 
+from simulador import nucleo
+from simulador.layout import obter_layout
+
 from simulador_streamlit import (
     GRUPOS,
     CORES_GRUPOS,
-    COMMON_WORD,
     normalizar_texto,
     identificar_grupo,
+    obter_indice_vocabulario,
+    obter_figura_base,
+    partes_reaproveitaveis,
     executar_interface
 )
 
@@ -27,8 +32,13 @@ INFO_GRAFICO_2D = """
 - Círculos brancos: palavras compartilhadas entre grupos
 - Seta branca: indica o grupo sugerido para o texto analisado
 - ❓ amarelo: texto sem contexto claro
+- Vocabulários grandes: só parte das palavras do grupo destacado tem rótulo; passe o mouse para ver as demais
 """
 
+# Acima deste total de palavras, só o grupo destacado ganha rótulos (e no máximo ROTULOS_GRUPO_DESTACADO).
+ROTULOS_COMPLETOS_ATE = 400
+ROTULOS_GRUPO_DESTACADO = 40
+
 
 def gerar_path_elipse(raio_x, raio_y, n_pontos=180):
     angulos = np.linspace(0, 2 * np.pi, n_pontos, endpoint=False)
@@ -36,18 +46,70 @@ def gerar_path_elipse(raio_x, raio_y, n_pontos=180):
     return "M " + " L ".join(pontos) + " Z"
 
 
-def criar_grafico_2d_plotly(texto_busca=""):
-    nomes_grupos = list(GRUPOS.keys())
-    n_grupos = len(nomes_grupos)
-    angulos_grupos = np.linspace(0, 2 * np.pi, n_grupos, endpoint=False)
+def _parte_grupo_2d(nome_grupo, layout, pertinencia, rotular_tudo, comum_norm):
+    """Trace (JSON) das palavras exclusivas, pontos compartilhados e rótulos de destaque do grupo."""
+    modo_palavras = 'markers+text' if rotular_tudo else 'markers'
+    compartilhadas = {"x": [], "y": [], "text": [], "hovertext": [], "size": []}
+    palavras_lista = layout.palavras[nome_grupo]
+    n_palavras = len(palavras_lista)
+    if n_palavras == 0:
+        return None, compartilhadas, None
+    cor_base = CORES_GRUPOS[nome_grupo]
+
+    xs, ys = layout.posicoes[nome_grupo][:, 0], layout.posicoes[nome_grupo][:, 1]
+    tamanhos = np.array([18 if normalizar_texto(p) == comum_norm else 14 for p in palavras_lista])
+    hover = [f"{palavra}<br>{', '.join(pertinencia.grupos(palavra))}" for palavra in palavras_lista]
+    rotulos = list(palavras_lista) if rotular_tudo else [""] * n_palavras
+    eh_compartilhada = np.array([pertinencia.compartilhada(palavra) for palavra in palavras_lista], dtype=bool)
+    for j in np.flatnonzero(eh_compartilhada):
+        compartilhadas["x"].append(xs[j])
+        compartilhadas["y"].append(ys[j])
+        compartilhadas["text"].append(rotulos[j])
+        compartilhadas["hovertext"].append(hover[j])
+        compartilhadas["size"].append(tamanhos[j])
+
+    rotulos_destaque = None
+    if not rotular_tudo:
+        # Nível de detalhe: rótulos só para algumas palavras, espaçadas ao redor do grupo destacado.
+        passo = -(-n_palavras // ROTULOS_GRUPO_DESTACADO)
+        selecionadas = np.arange(0, n_palavras, passo)
+        rotulos_destaque = (
+            xs[selecionadas],
+            ys[selecionadas],
+            [palavras_lista[j] for j in selecionadas],
+            ["#FFFFFF" if eh_compartilhada[j] else cor_base for j in selecionadas],
+        )
+
+    exclusivas = np.flatnonzero(~eh_compartilhada)
+    trace = go.Scattergl(
+        x=xs[exclusivas],
+        y=ys[exclusivas],
+        mode=modo_palavras,
+        marker=dict(
+            size=tamanhos[exclusivas],
+            color=cor_base,
+            opacity=0.9,
+            symbol='circle',
+            line=dict(width=1.5, color='black')
+        ),
+        text=[rotulos[j] for j in exclusivas],
+        hovertext=[hover[j] for j in exclusivas],
+        textposition='top center',
+        textfont=dict(size=13.2, color=cor_base),
+        name=nome_grupo,
+        hoverinfo='text',
+        showlegend=False
+    )
+    return trace.to_plotly_json(), compartilhadas, rotulos_destaque
+
+
+def _construir_base_2d(anterior=None):
     raio_grupos_x = 5.0
     raio_grupos_y = 3.6
-
-    coords_grupos = {}
-    for i, nome_grupo in enumerate(nomes_grupos):
-        x = raio_grupos_x * np.cos(angulos_grupos[i])
-        y = raio_grupos_y * np.sin(angulos_grupos[i])
-        coords_grupos[nome_grupo] = (x, y)
+    layout = obter_layout(GRUPOS, raio_grupos=raio_grupos_x, raio_grupos_y=raio_grupos_y,
+                          raio_interno=2.6, escala_z=0.0)
+    nomes_grupos = layout.nomes_grupos
+    coords_grupos = {nome: (centro[0], centro[1]) for nome, centro in layout.centros.items()}
 
     fig = go.Figure()
     fig.add_shape(
@@ -57,64 +119,116 @@ def criar_grafico_2d_plotly(texto_busca=""):
     )
 
     # Centros dos grupos
-    for nome_grupo, (x, y) in coords_grupos.items():
-        cor = CORES_GRUPOS[nome_grupo]
-        fig.add_trace(go.Scatter(
-            x=[x],
-            y=[y],
-            mode='text',
-            text=[nome_grupo],
+    fig.add_trace(go.Scatter(
+        x=[coords_grupos[nome][0] for nome in nomes_grupos],
+        y=[coords_grupos[nome][1] for nome in nomes_grupos],
+        mode='text',
+        text=nomes_grupos,
+        textposition='top center',
+        textfont=dict(size=24, color='white', family="Montserrat, sans-serif"),
+        name='Grupos',
+        hoverinfo='text'
+    ))
+
+    total_palavras = sum(len(palavras) for palavras in GRUPOS.values())
+    rotular_tudo = total_palavras <= ROTULOS_COMPLETOS_ATE
+    modo_palavras = 'markers+text' if rotular_tudo else 'markers'
+    comum_norm = normalizar_texto(nucleo.COMMON_WORD)
+    pertinencia = obter_indice_vocabulario().pertinencia
+
+    # Palavras dos grupos: uma trace WebGL por grupo e uma para as compartilhadas.
+    # Numa recarga do vocabulário só os grupos alterados são refeitos (se o modo dos rótulos não mudou).
+    partes = {
+        nome: parte for nome, parte in partes_reaproveitaveis(anterior).items()
+        if parte[0] is None or parte[0]["mode"] == modo_palavras
+    }
+    compartilhadas = {"x": [], "y": [], "text": [], "hovertext": [], "size": []}
+    traces_palavras = []
+    rotulos_destaque = {}
+    for nome_grupo in GRUPOS:
+        if nome_grupo not in partes:
+            partes[nome_grupo] = _parte_grupo_2d(nome_grupo, layout, pertinencia, rotular_tudo, comum_norm)
+        trace, pontos, rotulos = partes[nome_grupo]
+        if trace is not None:
+            traces_palavras.append(trace)
+        if rotulos is not None:
+            rotulos_destaque[nome_grupo] = rotulos
+        for campo, valores in pontos.items():
+            compartilhadas[campo].extend(valores)
+
+    traces_compartilhadas = []
+    if compartilhadas["x"]:
+        traces_compartilhadas.append(go.Scattergl(
+            x=compartilhadas["x"],
+            y=compartilhadas["y"],
+            mode=modo_palavras,
+            marker=dict(
+                size=compartilhadas["size"],
+                color="#FFFFFF",
+                opacity=0.9,
+                symbol='circle',
+                line=dict(width=1.5, color='black')
+            ),
+            text=compartilhadas["text"],
+            hovertext=compartilhadas["hovertext"],
             textposition='top center',
-            textfont=dict(size=24, color='white', family="Montserrat, sans-serif"),
-            name=nome_grupo,
-            hoverinfo='text'
-        ))
-
-    # Palavras dos grupos
-    for nome_grupo, palavras_grupo in GRUPOS.items():
-        centro_x, centro_y = coords_grupos[nome_grupo]
-        palavras_lista = sorted(palavras_grupo)
-        n_palavras = len(palavras_lista)
-        raio_interno = 2.6
-        cor_base = CORES_GRUPOS[nome_grupo]
-
-        for j, palavra in enumerate(palavras_lista):
-            angulo = 2 * np.pi * j / max(n_palavras, 1)
-            x = centro_x + raio_interno * np.cos(angulo)
-            y = centro_y + raio_interno * np.sin(angulo)
-
-            grupos_da_palavra = [ng for ng, pg in GRUPOS.items() if palavra in pg]
-            palavra_compartilhada = len(grupos_da_palavra) > 1
-            palavra_eh_comum = (
-                normalizar_texto(palavra) == normalizar_texto(COMMON_WORD)
-            )
+            textfont=dict(size=13.2, color="#FFFFFF"),
+            name='Palavras compartilhadas',
+            hoverinfo='text',
+            showlegend=False
+        ).to_plotly_json())
 
-            cor_marker = "#FFFFFF" if palavra_compartilhada else cor_base
-            cor_texto = "#FFFFFF" if palavra_compartilhada else cor_base
-            tamanho = 18 if palavra_eh_comum else 14
-
-            fig.add_trace(go.Scatter(
-                x=[x],
-                y=[y],
-                mode='markers+text',
-                marker=dict(
-                    size=tamanho,
-                    color=cor_marker,
-                    opacity=0.9,
-                    symbol='circle',
-                    line=dict(width=1.5, color='black')
-                ),
-                text=[palavra],
-                textposition='top center',
-                textfont=dict(size=13.2, color=cor_texto),
-                name=f"{nome_grupo} · {palavra}",
-                hoverinfo='text',
-                showlegend=False
-            ))
+    fig.update_layout(
+        height=700,
+        width=900,
+        margin=dict(l=10, r=10, t=20, b=10),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='#000000',
+        showlegend=False,
+        font=dict(color='white'),
+    )
+
+    fig.update_xaxes(
+        title="",
+        visible=False,
+        showgrid=False
+    )
+    fig.update_yaxes(
+        title="",
+        visible=False,
+        showgrid=False,
+        scaleanchor='x',
+        scaleratio=1
+    )
+
+    # As traces das palavras já foram validadas ao serem criadas: monta a figura sem validar de novo.
+    fig = go.Figure(
+        {"data": list(fig.to_plotly_json()["data"]) + traces_palavras + traces_compartilhadas,
+         "layout": fig.layout.to_plotly_json()},
+        _validate=False
+    )
+    return fig, (coords_grupos, rotulos_destaque), partes
+
+
+def criar_grafico_2d_plotly(texto_busca=""):
+    fig, (coords_grupos, rotulos) = obter_figura_base("2d", _construir_base_2d)
 
     # Destaque da busca
     if texto_busca:
         grupo_identificado, _ = identificar_grupo(texto_busca)
+        if grupo_identificado in rotulos:
+            xs, ys, palavras, cores = rotulos[grupo_identificado]
+            fig.add_trace(go.Scattergl(
+                x=xs,
+                y=ys,
+                mode='text',
+                text=palavras,
+                textposition='top center',
+                textfont=dict(size=13.2, color=cores),
+                name='Rótulos',
+                hoverinfo='skip',
+                showlegend=False
+            ))
         if grupo_identificado:
             centro_x, centro_y = coords_grupos[grupo_identificado]
             vetor = np.array([centro_x, centro_y], dtype=float)
@@ -160,29 +274,6 @@ def criar_grafico_2d_plotly(texto_busca=""):
                 align="center"
             )
 
-    fig.update_layout(
-        height=700,
-        width=900,
-        margin=dict(l=10, r=10, t=20, b=10),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='#000000',
-        showlegend=False,
-        font=dict(color='white'),
-    )
-
-    fig.update_xaxes(
-        title="",
-        visible=False,
-        showgrid=False
-    )
-    fig.update_yaxes(
-        title="",
-        visible=False,
-        showgrid=False,
-        scaleanchor='x',
-        scaleratio=1
-    )
-
     return fig
 
 
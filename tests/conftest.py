@@ -0,0 +1,21 @@
+import json
+
+import pytest
+
+from simulador import nucleo
+
+
+@pytest.fixture
+def vocabulario_temporario(tmp_path):
+    """Carrega no núcleo um vocabulário escrito em ``tmp_path``; o padrão volta no fim do teste."""
+    caminho = tmp_path / "vocabulario.json"
+
+    def carregar(dados):
+        caminho.write_text(json.dumps(dados, ensure_ascii=False), encoding="utf-8")
+        nucleo.carregar_vocabulario(caminho)
+        return caminho
+
+    yield carregar
+    nucleo.carregar_vocabulario(nucleo.CAMINHO_VOCABULARIO)
+    for cache in (nucleo.CACHE_ANALISES, nucleo.CACHE_SIMILARIDADES, nucleo.CACHE_TEXTOS):
+        cache.limpar()
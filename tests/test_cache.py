@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+
+from simulador import nucleo
+from simulador.cache import CacheLRU
+
+
+@pytest.fixture
+def vocabulario_restaurado():
+    yield
+    nucleo.carregar_vocabulario(nucleo.CAMINHO_VOCABULARIO)
+    nucleo.CACHE_ANALISES.limpar()
+    nucleo.CACHE_TEXTOS.limpar()
+
+
+def test_descarta_o_menos_usado_recentemente():
+    cache = CacheLRU(capacidade=3)
+    for chave in "abc":
+        cache.guardar(chave, chave.upper())
+    assert cache.obter("a") == "A"
+    cache.guardar("d", "D")
+    assert cache.obter("b") is None
+    assert [cache.obter(chave) for chave in "acd"] == ["A", "C", "D"]
+    cache.guardar("c", "C2")
+    cache.guardar("e", "E")
+    assert cache.obter("a") is None
+    assert len(cache) == 3
+    assert cache.estatisticas()["descartes"] == 2
+
+
+def test_capacidade_invalida():
+    with pytest.raises(ValueError):
+        CacheLRU(capacidade=0)
+
+
+def test_entrada_expira_depois_do_ttl():
+    cache = CacheLRU(capacidade=4, ttl=0.05)
+    cache.guardar("a", 1)
+    assert cache.obter("a") == 1
+    time.sleep(0.1)
+    assert cache.obter("a", "ausente") == "ausente"
+    assert len(cache) == 0
+    assert cache.obter_ou_calcular("a", lambda: 2) == 2
+    assert cache.obter("a") == 2
+
+
+def test_contadores_de_acertos_e_falhas():
+    cache = CacheLRU(capacidade=2)
+    calculos = []
+
+    def calcular(valor):
+        calculos.append(valor)
+        return valor * 10
+
+    assert cache.obter_ou_calcular(1, lambda: calcular(1)) == 10
+    assert cache.obter_ou_calcular(1, lambda: calcular(1)) == 10
+    assert cache.obter(2) is None
+    assert calculos == [1]
+    estatisticas = cache.estatisticas()
+    assert (estatisticas["acertos"], estatisticas["falhas"]) == (1, 2)
+    assert estatisticas["taxa_acerto"] == pytest.approx(1 / 3)
+    cache.limpar()
+    assert len(cache) == 0
+
+
+def test_uso_concorrente_mantem_capacidade_e_contagens():
+    cache = CacheLRU(capacidade=50)
+    chamadas_por_thread, threads = 2000, 8
+    erros = []
+
+    def trabalhar(semente):
+        try:
+            for i in range(chamadas_por_thread):
+                chave = (i * 7 + semente) % 120
+                assert cache.obter_ou_calcular(chave, lambda: chave * 2) == chave * 2
+                if i % 5 == 0:
+                    cache.guardar(-chave, chave)
+        except Exception as erro:  # noqa: BLE001 - repassado para a thread principal
+            erros.append(erro)
+
+    trabalhadores = [threading.Thread(target=trabalhar, args=(s,)) for s in range(threads)]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+
+    assert erros == []
+    estatisticas = cache.estatisticas()
+    assert estatisticas["tamanho"] == len(cache) <= 50
+    assert estatisticas["acertos"] + estatisticas["falhas"] == threads * chamadas_por_thread
+
+
+def test_analisar_contexto_usa_o_texto_normalizado(vocabulario_restaurado):
+    nucleo.CACHE_ANALISES.limpar()
+    resultado = nucleo.analisar_contexto("O gato comeu a ração")
+    antes = nucleo.CACHE_ANALISES.estatisticas()
+    assert nucleo.analisar_contexto("o GATO comeu a racao ") == resultado
+    depois = nucleo.CACHE_ANALISES.estatisticas()
+    assert depois["acertos"] == antes["acertos"] + 1
+    assert len(nucleo.CACHE_ANALISES) == 1
+
+
+def test_analisar_contexto_recalcula_quando_pesos_mudam(vocabulario_restaurado):
+    texto = "o gato comeu a ração no banco"
+    antes = nucleo.analisar_contexto(texto)
+    nucleo.PESOS["contexto"] *= 4
+    depois = nucleo.analisar_contexto(texto)
+    assert depois != antes
+    nucleo.CACHE_ANALISES.limpar()
+    assert nucleo.analisar_contexto(texto) == depois
+
+
+def test_analisar_contexto_recalcula_quando_vocabulario_muda(vocabulario_restaurado):
+    texto = "o zebu pastou"
+    assert set(nucleo.analisar_contexto(texto).values()) == {0.0}
+    nucleo.CONTEXTO_GRUPOS["Animais"].add("zebu")
+    depois = nucleo.analisar_contexto(texto)
+    assert depois["Animais"] > 0
+    assert max(depois, key=depois.get) == "Animais"
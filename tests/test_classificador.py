@@ -0,0 +1,70 @@
+import io
+import json
+
+import pytest
+
+from simulador.__main__ import main
+from simulador.classificador import ler_frases
+from simulador.nucleo import identificar_grupo
+
+FRASES = [
+    "o gato comeu a ração", "sentei no banco da praça", "paguei o boleto no banco",
+    "o ônibus atrasou", "a cadeira quebrou", "", "zzz xyz", "o cachorro latiu para o carro",
+]
+
+
+def classificar(tmp_path, capsys, nome, conteudo, *opcoes):
+    entrada = tmp_path / nome
+    entrada.write_text(conteudo, encoding="utf-8")
+    codigo = main(["classify", str(entrada), "-q", *opcoes])
+    captura = capsys.readouterr()
+    return codigo, [json.loads(linha) for linha in captura.out.splitlines()], captura.err
+
+
+def test_saida_na_ordem_da_entrada_com_dois_processos(tmp_path, capsys):
+    frases = [FRASES[i % len(FRASES)] or "frase" for i in range(60)]
+    codigo, resultados, _ = classificar(tmp_path, capsys, "frases.txt", "\n".join(frases) + "\n", "-p", "2", "-l", "4")
+    assert codigo == 0
+    assert [r["linha"] for r in resultados] == list(range(1, 61))
+    assert [r["texto"] for r in resultados] == frases
+    assert [r["grupo"] for r in resultados] == [identificar_grupo(f)[0] for f in frases]
+
+
+def test_linhas_em_branco_contam_na_numeracao(tmp_path, capsys):
+    _, resultados, _ = classificar(tmp_path, capsys, "frases.txt", "\n".join(FRASES), "-p", "0")
+    assert [r["linha"] for r in resultados] == [1, 2, 3, 4, 5, 7, 8]
+
+
+def test_csv_com_campo_de_varias_linhas_usa_a_linha_onde_o_registro_comeca():
+    csv = 'id,texto\n1,"o gato\ncomeu a ração"\n2,\n3,o ônibus atrasou\n4,"a cadeira\n\nquebrou"\n5,fim\n'
+    assert list(ler_frases(io.StringIO(csv, newline=""), "csv")) == [
+        (2, "o gato\ncomeu a ração"), (5, "o ônibus atrasou"), (6, "a cadeira\n\nquebrou"), (9, "fim"),
+    ]
+
+
+def test_csv_sem_coluna_texto_usa_a_primeira_coluna_e_o_cabecalho():
+    assert list(ler_frases(io.StringIO("gato\ncarro\n"), "csv")) == [(1, "gato"), (2, "carro")]
+
+
+def test_jsonl_aceita_texto_ou_objeto():
+    entrada = io.StringIO('"o gato"\n\n{"frase": "o carro"}\n')
+    assert list(ler_frases(entrada, "jsonl", "frase")) == [(1, "o gato"), (3, "o carro")]
+
+
+@pytest.mark.parametrize("nome, conteudo, opcoes, mensagem", [
+    ("frases.jsonl", '{"texto": "o gato"}\n{"texto": \n', (), "Linha 2: JSON inválido."),
+    ("frases.jsonl", '{"texto": "o gato"}\n[1]\n', (), "Linha 2: esperado texto ou objeto com o campo 'texto'."),
+    ("frases.csv", "id,frase\n1,o gato\n", ("--campo", "texto"), "Coluna 'texto' não encontrada no CSV: id, frase"),
+])
+def test_entrada_invalida_termina_com_codigo_2(tmp_path, capsys, nome, conteudo, opcoes, mensagem):
+    codigo, _, erro = classificar(tmp_path, capsys, nome, conteudo, "-p", "0", *opcoes)
+    assert codigo == 2
+    assert erro.strip() == mensagem
+
+
+@pytest.mark.parametrize("processos", ["-1", "dois"])
+def test_processos_invalido_termina_com_codigo_2(tmp_path, capsys, processos):
+    with pytest.raises(SystemExit) as saida:
+        classificar(tmp_path, capsys, "frases.txt", "o gato\n", "-p", processos)
+    assert saida.value.code == 2
+    assert "--processos" in capsys.readouterr().err
@@ -0,0 +1,114 @@
+import random
+import re
+
+import pytest
+
+from simulador import nucleo
+from simulador.texto import normalizar_texto
+
+
+def contexto_por_substring(texto_completo):
+    """``analisar_contexto`` original: contexto e inferência contavam como substring do texto."""
+    texto_normalizado = normalizar_texto(texto_completo)
+    scores = {nome: 0.0 for nome in nucleo.GRUPOS}
+    for papel, fonte in (("contexto", nucleo.CONTEXTO_GRUPOS), ("inferencia", nucleo.PALAVRAS_INFERENCIA)):
+        for nome_grupo, termos in fonte.items():
+            for termo in termos:
+                if normalizar_texto(termo) in texto_normalizado:
+                    scores[nome_grupo] += nucleo.PESOS[papel]
+    for nome_grupo, termos in nucleo.GRUPOS.items():
+        for termo in termos:
+            if f" {normalizar_texto(termo)} " in f" {texto_normalizado} ":
+                scores[nome_grupo] += nucleo.PESOS["principal"]
+    total = sum(scores.values())
+    return {nome: valor / total for nome, valor in scores.items()} if total else scores
+
+
+def termos_normalizados():
+    return {
+        normalizar_texto(termo)
+        for fonte in (nucleo.GRUPOS, nucleo.CONTEXTO_GRUPOS, nucleo.PALAVRAS_INFERENCIA)
+        for termos in fonte.values()
+        for termo in termos
+    }
+
+
+def so_palavras_inteiras(texto_normalizado, termos):
+    """Nenhum termo aparece dentro de outra palavra: as duas buscas têm de concordar."""
+    com_espacos = f" {texto_normalizado} "
+    return all(
+        (termo in texto_normalizado)
+        == (f" {termo} " in com_espacos)
+        == bool(re.search(rf"(?<!\w){re.escape(termo)}(?!\w)", texto_normalizado))
+        for termo in termos
+    )
+
+
+VOCABULARIO = {
+    "grupos": {
+        "Animais": ["rato", "gato"],
+        "Financeiro": ["banco", "dinheiro sujo"],
+        "Transportes": ["posto de gasolina", "gasolina"],
+    },
+    "contexto_grupos": {"Animais": ["pet", "ração"], "Financeiro": ["caixa eletrônico"]},
+    "palavras_inferencia": {"Financeiro": ["depósito bancário"]},
+    "cores_grupos": {"Animais": "#000000", "Financeiro": "#111111", "Transportes": "#222222"},
+    "pesos": {"contexto": 3.0, "inferencia": 2.5, "principal": 0.2},
+}
+
+
+@pytest.fixture
+def vocabulario_pequeno(vocabulario_temporario):
+    vocabulario_temporario(VOCABULARIO)
+
+
+def somente(grupo):
+    return {nome: float(nome == grupo) for nome in nucleo.GRUPOS}
+
+
+@pytest.mark.parametrize("texto", ["vou competir amanhã", "assinei o contrato", "caixa eletrônicos novos"])
+def test_termo_dentro_de_outra_palavra_nao_conta(vocabulario_pequeno, texto):
+    assert nucleo.analisar_contexto(texto) == {nome: 0.0 for nome in nucleo.GRUPOS}
+    assert nucleo.identificar_grupo(texto)[0] is None
+
+
+def test_substring_antiga_contava_dentro_de_palavras(vocabulario_pequeno):
+    assert contexto_por_substring("vou competir amanhã")["Animais"] == 1.0
+    assert contexto_por_substring("caixa eletrônicos novos")["Financeiro"] == 1.0
+
+
+def test_palavra_inteira_conta_mesmo_com_pontuacao(vocabulario_pequeno):
+    assert nucleo.analisar_contexto("O pet, comeu a RAÇÃO!") == somente("Animais")
+    assert nucleo.analisar_contexto("(pet)") == somente("Animais")
+
+
+def test_termo_repetido_conta_uma_vez(vocabulario_pequeno):
+    uma_vez = nucleo.analisar_contexto("pet ração caixa eletrônico")
+    assert nucleo.analisar_contexto("pet pet ração pet caixa eletrônico caixa eletrônico") == uma_vez
+    assert uma_vez == pytest.approx(contexto_por_substring("pet ração caixa eletrônico"))
+    assert uma_vez["Animais"] == pytest.approx(2 / 3)
+
+
+def test_termos_de_varias_palavras(vocabulario_pequeno):
+    texto = "parei no posto de gasolina"
+    scores = nucleo.analisar_contexto(texto)
+    assert scores == pytest.approx(contexto_por_substring(texto))
+    assert scores["Transportes"] == 1.0
+    assert nucleo.analisar_contexto("paguei no caixa eletrônico") == somente("Financeiro")
+    assert nucleo.analisar_contexto("fiz um depósito bancário.") == somente("Financeiro")
+    assert nucleo.analisar_contexto("caixa, eletrônico") == {nome: 0.0 for nome in nucleo.GRUPOS}
+
+
+@pytest.mark.parametrize("semente", range(4))
+def test_igual_a_substring_quando_so_ha_palavras_inteiras(semente):
+    gerador = random.Random(semente)
+    termos = termos_normalizados()
+    vocabulario = sorted(termos) + ["o", "a", "de", "ontem", "muito", "zzz", "contrato", "competir"]
+    comparadas = 0
+    for _ in range(400):
+        texto = " ".join(gerador.choice(vocabulario) for _ in range(gerador.randint(1, 6)))
+        if not so_palavras_inteiras(texto, termos):
+            continue
+        comparadas += 1
+        assert nucleo.analisar_contexto(texto) == pytest.approx(contexto_por_substring(texto)), texto
+    assert comparadas > 100
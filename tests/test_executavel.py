@@ -0,0 +1,15 @@
+import pytest
+
+from simulador.__main__ import criar_parser
+
+
+@pytest.mark.parametrize("repeticoes", ["0", "-1", "abc"])
+def test_repeticoes_abaixo_de_um_sao_recusadas(repeticoes, capsys):
+    with pytest.raises(SystemExit) as saida:
+        criar_parser().parse_args(["exe", "app.exe", "-r", repeticoes])
+    assert saida.value.code == 2
+    assert "--repeticoes" in capsys.readouterr().err
+
+
+def test_repeticoes_valida():
+    assert criar_parser().parse_args(["exe", "app.exe", "-r", "3"]).repeticoes == 3
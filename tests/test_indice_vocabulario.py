@@ -0,0 +1,80 @@
+import pytest
+
+from simulador import nucleo
+from simulador.nucleo import VocabularyIndex
+
+GRUPOS = {
+    "Animais": {"Gato", "leão", "rato", "banco"},
+    "Móveis": {"cadeira", "Banco", "mesa de jantar"},
+    "Financeiro": {"banco", "Pix", "leao"},
+}
+CONTEXTO = {"Animais": {"latir", "Gato"}, "Financeiro": {"Extrato"}}
+INFERENCIA = {"Móveis": ["sentar"], "Animais": ["onça"]}
+
+
+@pytest.fixture
+def indice():
+    return VocabularyIndex(GRUPOS, CONTEXTO, INFERENCIA)
+
+
+def test_termos_sao_normalizados(indice):
+    assert indice.normalizar("Leão") == "leao"
+    assert indice.termos_normalizados["Gato"] == "gato"
+    assert indice.termos_normalizados["Extrato"] == "extrato"
+    assert indice.palavras_ordenadas["Móveis"] == [
+        ("Banco", "banco"), ("cadeira", "cadeira"), ("mesa de jantar", "mesa de jantar"),
+    ]
+    assert indice.nomes_grupos == ["Animais", "Móveis", "Financeiro"]
+
+
+def test_grupos_e_papeis_por_termo(indice):
+    assert indice.grupos_do_termo("banco") == ("Animais", "Móveis", "Financeiro")
+    assert indice.grupos_do_termo("leao") == ("Animais", "Financeiro")
+    assert indice.grupos_do_termo("pix") == ("Financeiro",)
+    assert indice.grupos_do_termo("latir") == ()
+    assert indice.grupos_do_termo("Gato") == ()
+    assert indice.papeis_do_termo("gato") == {("principal", "Animais"), ("contexto", "Animais")}
+    assert indice.papeis_do_termo("sentar") == {("inferencia", "Móveis")}
+    assert indice.papeis_do_termo("desconhecido") == set()
+    assert sorted(indice.entradas_por_termo["gato"]) == [("contexto", "Animais"), ("principal", "Animais")]
+
+
+def test_palavras_compartilhadas(indice):
+    assert indice.pertinencia.compartilhadas() == [
+        ("banco", ["Animais", "Financeiro", "Móveis"]),
+        ("leão", ["Animais", "Financeiro"]),
+    ]
+    assert indice.pertinencia.compartilhada("LEAO")
+    assert not indice.pertinencia.compartilhada("cadeira")
+    assert indice.pertinencia.grupos("Banco") == ["Animais", "Móveis", "Financeiro"]
+
+
+def test_conhecidas_reunem_todos_os_papeis(indice):
+    assert indice.conhecidas == {
+        "gato", "leao", "rato", "banco", "cadeira", "mesa de jantar", "pix",
+        "latir", "extrato", "sentar", "onca",
+    }
+
+
+def test_busca_respeita_limites_de_palavra(indice):
+    texto = "o gato latiu; mesa de jantar, contrato e pixel no banco"
+    assert [termo for _, _, termo in indice.buscar(texto)] == ["gato", "mesa de jantar", "banco"]
+    pesos = {"contexto": 3.0, "inferencia": 2.5, "principal": 0.2}
+    scores, ocorrencias = indice.varrer_texto("o gato e o gato", pesos)
+    assert scores == {"Animais": pytest.approx(3.2), "Móveis": 0.0, "Financeiro": 0.0}
+    assert sorted(ocorrencias) == [("gato", "Animais", "contexto"), ("gato", "Animais", "principal")]
+
+
+def test_palavra_comum_fica_so_nos_grupos_configurados(vocabulario_temporario):
+    vocabulario_temporario({
+        "grupos": {"Móveis": ["cadeira"], "Financeiro": ["Banco", "pix"], "Animais": ["gato", "banco"]},
+        "palavra_comum": {"palavra": "banco", "grupos": ["Móveis", "Financeiro"]},
+        "cores_grupos": {"Móveis": "#000000", "Financeiro": "#111111", "Animais": "#222222"},
+        "pesos": {"contexto": 3.0, "inferencia": 2.5, "principal": 0.2},
+    })
+    assert nucleo.COMMON_WORD == "banco"
+    assert "banco" in nucleo.GRUPOS["Móveis"]
+    assert nucleo.GRUPOS["Animais"] == {"gato"}
+    indice = nucleo.obter_indice_vocabulario()
+    assert indice.grupos_do_termo("banco") == ("Móveis", "Financeiro")
+    assert nucleo.obter_palavras_compartilhadas(nucleo.GRUPOS) == [("banco", ["Financeiro", "Móveis"])]
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+import simulador_llm_Windows as app  # noqa: E402
+
+
+def palavras_aleatorias(gerador, quantidade):
+    return {"".join(gerador.choice("abcdeilmnorstuçã") for _ in range(gerador.randint(2, 11))) for _ in range(quantidade)}
+
+
+@pytest.mark.parametrize("semente", range(3))
+def test_top_k_com_corte_igual_a_lista_completa(semente):
+    gerador = random.Random(semente)
+    palavras = palavras_aleatorias(gerador, 200)
+    for busca in sorted(palavras_aleatorias(gerador, 30)) + sorted(palavras)[:10]:
+        completa = app._similaridades_grupo(busca, palavras)
+        for k in (1, 4, 25):
+            assert app._similaridades_grupo(busca, palavras, k) == completa[:k]
+
+
+def test_corte_so_zera_quem_fica_abaixo_do_minimo():
+    gerador = random.Random(7)
+    for busca in palavras_aleatorias(gerador, 20):
+        for palavra in palavras_aleatorias(gerador, 20):
+            exata = app.calcular_similaridade_composta(busca, palavra)
+            minima = gerador.uniform(0, 100)
+            com_corte = app.calcular_similaridade_composta(busca, palavra, minima)
+            if exata >= minima:
+                assert com_corte == exata
+            else:
+                assert com_corte in (0.0, exata)
+
+
+def test_contexto_so_conta_palavras_inteiras():
+    assert set(app.analisar_contexto("o contrato de competir").values()) == {0.0}
+    assert app.identificar_grupo("Um GATO.")[0] == "Animais"
+    assert app.identificar_grupo("o pet comeu a ração")[0] == "Animais"
+
+
+def test_detectores_usam_termos_de_varias_palavras_e_nao_repetem():
+    assert app.detectar_palavras_desconhecidas("saquei no caixa eletrônico, xyz xyz") == ["saquei", "xyz"]
+    assert app.detectar_palavras_ambiguas("banco, banco e banco") == [("banco", ["Móveis", "Financeiro"])]
+
+
+def test_preparar_analise_varre_o_texto_uma_vez_para_todos_os_detectores():
+    texto = "Sentei no banco do caixa eletrônico com o gato"
+    analisado = app.preparar_texto(texto)
+    assert app.preparar_texto(analisado) is analisado
+    analise = app.preparar_analise(texto)
+    assert (analise["grupo"], analise["scores"]) == app.identificar_grupo(texto)
+    assert analise["ambiguas"] == app.detectar_palavras_ambiguas(analisado)
+    assert analise["desconhecidas"] == app.detectar_palavras_desconhecidas(analisado)
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from simulador import nucleo
+
+ENCHIMENTO = ["o", "a", "no", "de", "ontem", "muito", "zzz", "contrato", "qualquer", "coisa", ",", "!"]
+
+
+def frases_aleatorias(semente, quantidade):
+    gerador = random.Random(semente)
+    termos = sorted(
+        termo
+        for fonte in (nucleo.GRUPOS, nucleo.CONTEXTO_GRUPOS, nucleo.PALAVRAS_INFERENCIA)
+        for termos_grupo in fonte.values()
+        for termo in termos_grupo
+    )
+    frases = []
+    for _ in range(quantidade):
+        palavras = [gerador.choice(termos) for _ in range(gerador.randint(0, 4))]
+        palavras += gerador.sample(ENCHIMENTO, gerador.randint(0, 4))
+        gerador.shuffle(palavras)
+        frase = " ".join(palavras)
+        frases.append(frase.upper() if gerador.random() < 0.1 else frase)
+    return frases
+
+
+def assert_igual_ao_unitario(textos, **opcoes):
+    resultados = nucleo.identificar_grupos_em_lote(textos, **opcoes)
+    assert [r["texto"] for r in resultados] == list(textos)
+    for texto, resultado in zip(textos, resultados):
+        grupo, scores = nucleo.identificar_grupo(texto)
+        assert resultado["grupo"] == grupo, texto
+        assert resultado["scores"] == pytest.approx(scores), texto
+        assert resultado["ambiguas"] == nucleo.detectar_palavras_ambiguas(texto), texto
+        assert resultado["desconhecidas"] == nucleo.detectar_palavras_desconhecidas(texto), texto
+    return resultados
+
+
+@pytest.mark.parametrize("semente", range(4))
+def test_lote_igual_as_funcoes_unitarias(semente):
+    frases = frases_aleatorias(semente, 300)
+    frases += frases[:20]
+    assert_igual_ao_unitario(frases)
+    assert_igual_ao_unitario(frases, tamanho_lote=7)
+
+
+def test_textos_vazios_e_none():
+    resultados = assert_igual_ao_unitario([None, "", "   ", "banco"])
+    for resultado in resultados[:3]:
+        assert resultado["grupo"] is None
+        assert set(resultado["scores"].values()) == {0.0}
+
+
+def vocabulario_de_limiares(quantidade_grupos=12):
+    nomes = [f"G{i:02d}" for i in range(quantidade_grupos)]
+    return {
+        "grupos": {nome: [f"termo{nome}", "comum"] for nome in nomes},
+        "contexto_grupos": {nome: [f"ctx{nome}"] for nome in nomes},
+        "palavras_inferencia": {nome: [f"inf{nome}"] for nome in nomes},
+        "cores_grupos": {nome: "#000000" for nome in nomes},
+        "pesos": {"contexto": 3.0, "inferencia": 2.5, "principal": 0.2},
+    }
+
+
+def test_empates_e_limiar_de_grupo(vocabulario_temporario):
+    vocabulario_temporario(vocabulario_de_limiares())
+    inferencias = " ".join(f"infG{i:02d}" for i in range(1, 12))
+    casos = {
+        "ctxG00 ctxG01": None,
+        "ctxG00 ctxG01 termoG02": None,
+        "ctxG00 ctxG01 termoG01": "G01",
+        "comum": None,
+        # 3 / (3 + 11 * 2.5) fica abaixo de LIMIAR_GRUPO; sem infG11, 3 / 28 fica acima.
+        f"ctxG00 {inferencias}": None,
+        f"ctxG00 {inferencias.replace(' infG11', '')}": "G00",
+    }
+    resultados = assert_igual_ao_unitario(list(casos))
+    assert [r["grupo"] for r in resultados] == list(casos.values())
+    assert max(resultados[4]["scores"].values()) == pytest.approx(3 / 30.5)
+    assert max(resultados[4]["scores"].values()) <= nucleo.LIMIAR_GRUPO
+    assert resultados[3]["ambiguas"] == [("comum", [f"G{i:02d}" for i in range(12)])]
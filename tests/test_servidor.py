@@ -0,0 +1,72 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from simulador.servidor import TAMANHO_MAXIMO_CABECALHO, TAMANHO_MAXIMO_CORPO, ServidorClassificacao
+
+
+def requisitar(bruto: bytes):
+    """Envia ``bruto`` a um servidor de teste e retorna ``(status, corpo JSON)``."""
+
+    async def conversar():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            servidor = ServidorClassificacao(executor, 1)
+            servidor_tcp = await asyncio.start_server(
+                servidor.atender, "127.0.0.1", 0, limit=TAMANHO_MAXIMO_CABECALHO
+            )
+            async with servidor_tcp:
+                porta = servidor_tcp.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+                writer.write(bruto)
+                await writer.drain()
+                resposta = await asyncio.wait_for(reader.read(), 5)
+                writer.close()
+                await writer.wait_closed()
+        return resposta
+
+    cabecalho, _, corpo = asyncio.run(conversar()).partition(b"\r\n\r\n")
+    status = int(cabecalho.split(b" ", 2)[1])
+    return status, json.loads(corpo)
+
+
+def test_content_length_negativo_responde_400():
+    status, corpo = requisitar(b"POST /classify HTTP/1.1\r\nContent-Length: -3\r\n\r\n")
+    assert status == 400
+    assert corpo == {"erro": "Content-Length inválido."}
+
+
+def post(caminho: str, corpo: bytes):
+    cabecalho = f"POST {caminho} HTTP/1.1\r\nContent-Length: {len(corpo)}\r\nConnection: close\r\n\r\n"
+    return requisitar(cabecalho.encode("latin-1") + corpo)
+
+
+@pytest.mark.parametrize("bruto, mensagem", [
+    (b"POST /classify HTTP/1.1\r\nContent-Length: abc\r\n\r\n", "Content-Length inválido."),
+    (b"GET\r\n\r\n", "Linha de requisição inválida."),
+])
+def test_cabecalho_invalido_responde_400(bruto, mensagem):
+    assert requisitar(bruto) == (400, {"erro": mensagem})
+
+
+def test_corpo_grande_demais_responde_413_sem_ler_o_corpo():
+    bruto = f"POST /classify HTTP/1.1\r\nContent-Length: {TAMANHO_MAXIMO_CORPO + 1}\r\n\r\n".encode("latin-1")
+    assert requisitar(bruto) == (413, {"erro": "Corpo grande demais."})
+
+
+@pytest.mark.parametrize("corpo, inicio_mensagem", [
+    (b"{texto", "JSON inválido"),
+    (b"[1, 2]", "O corpo deve ser um objeto JSON."),
+    (b'{"textos": "uma frase"}', "'textos' deve ser uma lista de strings."),
+])
+def test_corpo_invalido_responde_400(corpo, inicio_mensagem):
+    status, resposta = post("/classify", corpo)
+    assert status == 400
+    assert resposta["erro"].startswith(inicio_mensagem)
+
+
+def test_classify_responde_200():
+    status, resposta = post("/classify", '{"texto": "o gato comeu a ração"}'.encode("utf-8"))
+    assert status == 200
+    assert resposta["grupo"] == "Animais"
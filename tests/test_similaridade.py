@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from simulador.indice_fuzzy import distancia_levenshtein
+from simulador.nucleo import MotorSimilaridade, calcular_similaridade_composta
+
+ALFABETO = "abcdeilmnorstu"
+
+
+def levenshtein_classico(palavra1, palavra2):
+    """Programação dinâmica da versão original, usada como referência."""
+    anterior = list(range(len(palavra2) + 1))
+    for i, caractere1 in enumerate(palavra1, 1):
+        atual = [i]
+        for j, caractere2 in enumerate(palavra2, 1):
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + (caractere1 != caractere2)))
+        anterior = atual
+    return anterior[-1]
+
+
+def composta_original(palavra_busca, palavra_comparacao):
+    """Fórmula escalar original de ``calcular_similaridade_composta`` (palavras já normalizadas)."""
+    if palavra_busca == palavra_comparacao:
+        return 100.0
+    maior = max(len(palavra_busca), len(palavra_comparacao))
+    sim_levenshtein = 0.0
+    if palavra_busca and palavra_comparacao:
+        sim_levenshtein = max(0.0, 1 - levenshtein_classico(palavra_busca, palavra_comparacao) / maior)
+    conjunto_busca, conjunto_comparacao = set(palavra_busca), set(palavra_comparacao)
+    sim_caracteres = 0.0
+    if conjunto_busca and conjunto_comparacao:
+        sim_caracteres = len(conjunto_busca & conjunto_comparacao) / len(conjunto_busca | conjunto_comparacao)
+    bonus_substring = 0.2 if palavra_busca in palavra_comparacao or palavra_comparacao in palavra_busca else 0.0
+    return min(100.0, (sim_levenshtein * 0.6 + sim_caracteres * 0.4 + bonus_substring) * 100)
+
+
+def palavras_aleatorias(semente, quantidade, tamanho_maximo=12):
+    gerador = random.Random(semente)
+    return [
+        "".join(gerador.choice(ALFABETO) for _ in range(gerador.randint(1, tamanho_maximo)))
+        for _ in range(quantidade)
+    ]
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_distancia_levenshtein_igual_a_programacao_dinamica(semente):
+    palavras = palavras_aleatorias(semente, 80, tamanho_maximo=70) + [""]
+    gerador = random.Random(semente)
+    for _ in range(400):
+        palavra1, palavra2 = gerador.choice(palavras), gerador.choice(palavras)
+        esperada = levenshtein_classico(palavra1, palavra2)
+        assert distancia_levenshtein(palavra1, palavra2) == esperada
+        limite = gerador.randint(0, 6)
+        assert distancia_levenshtein(palavra1, palavra2, limite) == min(esperada, limite + 1)
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_motor_igual_a_composta_original(semente):
+    vocabulario = palavras_aleatorias(semente, 120) + ["a" * 70, "pa" * 40]
+    grupos = {"A": vocabulario[::2], "B": vocabulario[1::2]}
+    motor = MotorSimilaridade({nome: [(p, p) for p in palavras] for nome, palavras in grupos.items()})
+    buscas = palavras_aleatorias(semente + 100, 15) + [vocabulario[3], vocabulario[3][1:], "a" * 66]
+    linhas = random.Random(semente).sample(range(len(motor.normalizadas)), 20)
+    for busca in buscas:
+        esperadas = [composta_original(busca, p) for p in motor.normalizadas]
+        assert motor.similaridades_base(busca).tolist() == pytest.approx(esperadas)
+        assert motor.similaridades_base(busca, linhas).tolist() == pytest.approx([esperadas[i] for i in linhas])
+        for palavra, esperada in zip(motor.normalizadas, esperadas):
+            assert calcular_similaridade_composta(busca, palavra) == pytest.approx(esperada)
+            if esperada >= 50:
+                assert calcular_similaridade_composta(busca, palavra, 50) == pytest.approx(esperada)
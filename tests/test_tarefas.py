@@ -0,0 +1,92 @@
+import threading
+import time
+
+from simulador.tarefas import ExecutorEmSegundoPlano
+
+
+class AgendadorFalso:
+    """Imita ``root.after`` do Tk: guarda os callbacks e só os roda quando ``girar`` é chamado."""
+
+    def __init__(self):
+        self.agendados = []
+
+    def after(self, _milissegundos, funcao, *argumentos):
+        self.agendados.append((funcao, argumentos))
+
+    def girar(self, limite=5.0):
+        """Roda o laço de eventos até não haver mais nada agendado."""
+        prazo = time.monotonic() + limite
+        while self.agendados:
+            assert time.monotonic() < prazo, "tarefas não terminaram"
+            funcao, argumentos = self.agendados.pop(0)
+            funcao(*argumentos)
+            time.sleep(0.001)
+
+
+def acompanhar(raiz, executor):
+    """Mesma sondagem do aplicativo Tk: processa resultados enquanto o executor estiver ocupado."""
+    def processar():
+        executor.processar_resultados()
+        if executor.ocupado:
+            raiz.after(40, processar)
+    raiz.after(40, processar)
+
+
+def test_resultado_antigo_e_descartado_e_so_o_ultimo_callback_roda():
+    raiz, executor = AgendadorFalso(), ExecutorEmSegundoPlano("teste")
+    liberar, iniciou = threading.Event(), threading.Event()
+    executadas, entregues, progressos = [], [], []
+
+    def lenta(tarefa):
+        iniciou.set()
+        liberar.wait(5)
+        tarefa.progresso(0.5, "antiga")
+        executadas.append("lenta")
+        return "lenta"
+
+    def trabalho(nome):
+        def funcao(tarefa):
+            executadas.append(nome)
+            return nome
+        return funcao
+
+    executor.enviar(lenta, entregues.append, ao_progredir=lambda *a: progressos.append(a))
+    iniciou.wait(5)
+    executor.enviar(trabalho("intermediaria"), entregues.append)
+    executor.enviar(trabalho("ultima"), entregues.append)
+    liberar.set()
+    acompanhar(raiz, executor)
+    raiz.girar()
+
+    assert entregues == ["ultima"]
+    assert executadas == ["lenta", "ultima"]
+    assert progressos == []
+
+
+def test_cancelar_descarta_o_pedido_em_andamento():
+    raiz, executor = AgendadorFalso(), ExecutorEmSegundoPlano("teste")
+    liberar = threading.Event()
+    entregues = []
+
+    def lenta(_tarefa):
+        liberar.wait(5)
+        return "lenta"
+
+    executor.enviar(lenta, entregues.append)
+    executor.cancelar()
+    liberar.set()
+    acompanhar(raiz, executor)
+    raiz.girar()
+    assert entregues == []
+
+
+def test_sem_substituir_todos_os_pedidos_rodam_em_ordem():
+    raiz, executor = AgendadorFalso(), ExecutorEmSegundoPlano("teste", substituir=False)
+    entregues, falhas = [], []
+    for indice in range(5):
+        executor.enviar(lambda _tarefa, indice=indice: indice, entregues.append)
+    executor.enviar(lambda _tarefa: 1 / 0, entregues.append, falhas.append)
+    acompanhar(raiz, executor)
+    raiz.girar()
+    assert entregues == [0, 1, 2, 3, 4]
+    assert [type(erro) for erro in falhas] == [ZeroDivisionError]
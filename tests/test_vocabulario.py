@@ -0,0 +1,165 @@
+import copy
+import io
+import json
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from simulador import nucleo
+from simulador.nucleo import VocabularyIndex
+from simulador.texto import normalizar_texto
+from simulador.vocabulario import _LeitorRestrito, caminho_snapshot, gravar_snapshot, ler_snapshot
+
+HASH = "0" * 32
+
+
+def test_leitor_restrito_recusa_tipo_fora_da_lista():
+    with pytest.raises(pickle.UnpicklingError, match="posix.system|nt.system"):
+        _LeitorRestrito(io.BytesIO(pickle.dumps(os.system))).load()
+
+
+def test_snapshot_com_codigo_e_ignorado(tmp_path):
+    snapshot = caminho_snapshot(tmp_path / "vocab.json")
+    gravar_snapshot(snapshot, HASH, {"carga": os.system})
+    assert ler_snapshot(snapshot, HASH) is None
+
+
+def test_snapshot_ida_e_volta(tmp_path):
+    snapshot = caminho_snapshot(tmp_path / "vocab.json")
+    conteudo = {"grupos": {"Animais": {"gato", "cão"}}, "posicoes": np.arange(6.0).reshape(3, 2)}
+    gravar_snapshot(snapshot, HASH, conteudo)
+    lido = ler_snapshot(snapshot, HASH)
+    assert lido["grupos"] == conteudo["grupos"]
+    np.testing.assert_array_equal(lido["posicoes"], conteudo["posicoes"])
+    assert ler_snapshot(snapshot, "1" * 32) is None
+
+
+VOCABULARIO = {
+    "grupos": {
+        "Animais": ["gato", "rato", "cachorro", "banco"],
+        "Móveis": ["cadeira", "mesa", "banco"],
+        "Financeiro": ["banco", "pix", "boleto"],
+        "Transportes": ["carro", "ônibus"],
+    },
+    "palavra_comum": {"palavra": "banco", "grupos": ["Móveis", "Financeiro"]},
+    "contexto_grupos": {"Animais": ["latir", "ração"], "Financeiro": ["extrato"], "Transportes": ["estrada"]},
+    "palavras_inferencia": {"Animais": ["onça", "onça"], "Móveis": ["sentar"]},
+    "cores_grupos": {"Animais": "#44FF44", "Móveis": "#4444FF", "Financeiro": "#FFAA00", "Transportes": "#FF4444"},
+    "pesos": {"contexto": 3.0, "inferencia": 2.5, "principal": 0.2},
+}
+TEXTOS = [
+    "o gato comeu a ração", "sentei no banco", "paguei o boleto no banco com pix", "a onça e o cachorro",
+    "parei no posto de gasolina", "a capivara na estrada", "extrato do banco", "contrato", "gato gato rato",
+]
+
+
+def adicionar(dados, chave, grupo, *termos):
+    dados[chave][grupo] = dados[chave][grupo] + list(termos)
+
+
+def remover(dados, chave, grupo, termo):
+    dados[chave][grupo] = [t for t in dados[chave][grupo] if t != termo]
+
+
+EDICOES = {
+    "adiciona termo": (lambda d: adicionar(d, "grupos", "Animais", "capivara"), {"Animais"}),
+    "remove termo": (lambda d: remover(d, "grupos", "Animais", "rato"), {"Animais"}),
+    "termo passa a ser compartilhado": (
+        lambda d: adicionar(d, "grupos", "Financeiro", "gato"), {"Animais", "Financeiro"}
+    ),
+    "termo de contexto": (lambda d: adicionar(d, "contexto_grupos", "Transportes", "Pneu"), set()),
+    "remove inferência repetida": (lambda d: remover(d, "palavras_inferencia", "Animais", "onça"), set()),
+    "termo de várias palavras": (
+        lambda d: adicionar(d, "grupos", "Transportes", "posto de gasolina"), {"Transportes"}
+    ),
+    "peso": (lambda d: d["pesos"].update(contexto=4.0), set()),
+    "palavra comum": (lambda d: d["palavra_comum"]["grupos"].append("Animais"), set(VOCABULARIO["grupos"])),
+}
+
+
+def assert_indice_igual_ao_recriado(indice):
+    # O hash de uma recarga incremental encadeia o anterior com as alterações: não é comparável.
+    completo = VocabularyIndex(nucleo.GRUPOS, nucleo.CONTEXTO_GRUPOS, nucleo.PALAVRAS_INFERENCIA)
+    assert indice.nomes_grupos == completo.nomes_grupos
+    for papel in completo.entradas:
+        assert sorted(indice.entradas[papel]) == sorted(completo.entradas[papel])
+    assert indice.entradas_por_termo == completo.entradas_por_termo
+    assert indice.papeis_por_termo == completo.papeis_por_termo
+    assert indice.grupos_por_termo == completo.grupos_por_termo
+    assert indice.palavras_ordenadas == completo.palavras_ordenadas
+    assert indice.conhecidas == completo.conhecidas
+    assert indice.pertinencia.mascaras == completo.pertinencia.mascaras
+    assert indice.pertinencia.compartilhadas() == completo.pertinencia.compartilhadas()
+
+    matriz, matriz_completa = indice.matriz_pesos(nucleo.PESOS), completo.matriz_pesos(nucleo.PESOS)
+    for termo in completo.entradas_por_termo:
+        np.testing.assert_allclose(
+            matriz[indice.ids_termos[termo]], matriz_completa[completo.ids_termos[termo]], err_msg=termo
+        )
+    for texto in TEXTOS:
+        normalizado = normalizar_texto(texto)
+        assert list(indice.buscar(normalizado)) == list(completo.buscar(normalizado))
+        scores, ocorrencias = completo.varrer_texto(normalizado, nucleo.PESOS)
+        total = sum(scores.values())
+        esperados = {nome: valor / total if total else valor for nome, valor in scores.items()}
+        assert nucleo.analisar_contexto(texto) == pytest.approx(esperados), texto
+        assert indice.varrer_texto(normalizado, nucleo.PESOS) == (scores, ocorrencias)
+
+
+@pytest.mark.parametrize("edicao", list(EDICOES))
+def test_recarga_incremental_igual_a_indice_recriado(vocabulario_temporario, edicao):
+    editar, grupos_esperados = EDICOES[edicao]
+    dados = copy.deepcopy(VOCABULARIO)
+    caminho = vocabulario_temporario(dados)
+    for texto in TEXTOS:
+        nucleo.analisar_contexto(texto)
+    hash_anterior, chave_anterior = nucleo.obter_indice_vocabulario().hash_conteudo, nucleo.chave_vocabulario()
+
+    editar(dados)
+    caminho.write_text(json.dumps(dados, ensure_ascii=False), encoding="utf-8")
+    resumo = nucleo.recarregar_vocabulario(caminho)
+
+    assert not resumo["completa"]
+    assert nucleo.chave_vocabulario() != chave_anterior
+    assert (nucleo.obter_indice_vocabulario().hash_conteudo != hash_anterior) == (edicao != "peso")
+    assert nucleo.grupos_alterados_desde(hash_anterior) == grupos_esperados
+    assert_indice_igual_ao_recriado(nucleo.obter_indice_vocabulario())
+    assert nucleo.recarregar_vocabulario(caminho) is None
+
+
+def test_edicoes_sucessivas_acumulam_grupos_alterados(vocabulario_temporario):
+    dados = copy.deepcopy(VOCABULARIO)
+    caminho = vocabulario_temporario(dados)
+    hash_inicial = nucleo.obter_indice_vocabulario().hash_conteudo
+    esperados = set()
+    for nome in ("adiciona termo", "termo de várias palavras", "remove termo", "termo de contexto"):
+        editar, grupos = EDICOES[nome]
+        editar(dados)
+        esperados |= grupos
+        caminho.write_text(json.dumps(dados, ensure_ascii=False), encoding="utf-8")
+        nucleo.recarregar_vocabulario(caminho)
+        assert_indice_igual_ao_recriado(nucleo.obter_indice_vocabulario())
+        assert nucleo.grupos_alterados_desde(hash_inicial) == esperados
+
+
+@pytest.mark.parametrize("editar", [
+    lambda d: (d["grupos"].update(Plantas=["ipê"]), d["cores_grupos"].update(Plantas="#00AA00")),
+    lambda d: (d["grupos"].pop("Transportes"), d["contexto_grupos"].pop("Transportes")),
+], ids=["adiciona grupo", "remove grupo"])
+def test_mudanca_de_grupos_recarrega_tudo(vocabulario_temporario, editar):
+    dados = copy.deepcopy(VOCABULARIO)
+    caminho = vocabulario_temporario(dados)
+    nucleo.analisar_contexto("a onça na estrada")
+    hash_anterior, chave_anterior = nucleo.obter_indice_vocabulario().hash_conteudo, nucleo.chave_vocabulario()
+
+    editar(dados)
+    caminho.write_text(json.dumps(dados, ensure_ascii=False), encoding="utf-8")
+    resumo = nucleo.recarregar_vocabulario(caminho)
+
+    assert resumo["completa"]
+    assert list(nucleo.GRUPOS) == list(dados["grupos"])
+    assert nucleo.chave_vocabulario() != chave_anterior
+    assert nucleo.grupos_alterados_desde(hash_anterior) is None
+    assert_indice_igual_ao_recriado(nucleo.obter_indice_vocabulario())